@@ -3,24 +3,537 @@ Backend API Service for Interactive Learning Platform
 Integrates with Jac walkers via Spawn() calls
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
-from datetime import datetime
+from datetime import datetime, timezone
+import atexit
+import itertools
 import json
-from sample_data import SAMPLE_LESSONS, SAMPLE_QUIZZES, SAMPLE_CONCEPTS
+import math
+import os
+import threading
+import time
+import compression
+import metrics
+from content_cache import ContentCache, LRUCache, extend_payload, make_payload
+from content_pack import DEFAULT_PACK_PATH, load_sample_data, open_pack
+from content_render import RenderCache
+from event_store import EventStore, BufferFullError, CommitError
+from event_export import export_chunks, parse_time, EXPORT_TYPES, DEFAULT_TYPES
+from exercise_runner import ExercisePool, PoolBusyError, PoolUnavailableError, DEFAULT_WORKERS
+from submission_cache import SubmissionCache, runner_tag, submission_key
+from walker_bridge import WalkerBridge, BridgeUnavailableError, UnknownWalkerError, jsonable
+from walker_service import WalkerService, ServiceBusyError, WalkerFailedError, DEFAULT_WORKERS as DEFAULT_WALKER_WORKERS
+from grading import compile_graders, PASSING_SCORE
+from mastery import MasteryStore
+from skill_graph import SkillGraph, strength_of
+from recommender import Recommender
+from search_index import SearchIndex, catalog_documents, snippet
+from metrics import subtimer
+from lesson_index import LessonIndex, FILTER_FIELDS, DEFAULT_LIMIT, MAX_LIMIT
 
 app = Flask(__name__)
 CORS(app)
+metrics.init_app(app)
+compression.init_app(app)
 
 # Create lookup dictionaries for easy access
-lessons_by_id = {lesson['lesson_id']: lesson for lesson in SAMPLE_LESSONS}
-quizzes_by_id = {quiz['quiz_id']: quiz for quiz in SAMPLE_QUIZZES}
+SAMPLE_LESSONS = []
+SAMPLE_QUIZZES = []
+SAMPLE_CONCEPTS = []
+SAMPLE_EXERCISES = []
+lessons_by_id = {}
+quizzes_by_id = {}
 quizzes_by_lesson = {}
-for quiz in SAMPLE_QUIZZES:
-    lesson_id = quiz.get('lesson_id')
-    if lesson_id not in quizzes_by_lesson:
-        quizzes_by_lesson[lesson_id] = []
-    quizzes_by_lesson[lesson_id].append(quiz)
+concepts_by_id = {}
+exercises_by_id = {}
+
+# Compiled content; falls back to importing sample_data when no pack has been built
+CONTENT_PACK_PATH = os.environ.get('ILP_CONTENT_PACK', DEFAULT_PACK_PATH)
+
+# Serialized catalog responses and listing indexes, rebuilt by load_content()
+content_cache = ContentCache()
+# Lesson detail bodies are read from the pack on first request, so keep a bounded set
+LESSON_DETAIL_CACHE_SIZE = 1000
+lesson_detail_cache = LRUCache(LESSON_DETAIL_CACHE_SIZE)
+# API field -> content key for ?fields= projections of lesson fetches
+LESSON_FIELDS = {
+    'lessonId': 'lesson_id',
+    'title': 'title',
+    'description': 'description',
+    'difficulty': 'difficulty',
+    'durationMinutes': 'duration_minutes',
+    'category': 'category',
+    'prerequisites': 'prerequisites'
+}
+SECTION_FIELDS = {
+    'sectionNum': 'section_num',
+    'sectionTitle': 'section_title',
+    'body': 'body',
+    'codeExample': 'code_example',
+    'keyConcepts': 'key_concepts'
+}
+# Renders sections that have no pre-rendered variant (content loaded without a pack)
+section_renderer = RenderCache()
+# Full-text index; load_content() bumps the content generation and syncs the
+# changes in the background (a search arriving first waits for the sync)
+search_index = SearchIndex()
+# pack: the ContentPack content was last read from, whose prebuilt search
+# documents sync the index without decoding section bodies. A sync records the
+# generation it read, so a reload landing mid-sync leaves the index stale
+search_generations = itertools.count(1)
+search_sync = {'generation': 0, 'synced': None, 'pack': None}
+search_sync_lock = threading.Lock()
+SEARCH_TYPES = ('lesson', 'section', 'concept')
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 50
+lesson_index = LessonIndex()
+graders_by_quiz = {}
+skill_graph = SkillGraph()
+recommender = Recommender()
+
+# Durable progress/quiz/exercise event log; override location with ILP_EVENT_LOG
+EVENT_LOG_PATH = os.environ.get(
+    'ILP_EVENT_LOG',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'events.log')
+)
+LESSON_STATUSES = ('not_started', 'in_progress', 'completed')
+event_store = EventStore(EVENT_LOG_PATH)
+event_lock = threading.Lock()
+# Longest a write request waits for its event's group commit before answering 503
+DURABLE_TIMEOUT = 5
+# History exports stream from the log on request threads; cap how many run at once
+MAX_CONCURRENT_EXPORTS = 2
+export_slots = threading.BoundedSemaphore(MAX_CONCURRENT_EXPORTS)
+# Per-user aggregates, rebuilt from the event log on startup
+mastery_store = MasteryStore()
+# user_id -> (version key, serialized skill map)
+SKILL_MAP_CACHE_SIZE = 10000
+skill_map_cache = LRUCache(SKILL_MAP_CACHE_SIZE)
+# user_id -> serialized recommendations, dropped by apply_event() when the
+# user's lesson completions, or practice and quiz scores on concept lessons, change
+RECOMMENDATION_CACHE_SIZE = 10000
+recommendation_cache = LRUCache(RECOMMENDATION_CACHE_SIZE)
+# Warm jaclang worker processes for exercise validation; size with ILP_EXERCISE_WORKERS.
+# Submissions run sandboxed (namespaces, empty chroot, nobody); ILP_EXERCISE_ISOLATION=0
+# drops that on hosts without namespace support, leaving only resource limits
+exercise_pool = ExercisePool(
+    int(os.environ.get('ILP_EXERCISE_WORKERS', DEFAULT_WORKERS)),
+    isolate=os.environ.get('ILP_EXERCISE_ISOLATION', '1') != '0'
+)
+# Validation results keyed by normalized source hash and grader version; set
+# ILP_SUBMISSION_CACHE_DIR to keep them on disk (age- and size-bounded) across restarts
+submission_cache = SubmissionCache(directory=os.environ.get('ILP_SUBMISSION_CACHE_DIR'))
+SUBMISSION_RUNNER_TAG = runner_tag(exercise_pool.limits)
+submission_cache_lookups = metrics.registry.counter(
+    'ilp_submission_cache_lookups_total', 'Exercise validation cache lookups by outcome', ('result',)
+)
+# Jac models, walkers and agents compiled once at startup (in the background).
+# With ILP_WALKER_WORKERS set, walkers run in that many processes loading shared
+# bytecode, launched by the entry point (or the first walker run), never at import;
+# the default 0 runs them on the in-process bridge instead
+WALKER_WORKERS = int(os.environ.get('ILP_WALKER_WORKERS', DEFAULT_WALKER_WORKERS))
+walker_bridge = WalkerBridge()
+walker_service = WalkerService(WALKER_WORKERS) if WALKER_WORKERS > 0 else None
+
+# ============================================================================
+# PAYLOAD BUILDERS
+# ============================================================================
+
+def lesson_summary(lesson):
+    return {
+        'lessonId': lesson['lesson_id'],
+        'title': lesson['title'],
+        'difficulty': lesson['difficulty'],
+        'durationMinutes': lesson['duration_minutes'],
+        'description': lesson['description'],
+        'category': lesson['category']
+    }
+
+def section_detail(sec, rendered=False, fields=None):
+    """
+    fields limits the output to those API field names; only the requested
+    fields are read, so pack blobs for the others are never touched
+    """
+    detail = {}
+    for field, key in SECTION_FIELDS.items():
+        if fields is not None and field not in fields:
+            continue
+        if rendered and field == 'body':
+            body_html = sec.get('body_html')
+            detail['body'] = body_html if body_html is not None else section_renderer.body_html(sec['body'])
+        else:
+            detail[field] = sec[key]
+    if rendered and (fields is None or 'codeTokens' in fields):
+        code_tokens = sec.get('code_tokens')
+        detail['codeTokens'] = (
+            code_tokens if code_tokens is not None else section_renderer.code_tokens(sec['code_example'])
+        )
+    return detail
+
+def lesson_detail(lesson, rendered=False, fields=None, section_fields=None, section_range=None):
+    """
+    Full lesson, or a projection of it: fields and section_fields limit the
+    lesson and section fields, section_range keeps sections first..last (1-based,
+    inclusive, last None for the rest) and adds sectionCount
+    """
+    detail = {}
+    for field, key in LESSON_FIELDS.items():
+        if fields is None or field in fields:
+            detail[field] = lesson[key]
+    if fields is None or 'sections' in fields:
+        sections = lesson['sections']
+        if section_range is not None:
+            first, last = section_range
+            sections = sections[first - 1:last]
+        detail['sections'] = [section_detail(sec, rendered, section_fields) for sec in sections]
+    if section_range is not None:
+        detail['sectionCount'] = len(lesson['sections'])
+    return detail
+
+def concept_summary(concept):
+    return {
+        'conceptId': concept['concept_id'],
+        'conceptName': concept['concept_name'],
+        'category': concept['category'],
+        'description': concept['description'],
+        'resources': concept.get('resources', [])
+    }
+
+def quiz_summary(quiz):
+    return {
+        'quizId': quiz['quiz_id'],
+        'title': quiz['title'],
+        'difficulty': quiz['difficulty'],
+        'lessonId': quiz.get('lesson_id'),
+        'questionCount': len(quiz['questions'])
+    }
+
+def quiz_detail(quiz):
+    """
+    Public quiz payload; answers and grading keywords stay server-side and
+    only come back as feedback from the evaluate/score endpoints
+    """
+    return {
+        'quizId': quiz['quiz_id'],
+        'title': quiz['title'],
+        'description': quiz.get('description', ''),
+        'difficulty': quiz['difficulty'],
+        'lessonId': quiz.get('lesson_id'),
+        'questions': [
+            {
+                'questionId': q['question_id'],
+                'questionText': q['question_text'],
+                'questionType': q['question_type'],
+                'options': q.get('options', []),
+                'starterCode': q.get('starter_code', '')
+            }
+            for q in quiz['questions']
+        ]
+    }
+
+# ============================================================================
+# CONTENT LOADING
+# ============================================================================
+
+def load_content(lessons, quizzes, concepts, exercises=()):
+    """
+    (Re)build lookups and pre-serialize every immutable catalog response
+    """
+    SAMPLE_LESSONS[:] = lessons
+    SAMPLE_QUIZZES[:] = quizzes
+    SAMPLE_CONCEPTS[:] = concepts
+    SAMPLE_EXERCISES[:] = exercises
+
+    lessons_by_id.clear()
+    lessons_by_id.update((lesson['lesson_id'], lesson) for lesson in lessons)
+    quizzes_by_id.clear()
+    quizzes_by_id.update((quiz['quiz_id'], quiz) for quiz in quizzes)
+    quizzes_by_lesson.clear()
+    for quiz in quizzes:
+        lesson_id = quiz.get('lesson_id')
+        if lesson_id not in quizzes_by_lesson:
+            quizzes_by_lesson[lesson_id] = []
+        quizzes_by_lesson[lesson_id].append(quiz)
+    concepts_by_id.clear()
+    concepts_by_id.update((concept['concept_id'], concept) for concept in concepts)
+    exercises_by_id.clear()
+    exercises_by_id.update((exercise['exercise_id'], exercise) for exercise in exercises)
+    graders_by_quiz.clear()
+    graders_by_quiz.update(compile_graders(quizzes))
+    skill_graph.build(concepts, lessons, quizzes)
+    recommender.build(lessons, skill_graph)
+    recommendation_cache.clear()
+    search_sync['generation'] = next(search_generations)
+    threading.Thread(target=ensure_search_index, daemon=True).start()
+
+    lesson_index.build(lessons, lesson_summary)
+
+    lesson_detail_cache.clear()
+    content_cache.clear()
+    # Only the default first page of each listing is pre-serialized
+    page, next_cursor = lesson_index.page()
+    content_cache.put('lessons', {
+        'lessons': page,
+        'count': lesson_index.count(),
+        'pageSize': len(page),
+        'nextCursor': next_cursor
+    })
+    quiz_summaries = [quiz_summary(quiz) for quiz in quizzes]
+    concept_summaries = [concept_summary(concept) for concept in concepts]
+    content_cache.put('concepts', {'concepts': concept_summaries, 'count': len(concept_summaries)})
+    content_cache.put('bootstrap', {
+        'lessons': page,
+        'nextCursor': next_cursor,
+        'quizzes': quiz_summaries,
+        'concepts': concept_summaries
+    })
+    for category in {lesson['category'] for lesson in lessons}:
+        page, next_cursor = lesson_index.page(filters={'category': category})
+        content_cache.put(('lessons', category), {
+            'category': category,
+            'lessons': page,
+            'count': lesson_index.count({'category': category}),
+            'pageSize': len(page),
+            'nextCursor': next_cursor
+        })
+    for quiz in quizzes:
+        content_cache.put(('quiz', quiz['quiz_id']), quiz_detail(quiz))
+    content_cache.put('quizzes', {'quizzes': quiz_summaries, 'count': len(quiz_summaries)})
+
+def read_content():
+    """
+    Return (lessons, quizzes, concepts, exercises) from the content pack
+    (rebuilt first if sample_data.py is newer than it), or from a fresh import
+    of sample_data when the pack has not been built
+    """
+    pack = open_pack(CONTENT_PACK_PATH)
+    search_sync['pack'] = pack
+    if pack is not None:
+        return pack.lessons, pack.quizzes, pack.concepts, pack.exercises
+    sample_data = load_sample_data()
+    return (sample_data.SAMPLE_LESSONS, sample_data.SAMPLE_QUIZZES, sample_data.SAMPLE_CONCEPTS,
+            sample_data.SAMPLE_EXERCISES)
+
+def reload_content():
+    """
+    Re-read the content pack (or sample_data) and rebuild all derived content
+    """
+    content = read_content()
+    load_content(*content)
+    # Walker graphs are rebuilt too: in place on the bridge, by fresh workers in the service
+    if walker_service is not None:
+        walker_service.restart()
+    elif walker_bridge.available():
+        walker_bridge.load_graph(*content)
+
+def start_walker_bridge():
+    """
+    Compile the Jac modules, then load the catalog into the bridge's graph
+    """
+    walker_bridge.start()
+    if walker_bridge.available():
+        walker_bridge.load_graph(*read_content())
+
+def lesson_entry(lesson_id, rendered=False, fields=None, section_fields=None, section_range=None):
+    """
+    Serialized lesson detail, built from the pack on first request
+    Every projection and section range is cached as its own variant
+    """
+    key = (lesson_id, rendered, fields, section_fields, section_range)
+    entry = lesson_detail_cache.get(key)
+    if entry is None:
+        lesson = lessons_by_id.get(lesson_id)
+        if lesson is None:
+            return None
+        entry = make_payload(lesson_detail(lesson, rendered, fields, section_fields, section_range), precompressed=True)
+        lesson_detail_cache.put(key, entry)
+    return entry
+
+def ensure_search_index():
+    with search_sync_lock:
+        # The pack is set before the generation moves, so it is at least this new
+        generation = search_sync['generation']
+        if search_sync['synced'] != generation:
+            pack = search_sync['pack']
+            documents = pack.search_documents() if pack is not None else None
+            if documents is not None:
+                search_index.sync_analyzed(documents)
+            else:
+                search_index.sync(catalog_documents(SAMPLE_LESSONS, SAMPLE_CONCEPTS))
+            search_sync['synced'] = generation
+
+def cached_response(entry):
+    """
+    Serve a pre-serialized body, answering If-None-Match with 304
+    Uses the entry's precompressed variant when the client accepts one
+    """
+    encoding = compression.entry_encoding(entry)
+    etag = compression.variant_etag(entry, encoding)
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(compression.entry_body(entry, encoding), mimetype='application/json')
+        if encoding is not None:
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def lesson_page_args(**fixed_filters):
+    """
+    Parse limit/cursor/sort/order and filter query arguments for lesson listings
+    """
+    args = request.args
+    try:
+        limit = int(args.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f'limit must be between 1 and {MAX_LIMIT}')
+    order = args.get('order', 'asc')
+    if order not in ('asc', 'desc'):
+        raise ValueError("order must be 'asc' or 'desc'")
+    filters = {field: args.get(field) for field in FILTER_FIELDS}
+    filters.update(fixed_filters)
+    return {
+        'sort': args.get('sort', 'position'),
+        'descending': order == 'desc',
+        'limit': limit,
+        'cursor': args.get('cursor'),
+        'filters': filters
+    }
+
+def lesson_detail_args():
+    """
+    Parse rendered/fields/sections query arguments for lesson fetches into
+    lesson_entry() keyword arguments (hashable, so they form the cache key)
+    """
+    args = request.args
+    rendered = args.get('rendered', '').lower() in ('1', 'true')
+    fields = section_fields = None
+    if args.get('fields'):
+        requested = set()
+        requested_sections = set()
+        for name in args['fields'].split(','):
+            name = name.strip()
+            if name.startswith('sections.'):
+                sub_field = name[len('sections.'):]
+                if sub_field not in SECTION_FIELDS and sub_field != 'codeTokens':
+                    raise ValueError(f'Unknown field: {name}')
+                requested.add('sections')
+                requested_sections.add(sub_field)
+            elif name in LESSON_FIELDS or name == 'sections':
+                requested.add(name)
+            elif name:
+                raise ValueError(f'Unknown field: {name}')
+        fields = tuple(sorted(requested)) or None
+        section_fields = tuple(sorted(requested_sections)) or None
+        if section_fields and 'codeTokens' in section_fields and not rendered:
+            raise ValueError('sections.codeTokens requires rendered=1')
+
+    section_range = None
+    spec = args.get('sections')
+    if spec:
+        first, separator, last = spec.partition('..')
+        try:
+            first = int(first) if first else 1
+            last = int(last) if last else (None if separator else first)
+        except ValueError:
+            raise ValueError("sections must look like 2, 2..4, 2.. or ..4")
+        if first < 1 or (last is not None and last < first):
+            raise ValueError('sections must be a 1-based range with first <= last')
+        section_range = (first, last)
+
+    return {
+        'rendered': rendered,
+        'fields': fields,
+        'section_fields': section_fields,
+        'section_range': section_range
+    }
+
+# ============================================================================
+# PROGRESS EVENTS
+# ============================================================================
+
+def apply_event(event):
+    """
+    Fold one stored event into the in-memory aggregates
+    Called by the event store for replayed and newly committed events only
+    """
+    with event_lock:
+        changes = mastery_store.apply(event)
+        if changes and recommendations_changed(event['userId'], event.get('lessonId'), changes):
+            recommendation_cache.pop(event['userId'])
+
+def recommendations_changed(user_id, lesson_id, changes):
+    """
+    Whether changes (from MasteryStore.apply) to lesson_id can change the
+    user's recommendations. Completions change the candidate set, prerequisites
+    and level. A new best quiz score moves concept mastery, and a first practice
+    can make a concept count as practiced for strugglingConcepts; both only
+    matter for concepts the lesson teaches, the latter only if no other
+    resource of the concept was practiced yet
+    """
+    if 'completed' in changes:
+        return True
+    concepts = skill_graph.lesson_concepts.get(lesson_id, ())
+    if 'score' in changes and concepts:
+        return True
+    if 'practiced' in changes:
+        return any(
+            not mastery_store.practiced(user_id, [other for other in skill_graph.resources[i] if other != lesson_id])
+            for i in concepts
+        )
+    return False
+
+def record_quiz_attempt(user_id, quiz_id, answers, result):
+    return record_event(
+        'quiz_attempt',
+        userId=user_id,
+        quizId=quiz_id,
+        lessonId=quizzes_by_id[quiz_id].get('lesson_id'),
+        answers=answers,
+        score=result['score'],
+        correctAnswers=result['correctAnswers'],
+        totalQuestions=result['totalQuestions'],
+        passed=result['passed']
+    )
+
+def record_event(event_type, **fields):
+    """
+    Append an event to the log, returning once it is on disk and applied
+    Raises BufferFullError under overload and CommitError if the write fails
+    or does not land within DURABLE_TIMEOUT; a failed event is never applied
+    """
+    with subtimer('store', 'event_log.append'):
+        event = event_store.append(event_type, **fields)
+    # The writer applies the event (apply_event) once its batch is committed
+    with subtimer('store', 'event_log.commit_wait'):
+        durable = event_store.wait_durable(event['seq'], DURABLE_TIMEOUT)
+    if not durable:
+        raise CommitError(f'Event {event["seq"]} was not committed within {DURABLE_TIMEOUT}s')
+    return event
+
+load_content(*read_content())
+event_store.open(apply_event)
+atexit.register(event_store.close)
+exercise_pool.start()
+atexit.register(exercise_pool.close)
+if walker_service is not None:
+    atexit.register(walker_service.close)
+    metrics.registry.gauge_callback(
+        'ilp_walker_workers_idle', 'Walker worker processes waiting for a run', walker_service.idle
+    )
+else:
+    threading.Thread(target=start_walker_bridge, name='walker-bridge-compile', daemon=True).start()
+    atexit.register(walker_bridge.close)
+metrics.registry.gauge_callback(
+    'ilp_event_buffer_pending', 'Events buffered but not yet committed', event_store.pending
+)
+metrics.registry.gauge_callback(
+    'ilp_exercise_workers_idle', 'Warm exercise workers waiting for a job', exercise_pool.idle
+)
 
 # ============================================================================
 # LESSON ENDPOINTS
@@ -30,31 +543,18 @@ for quiz in SAMPLE_QUIZZES:
 def get_lesson(lesson_id):
     """
     Fetch lesson content using ContentServer walker
+    Query: rendered=1 for sanitized HTML bodies and codeTokens highlight tokens
+           fields=title,sections.body to project, sections=2..4 to slice sections
     """
     user_id = request.headers.get('X-User-ID')
+    try:
+        detail_args = lesson_detail_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Check if lesson exists in sample data
-    if lesson_id in lessons_by_id:
-        lesson = lessons_by_id[lesson_id]
-        return jsonify({
-            'lessonId': lesson['lesson_id'],
-            'title': lesson['title'],
-            'description': lesson['description'],
-            'difficulty': lesson['difficulty'],
-            'durationMinutes': lesson['duration_minutes'],
-            'category': lesson['category'],
-            'prerequisites': lesson['prerequisites'],
-            'sections': [
-                {
-                    'sectionNum': sec['section_num'],
-                    'sectionTitle': sec['section_title'],
-                    'body': sec['body'],
-                    'codeExample': sec['code_example'],
-                    'keyConcepts': sec['key_concepts']
-                }
-                for sec in lesson['sections']
-            ]
-        })
+    entry = lesson_entry(lesson_id, **detail_args)
+    if entry is not None:
+        return cached_response(entry)
     
     # Fallback for non-existent lesson
     return jsonify({'error': 'Lesson not found'}), 404
@@ -62,50 +562,50 @@ def get_lesson(lesson_id):
 @app.route('/api/lessons', methods=['GET'])
 def get_all_lessons():
     """
-    Get all available lessons
+    Get a page of lessons, optionally filtered and sorted
+    Query: limit, cursor, sort (position|title|difficulty|duration), order,
+    category, difficulty, prerequisite
     """
-    lessons = [
-        {
-            'lessonId': lesson['lesson_id'],
-            'title': lesson['title'],
-            'difficulty': lesson['difficulty'],
-            'durationMinutes': lesson['duration_minutes'],
-            'description': lesson['description'],
-            'category': lesson['category']
-        }
-        for lesson in SAMPLE_LESSONS
-    ]
+    if not request.args:
+        return cached_response(content_cache.get('lessons'))
+    
+    try:
+        page_args = lesson_page_args()
+        lessons, next_cursor = lesson_index.page(**page_args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
         'lessons': lessons,
-        'count': len(lessons)
+        'count': lesson_index.count(page_args['filters']),
+        'pageSize': len(lessons),
+        'nextCursor': next_cursor
     })
 
 @app.route('/api/lessons/category/<category>', methods=['GET'])
 def get_lessons_by_category(category):
     """
-    Get all lessons in a category using ContentServer walker
+    Get a page of lessons in a category using ContentServer walker
     """
     user_id = request.headers.get('X-User-ID')
     
-    # Filter lessons by category
-    matching_lessons = [
-        {
-            'lessonId': lesson['lesson_id'],
-            'title': lesson['title'],
-            'difficulty': lesson['difficulty'],
-            'durationMinutes': lesson['duration_minutes'],
-            'description': lesson['description'],
-            'category': lesson['category']
-        }
-        for lesson in SAMPLE_LESSONS
-        if lesson['category'] == category
-    ]
+    if not request.args:
+        entry = content_cache.get(('lessons', category))
+        if entry is not None:
+            return cached_response(entry)
+    
+    try:
+        page_args = lesson_page_args(category=category)
+        lessons, next_cursor = lesson_index.page(**page_args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
         'category': category,
-        'lessons': matching_lessons,
-        'count': len(matching_lessons)
+        'lessons': lessons,
+        'count': lesson_index.count(page_args['filters']),
+        'pageSize': len(lessons),
+        'nextCursor': next_cursor
     })
 
 @app.route('/api/concepts', methods=['GET'])
@@ -113,20 +613,96 @@ def get_concepts():
     """
     Get all learning concepts
     """
-    concepts = [
-        {
+    return cached_response(content_cache.get('concepts'))
+
+@app.route('/api/bootstrap', methods=['GET'])
+def get_bootstrap():
+    """
+    Everything the SPA needs on page load in one round trip: the first lesson
+    page, quiz and concept lists, and with X-User-ID the MasteryAggregator
+    progress summary as userProgress
+    """
+    entry = content_cache.get('bootstrap')
+    user_id = request.headers.get('X-User-ID')
+    if not user_id:
+        response = cached_response(entry)
+    else:
+        # The shared content part stays pre-serialized; only the progress is encoded
+        response = cached_response(extend_payload(entry, 'userProgress', progress_summary(user_id)))
+        response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('X-User-ID')
+    return response
+
+# ============================================================================
+# SEARCH ENDPOINTS
+# ============================================================================
+
+def search_result(key, score, terms):
+    kind = key[0]
+    if kind == 'concept':
+        concept = concepts_by_id.get(key[1])
+        if concept is None:
+            return None
+        return {
+            'type': 'concept',
             'conceptId': concept['concept_id'],
-            'conceptName': concept['concept_name'],
-            'category': concept['category'],
-            'description': concept['description'],
-            'resources': concept.get('resources', [])
+            'title': concept['concept_name'],
+            'snippet': snippet(concept['description'], terms),
+            'score': round(score, 4)
         }
-        for concept in SAMPLE_CONCEPTS
-    ]
+    lesson = lessons_by_id.get(key[1])
+    if lesson is None:
+        return None
+    if kind == 'lesson':
+        return {
+            'type': 'lesson',
+            'lessonId': lesson['lesson_id'],
+            'title': lesson['title'],
+            'snippet': snippet(lesson['description'], terms),
+            'score': round(score, 4)
+        }
+    if key[2] >= len(lesson['sections']):
+        return None
+    sec = lesson['sections'][key[2]]
+    return {
+        'type': 'section',
+        'lessonId': lesson['lesson_id'],
+        'lessonTitle': lesson['title'],
+        'sectionNum': sec['section_num'],
+        'title': sec['section_title'],
+        'snippet': snippet(sec['body'], terms),
+        'score': round(score, 4)
+    }
+
+@app.route('/api/search', methods=['GET'])
+def search():
+    """
+    BM25 search over lessons, sections and concepts
+    Query: q, limit, type (lesson|section|concept); the last word of q also
+    matches as a prefix unless q ends with a space
+    """
+    query = request.args.get('q', '')
+    if not query.strip():
+        return jsonify({'error': 'q is required'}), 400
+    try:
+        limit = int(request.args.get('limit', DEFAULT_SEARCH_LIMIT))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    if not 1 <= limit <= MAX_SEARCH_LIMIT:
+        return jsonify({'error': f'limit must be between 1 and {MAX_SEARCH_LIMIT}'}), 400
+    doc_type = request.args.get('type')
+    if doc_type is not None and doc_type not in SEARCH_TYPES:
+        return jsonify({'error': f'type must be one of {", ".join(SEARCH_TYPES)}'}), 400
+    
+    ensure_search_index()
+    accept = (lambda key: key[0] == doc_type) if doc_type else None
+    hits = search_index.search(query, limit=limit, accept=accept)
+    results = [result for result in (search_result(*hit) for hit in hits) if result is not None]
     
     return jsonify({
-        'concepts': concepts,
-        'count': len(concepts)
+        'query': query,
+        'results': results,
+        'count': len(results)
     })
 
 @app.route('/api/progress/track', methods=['POST'])
@@ -134,116 +710,145 @@ def track_progress():
     """
     Track lesson completion using ProgressTracker walker
     """
-    data = request.get_json()
+    data = request.get_json(silent=True) or {}
     user_id = data.get('userId')
     lesson_id = data.get('lessonId')
-    status = data.get('status')
-    time_spent = data.get('timeSpent')
+    status = data.get('status', 'in_progress')
+    time_spent = data.get('timeSpent', 0)
+    
+    if not user_id or lesson_id not in lessons_by_id:
+        return jsonify({'error': 'userId and a valid lessonId are required'}), 400
+    if status not in LESSON_STATUSES:
+        return jsonify({'error': f'status must be one of {", ".join(LESSON_STATUSES)}'}), 400
+    if (isinstance(time_spent, bool) or not isinstance(time_spent, (int, float))
+            or not math.isfinite(time_spent) or time_spent < 0):
+        return jsonify({'error': 'timeSpent must be a non-negative number of seconds'}), 400
     
     # Call ProgressTracker.track_lesson_progress()
+    try:
+        event = record_event(
+            'lesson_progress', userId=user_id, lessonId=lesson_id, status=status, timeSpent=time_spent
+        )
+    except (BufferFullError, CommitError):
+        return jsonify({'error': 'Progress service is busy, please retry'}), 503
+    
     # Call ProgressTracker.calculate_proficiency()
     # Call ProgressTracker.update_mastery_score()
+    snapshot = mastery_store.snapshot(user_id, event['ts'])
+    best_quiz = snapshot['best_quiz_by_lesson'].get(lesson_id, 0.0)
     
     return jsonify({
         'success': True,
+        'eventId': event['seq'],
         'message': f'Tracked progress for lesson {lesson_id}',
-        'proficiency': 0.85,
-        'masteryScore': 0.8
+        'proficiency': round(best_quiz / 100, 3),
+        'masteryScore': round(snapshot['lessons_completed'] / max(len(lessons_by_id), 1), 3)
     })
 
+def progress_summary(user_id, window_days=None):
+    """
+    MasteryAggregator progress payload; raises ValueError for an unsupported window
+    """
+    # Call MasteryAggregator.aggregate_mastery()
+    with subtimer('compute', 'MasteryAggregator.aggregate_mastery'):
+        snapshot = mastery_store.snapshot(user_id, time.time(), window_days)
+    
+    total_lessons = len(lessons_by_id)
+    recent_lessons = []
+    for lesson_id, entry in snapshot['recent_lessons']:
+        lesson = lessons_by_id.get(lesson_id)
+        if lesson is None:
+            continue
+        recent = {
+            'lessonId': lesson_id,
+            'title': lesson['title'],
+            'category': lesson['category'],
+            'status': entry['status']
+        }
+        if entry['status'] == 'completed':
+            recent['completedDate'] = datetime.fromtimestamp(entry['updatedAt'], timezone.utc).strftime('%Y-%m-%d')
+        recent_lessons.append(recent)
+    
+    # Call MasteryAggregator.identify_weak_areas()
+    weak_areas = [
+        {
+            'lessonId': lesson_id,
+            'conceptName': lessons_by_id[lesson_id]['title'],
+            'proficiency': round(best / 100, 3)
+        }
+        for lesson_id, best in sorted(snapshot['best_quiz_by_lesson'].items(), key=lambda item: item[1])
+        if best < PASSING_SCORE and lesson_id in lessons_by_id
+    ][:3]
+    
+    payload = {
+        'userId': user_id,
+        'overallProgress': round(snapshot['lessons_completed'] / total_lessons * 100) if total_lessons else 0,
+        'lessonsCompleted': snapshot['lessons_completed'],
+        'totalLessons': total_lessons,
+        'avgQuizScore': round(snapshot['avg_quiz_score'], 1),
+        'currentStreak': snapshot['current_streak'],
+        'hoursThisWeek': round(snapshot['hours_this_week'], 1),
+        'hoursThisMonth': round(snapshot['hours_this_month'], 1),
+        'totalHours': round(snapshot['total_hours'], 1),
+        'recentLessons': recent_lessons,
+        'weakAreas': weak_areas
+    }
+    if window_days is not None:
+        payload['windowDays'] = window_days
+        payload['windowHours'] = round(snapshot['window_hours'], 1)
+    return payload
+
 @app.route('/api/users/<user_id>/progress', methods=['GET'])
 def get_user_progress(user_id):
     """
     Get overall user progress using MasteryAggregator walker
+    Query: windowDays (one of the precomputed rolling windows) adds windowHours
     """
+    window_days = request.args.get('windowDays', type=int)
     
-    # Call MasteryAggregator.aggregate_mastery()
-    # Call MasteryAggregator.identify_weak_areas()
+    try:
+        payload = progress_summary(user_id, window_days)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    return jsonify({
-        'userId': user_id,
-        'overallProgress': 65,
-        'lessonsCompleted': 12,
-        'totalLessons': 20,
-        'avgQuizScore': 78.5,
-        'currentStreak': 7,
-        'hoursThisWeek': 5.5,
-        'hoursThisMonth': 22,
-        'totalHours': 45,
-        'recentLessons': [
-            {
-                'title': 'Walkers and Traversal',
-                'category': 'walkers',
-                'status': 'completed',
-                'completedDate': '2 days ago'
-            },
-            {
-                'title': 'Advanced OSP Patterns',
-                'category': 'osp',
-                'status': 'in_progress'
-            }
-        ],
-        'weakAreas': [
-            {
-                'conceptName': 'Advanced Walkers',
-                'proficiency': 0.45
-            },
-            {
-                'conceptName': 'Edge Mutations',
-                'proficiency': 0.55
-            }
-        ]
-    })
+    return jsonify(payload)
 
 @app.route('/api/users/<user_id>/skill-map', methods=['GET'])
 def get_skill_map(user_id):
     """
     Get skill map visualization using MasteryAggregator walker
     """
+    with subtimer('compute', 'MasteryAggregator.generate_skill_map'):
+        key, state = mastery_store.skill_state(user_id, skill_graph)
+    cached = skill_map_cache.get(user_id)
+    if cached is not None and cached[0] == key:
+        return cached_response(cached[1])
     
     # Call MasteryAggregator.generate_skill_map()
+    concepts = []
+    for i, concept in enumerate(skill_graph.concepts):
+        score = state.mastery[i]
+        last_practiced = state.last_practiced[i]
+        concepts.append({
+            'conceptId': concept['concept_id'],
+            'conceptName': concept['concept_name'],
+            'category': concept['category'],
+            'description': concept['description'],
+            'prerequisites': skill_graph.prereq_ids[i],
+            'masteryScore': round(score, 3),
+            'isUnlocked': bool(state.unlocked_bits >> i & 1),
+            'unlockThreshold': skill_graph.thresholds[i],
+            'timesPracticed': state.times_practiced[i],
+            'lastPracticed': (
+                datetime.fromtimestamp(last_practiced, timezone.utc).strftime('%Y-%m-%d')
+                if last_practiced is not None else None
+            ),
+            'strength': strength_of(score)
+        })
     
-    return jsonify({
-        'userId': user_id,
-        'concepts': [
-            {
-                'conceptId': 'nodes-basics',
-                'conceptName': 'Node Basics',
-                'category': 'core',
-                'description': 'Understanding graph nodes in Jac',
-                'masteryScore': 0.95,
-                'isUnlocked': True,
-                'unlockThreshold': 0.7,
-                'timesPracticed': 15,
-                'lastPracticed': '1 day ago',
-                'strength': 'mastered'
-            },
-            {
-                'conceptId': 'walkers',
-                'conceptName': 'Walkers',
-                'category': 'core',
-                'description': 'Graph traversal and walker patterns',
-                'masteryScore': 0.65,
-                'isUnlocked': True,
-                'unlockThreshold': 0.7,
-                'timesPracticed': 8,
-                'lastPracticed': '2 days ago',
-                'strength': 'developing'
-            },
-            {
-                'conceptId': 'by-llm',
-                'conceptName': 'byLLM Agents',
-                'category': 'advanced',
-                'description': 'Using LLM decorators for AI integration',
-                'masteryScore': 0.35,
-                'isUnlocked': False,
-                'unlockThreshold': 0.8,
-                'timesPracticed': 2,
-                'lastPracticed': None,
-                'strength': 'weak'
-            }
-        ]
-    })
+    entry = make_payload({'userId': user_id, 'concepts': concepts})
+    skill_map_cache.put(user_id, (key, entry))
+    return cached_response(entry)
 
 # ============================================================================
 # QUIZ ENDPOINTS
@@ -256,27 +861,9 @@ def get_quiz(quiz_id):
     """
     user_id = request.headers.get('X-User-ID')
     
-    if quiz_id in quizzes_by_id:
-        quiz = quizzes_by_id[quiz_id]
-        return jsonify({
-            'quizId': quiz['quiz_id'],
-            'title': quiz['title'],
-            'description': quiz.get('description', ''),
-            'difficulty': quiz['difficulty'],
-            'lessonId': quiz.get('lesson_id'),
-            'questions': [
-                {
-                    'questionId': q['question_id'],
-                    'questionText': q['question_text'],
-                    'questionType': q['question_type'],
-                    'options': q.get('options', []),
-                    'starterCode': q.get('starter_code', ''),
-                    'keywords': q.get('keywords', []),
-                    'correctAnswer': q.get('correct_answer')
-                }
-                for q in quiz['questions']
-            ]
-        })
+    entry = content_cache.get(('quiz', quiz_id))
+    if entry is not None:
+        return cached_response(entry)
     
     return jsonify({'error': 'Quiz not found'}), 404
 
@@ -306,21 +893,7 @@ def get_all_quizzes():
     """
     Get all available quizzes
     """
-    quizzes = [
-        {
-            'quizId': quiz['quiz_id'],
-            'title': quiz['title'],
-            'difficulty': quiz['difficulty'],
-            'lessonId': quiz.get('lesson_id'),
-            'questionCount': len(quiz['questions'])
-        }
-        for quiz in SAMPLE_QUIZZES
-    ]
-    
-    return jsonify({
-        'quizzes': quizzes,
-        'count': len(quizzes)
-    })
+    return cached_response(content_cache.get('quizzes'))
 
 @app.route('/api/quizzes/evaluate-answer', methods=['POST'])
 def evaluate_answer():
@@ -328,56 +901,93 @@ def evaluate_answer():
     Evaluate quiz answer using QuizAssessor walker
     """
     data = request.get_json()
+    quiz_id = data.get('quizId')
     question_id = data.get('questionId')
     user_answer = data.get('userAnswer')
-    question_type = data.get('questionType')
-    
-    # Based on question type, call appropriate QuizAssessor method:
-    # - evaluate_free_text_answer() for free_text
-    # - evaluate_code_answer() for code
-    # - evaluate_multiple_choice() for multiple_choice
-    
-    if question_type == 'free_text':
-        # Call QuizAssessor.evaluate_free_text_answer()
-        is_correct = len(user_answer) > 10  # Simple heuristic
-    elif question_type == 'multiple_choice':
-        is_correct = user_answer == 'A data structure that represents a vertex in a graph'
-    else:
-        is_correct = user_answer == 'true'
+    
+    # Graders are compiled per quiz at content load and dispatch on
+    # question_type once; free_text/code map to
+    # QuizAssessor.evaluate_free_text_answer() / evaluate_code_answer()
+    grader = graders_by_quiz.get(quiz_id)
+    question = grader.by_id.get(question_id) if grader is not None else None
+    if question is None:
+        return jsonify({'error': 'Question not found'}), 404
+    
+    with subtimer('compute', 'QuizAssessor.evaluate_answer'):
+        is_correct, feedback = question.grade(user_answer)
     
     return jsonify({
         'correct': is_correct,
-        'feedback': {
-            'correct': is_correct,
-            'message': 'Great job!' if is_correct else 'Not quite right.',
-            'explanation': 'Nodes are vertices in a graph that can hold data...'
-        }
+        'feedback': feedback
     })
 
 @app.route('/api/quizzes/score', methods=['POST'])
 def score_quiz():
     """
     Calculate quiz score using QuizAssessor walker
+    Answers are graded server-side; any client-supplied feedback is ignored
     """
     data = request.get_json()
     quiz_id = data.get('quizId')
     user_id = data.get('userId')
     
+    grader = graders_by_quiz.get(quiz_id)
+    if grader is None:
+        return jsonify({'error': 'Quiz not found'}), 404
+    answers = data.get('answers', {})
+    if not isinstance(answers, dict):
+        return jsonify({'error': 'answers must be an object keyed by questionId'}), 400
+    
     # Call QuizAssessor.score_quiz_attempt()
+    with subtimer('compute', 'QuizAssessor.score_quiz_attempt'):
+        result = grader.grade(answers)
+    
     # Call ProgressTracker.update_mastery_score()
+    if user_id:
+        try:
+            record_quiz_attempt(user_id, quiz_id, answers, result)
+        except (BufferFullError, CommitError):
+            return jsonify({'error': 'Progress service is busy, please retry'}), 503
+    
+    return jsonify({
+        'quizId': quiz_id,
+        'score': result['score'],
+        'correctAnswers': result['correctAnswers'],
+        'totalQuestions': result['totalQuestions'],
+        'passed': result['passed']
+    })
+
+@app.route('/api/quizzes/<quiz_id>/evaluate', methods=['POST'])
+def evaluate_quiz_attempt(quiz_id):
+    """
+    Grade a whole quiz attempt in one request using QuizAssessor walker
+    Body: {userId, answers: {questionId: userAnswer}}
+    """
+    grader = graders_by_quiz.get(quiz_id)
+    if grader is None:
+        return jsonify({'error': 'Quiz not found'}), 404
+    
+    data = request.get_json(silent=True) or {}
+    user_id = data.get('userId')
+    answers = data.get('answers', {})
+    if not isinstance(answers, dict):
+        return jsonify({'error': 'answers must be an object keyed by questionId'}), 400
     
-    total_questions = len(data.get('answers', {}))
-    # Count correct answers from feedback
-    correct = sum(1 for f in data.get('feedback', {}).values() if f.get('correct'))
+    # Call QuizAssessor.score_quiz_attempt()
+    with subtimer('compute', 'QuizAssessor.score_quiz_attempt'):
+        result = grader.grade(answers)
     
-    score = (correct / total_questions * 100) if total_questions > 0 else 0
+    # Call ProgressTracker.update_mastery_score()
+    if user_id:
+        try:
+            record_quiz_attempt(user_id, quiz_id, answers, result)
+        except (BufferFullError, CommitError):
+            return jsonify({'error': 'Progress service is busy, please retry'}), 503
     
     return jsonify({
         'quizId': quiz_id,
-        'score': score,
-        'correctAnswers': correct,
-        'totalQuestions': total_questions,
-        'passed': score >= 70
+        'userId': user_id,
+        **result
     })
 
 # ============================================================================
@@ -389,40 +999,58 @@ def get_recommendations(user_id):
     """
     Get learning recommendations using LearningPathOptimizer walker
     """
+    entry = recommendation_cache.get(user_id)
+    if entry is not None:
+        return cached_response(entry)
     
     # Call LearningPathOptimizer.analyze_learning_graph()
+    with subtimer('compute', 'LearningPathOptimizer.recommend_next_lesson'):
+        # The key is read first: any event after it changes the key, so a
+        # result built from newer inputs than the key describes is never cached
+        key, state = mastery_store.skill_state(user_id, skill_graph)
+        completed = mastery_store.completed_lessons(user_id)
+        ranked = recommender.recommend(completed, state)
+    
     # Call LearningPathOptimizer.recommend_next_lesson()
+    next_lessons = []
+    reasons = []
+    for lesson, score, lesson_reasons in ranked:
+        next_lessons.append({
+            'lessonId': lesson['lesson_id'],
+            'title': lesson['title'],
+            'difficulty': lesson['difficulty'],
+            'durationMinutes': lesson['duration_minutes'],
+            'category': lesson['category'],
+            'score': round(score, 3)
+        })
+        reasons.append('; '.join(lesson_reasons) or 'Recommended to round out your learning path')
+    
     # Call LearningPathOptimizer.identify_struggle_areas()
+    struggling = []
+    for concept, mastery, review_lesson_id in recommender.struggling(skill_graph, state):
+        review_lesson = lessons_by_id.get(review_lesson_id)
+        struggling.append({
+            'conceptId': concept['concept_id'],
+            'conceptName': concept['concept_name'],
+            'masteryScore': round(mastery, 3),
+            'recommendation': (
+                f"Review {review_lesson['title']}" if review_lesson else f"Practice {concept['concept_name']}"
+            )
+        })
     
-    return jsonify({
+    entry = make_payload({
         'userId': user_id,
-        'nextLessons': [
-            {
-                'lessonId': 'advanced-walkers-1',
-                'title': 'Advanced Walker Patterns',
-                'difficulty': 'intermediate',
-                'durationMinutes': 45,
-                'category': 'walkers'
-            },
-            {
-                'lessonId': 'osp-advanced-1',
-                'title': 'Complex OSP Structures',
-                'difficulty': 'advanced',
-                'durationMinutes': 60,
-                'category': 'osp'
-            }
-        ],
-        'reasons': [
-            'You\'ve mastered walker basics. Time for advanced patterns!',
-            'Recommended for deepening your OSP knowledge.'
-        ],
-        'strugglingConcepts': [
-            {
-                'conceptName': 'Edge Mutations',
-                'recommendation': 'Review the edge mutation tutorial'
-            }
-        ]
+        'nextLessons': next_lessons,
+        'reasons': reasons,
+        'strugglingConcepts': struggling
     })
+    # Events and content reloads that landed while this was computed change the
+    # key; apply_event() runs under event_lock, so an event after the check
+    # still drops the entry
+    with event_lock:
+        if mastery_store.version_key(user_id, skill_graph) == key:
+            recommendation_cache.put(user_id, entry)
+    return cached_response(entry)
 
 # ============================================================================
 # EXERCISE ENDPOINTS
@@ -433,23 +1061,43 @@ def validate_code_exercise():
     """
     Validate code exercise using ContentValidator walker
     """
-    data = request.get_json()
+    data = request.get_json(silent=True) or {}
     exercise_id = data.get('exerciseId')
     code = data.get('code')
     
+    if not isinstance(code, str) or not code.strip():
+        return jsonify({'error': 'code is required'}), 400
+    exercise = exercises_by_id.get(exercise_id)
+    if not exercise:
+        return jsonify({'error': 'Exercise not found'}), 404
+    
+    def run_tests():
+        with subtimer('runner', 'exercise_pool.run'):
+            return exercise_pool.run(code, exercise['test_cases'])
+    
     # Call ContentValidator.validate_code_exercise()
-    # Run code against test cases
+    # Compiles and runs the code against CodeExercise.test_cases in a warm worker,
+    # unless an identical submission was already validated
+    key = submission_key(exercise_id, exercise['test_cases'], code, SUBMISSION_RUNNER_TAG)
+    try:
+        result, tier = submission_cache.fetch(key, run_tests)
+    except PoolBusyError:
+        return jsonify({'error': 'All code runners are busy, please retry'}), 503
+    except PoolUnavailableError as e:
+        return jsonify({'error': f'Code runner unavailable: {e}'}), 503
+    submission_cache_lookups.inc((tier or 'miss',))
     
+    passed = sum(1 for test in result['tests'] if test['passed'])
     return jsonify({
         'exerciseId': exercise_id,
-        'allPassed': True,
-        'passedTests': 3,
-        'totalTests': 3,
-        'testDetails': [
-            {'name': 'Test 1: Basic node creation', 'passed': True},
-            {'name': 'Test 2: Node attributes', 'passed': True},
-            {'name': 'Test 3: Edge creation', 'passed': True}
-        ]
+        'status': result['status'],
+        'allPassed': passed == len(result['tests']),
+        'passedTests': passed,
+        'totalTests': len(result['tests']),
+        'testDetails': result['tests'],
+        'compileErrors': result['compileErrors'],
+        'output': result['output'],
+        'cached': tier is not None
     })
 
 @app.route('/api/exercises/submit', methods=['POST'])
@@ -457,12 +1105,19 @@ def submit_exercise():
     """
     Submit exercise solution using ProgressTracker walker
     """
-    data = request.get_json()
+    data = request.get_json(silent=True) or {}
     exercise_id = data.get('exerciseId')
     user_id = data.get('userId')
     
+    if not user_id or not exercise_id:
+        return jsonify({'error': 'userId and exerciseId are required'}), 400
+    
     # Call ProgressTracker.track_lesson_progress()
     # Call ProgressTracker.update_mastery_score()
+    try:
+        record_event('exercise_submission', userId=user_id, exerciseId=exercise_id, pointsEarned=10)
+    except (BufferFullError, CommitError):
+        return jsonify({'error': 'Progress service is busy, please retry'}), 503
     
     return jsonify({
         'success': True,
@@ -471,5 +1126,113 @@ def submit_exercise():
         'pointsEarned': 10
     })
 
+# ============================================================================
+# WALKER ENDPOINTS
+# ============================================================================
+
+@app.route('/api/walkers/<walker_name>', methods=['POST'])
+def run_walker(walker_name):
+    """
+    Spawn a compiled Jac walker with the JSON body as its fields
+    Returns the walker's reports; with ?stream=1 they are sent as
+    newline-delimited JSON while the walker runs
+    """
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Body must be a JSON object of walker fields'}), 400
+    
+    try:
+        if walker_service is None:
+            walker_bridge.walker_class(walker_name)
+            with subtimer('walker', walker_name):
+                reports = walker_bridge.run(walker_name, **data)
+        elif request.args.get('stream') == '1':
+            return stream_walker(walker_name, data)
+        else:
+            with subtimer('walker', walker_name):
+                reports = walker_service.run(walker_name, **data)
+    except UnknownWalkerError:
+        return jsonify({'error': f'Unknown walker: {walker_name}'}), 404
+    except ServiceBusyError:
+        return jsonify({'error': 'All walker workers are busy, please retry'}), 503
+    except BridgeUnavailableError as e:
+        return jsonify({'error': f'Walkers are unavailable: {e}'}), 503
+    except WalkerFailedError as e:
+        return jsonify({'error': str(e)}), 503
+    except TypeError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        'walker': walker_name,
+        'reports': jsonable(reports)
+    })
+
+def stream_walker(walker_name, fields):
+    """
+    NDJSON response of a walker's reports from the walker service
+    Runs up to the first report here, so errors before it still get a status code
+    """
+    reports = walker_service.stream(walker_name, **fields)
+    try:
+        first = [next(reports)]
+    except StopIteration:
+        first = []
+    
+    def lines():
+        try:
+            for report in itertools.chain(first, reports):
+                yield json.dumps(report, separators=(',', ':')).encode('utf-8') + b'\n'
+        except RuntimeError as e:
+            # Headers are already sent; the last line says why the stream stopped
+            yield json.dumps({'error': str(e)}).encode('utf-8') + b'\n'
+    
+    response = Response(lines(), mimetype='application/x-ndjson')
+    # Abandoning the stream ends the run; its worker is replaced
+    response.call_on_close(reports.close)
+    return response
+
+# ============================================================================
+# EXPORT ENDPOINTS
+# ============================================================================
+
+@app.route('/api/export/events', methods=['GET'])
+def export_events():
+    """
+    Stream UserProgress and QuizAttempt history as newline-delimited JSON
+    Query: type (comma-separated, default lesson_progress,quiz_attempt), userId,
+           since/until (epoch seconds or ISO 8601), cursor (last seq received)
+    """
+    args = request.args
+    types = tuple(t for t in args.get('type', ','.join(DEFAULT_TYPES)).split(',') if t)
+    unknown = [t for t in types if t not in EXPORT_TYPES]
+    if unknown or not types:
+        return jsonify({'error': f'type must be one or more of {", ".join(EXPORT_TYPES)}'}), 400
+    try:
+        since = parse_time(args['since']) if args.get('since') else None
+        until = parse_time(args['until']) if args.get('until') else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        after_seq = int(args.get('cursor', 0))
+    except ValueError:
+        return jsonify({'error': 'cursor must be the seq of the last event received'}), 400
+    
+    if not export_slots.acquire(blocking=False):
+        return jsonify({'error': 'Too many exports running, please retry later'}), 429
+    
+    chunks = export_chunks(event_store, types, args.get('userId'), since, until, after_seq)
+    slot = {'held': True}
+    
+    def release_slot():
+        # Runs when the stream finishes or the client disconnects, possibly twice
+        if slot.pop('held', False):
+            export_slots.release()
+    
+    response = Response(chunks, mimetype='application/x-ndjson')
+    response.call_on_close(release_slot)
+    return response
+
 if __name__ == '__main__':
+    if walker_service is not None:
+        walker_service.launch()
     app.run(debug=False, port=5000)
@@ -0,0 +1,113 @@
+"""
+Content-Encoding negotiation for API responses
+Cached catalog payloads carry gzip (and, with the optional brotli package,
+br) variants compressed once at maximum level; cached_response() serves them
+as-is. Every other response is compressed per request at a cheaper level,
+and only when it is at least MIN_COMPRESS_SIZE bytes
+"""
+
+import gzip
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # br is offered only when the brotli package is installed
+    brotli = None
+
+# Preferred first when the client rates encodings equally
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+# Below this, savings do not pay for the CPU and the extra header
+MIN_COMPRESS_SIZE = 1024
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/plain', 'text/html')
+# (gzip level, brotli quality) for precompressed variants and per-request compression
+PRECOMPRESS_LEVELS = (9, 11)
+DYNAMIC_LEVELS = (6, 4)
+
+
+def compress(body, encoding, levels=DYNAMIC_LEVELS):
+    if encoding == 'br':
+        return brotli.compress(body, quality=levels[1])
+    # mtime=0 keeps the output, and therefore the variant ETag, deterministic
+    return gzip.compress(body, compresslevel=levels[0], mtime=0)
+
+
+def precompress(body):
+    """
+    {encoding: bytes} for a cached body; empty when compression would not pay off
+    """
+    if len(body) < MIN_COMPRESS_SIZE:
+        return {}
+    variants = {}
+    for encoding in ENCODINGS:
+        data = compress(body, encoding, PRECOMPRESS_LEVELS)
+        if len(data) < len(body):
+            variants[encoding] = data
+    return variants
+
+
+def negotiate():
+    """
+    Best encoding the current request accepts, or None for identity
+    """
+    accepted = request.accept_encodings
+    best = None
+    best_quality = 0
+    for encoding in ENCODINGS:
+        quality = accepted.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def entry_encoding(entry):
+    """
+    Encoding to send a CachedPayload with, or None for identity
+    """
+    if len(entry.body) < MIN_COMPRESS_SIZE:
+        return None
+    encoding = negotiate()
+    # A precompressed entry lacks an encoding only when it did not make the body smaller
+    if encoding is None or (entry.encoded is not None and encoding not in entry.encoded):
+        return None
+    return encoding
+
+
+def variant_etag(entry, encoding):
+    """
+    Each encoding gets its own ETag so a revalidation never matches the wrong bytes
+    """
+    return f'{entry.etag}-{encoding}' if encoding else entry.etag
+
+
+def entry_body(entry, encoding):
+    if encoding is None:
+        return entry.body
+    if entry.encoded is not None:
+        return entry.encoded[encoding]
+    return compress(entry.body, encoding)
+
+
+def init_app(app):
+    """
+    Compress large uncompressed responses after the view has run
+    Register after metrics.init_app so recorded sizes are on-the-wire sizes
+    """
+
+    @app.after_request
+    def _compress_response(response):
+        response.vary.add('Accept-Encoding')
+        if (response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_TYPES
+                or not 200 <= response.status_code < 300):
+            return response
+        body = response.get_data()
+        if len(body) < MIN_COMPRESS_SIZE:
+            return response
+        encoding = negotiate()
+        if encoding is None:
+            return response
+        response.set_data(compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,118 @@
+"""
+Pre-serialized response cache for catalog content
+Lesson and quiz payloads are immutable between content loads, so each body is
+encoded and compressed once and served by key together with a strong ETag
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict, namedtuple
+
+from compression import precompress
+
+# body: encoded JSON bytes, etag: unquoted strong entity tag derived from body,
+# encoded: {content coding: compressed body}, or None if never precompressed
+CachedPayload = namedtuple('CachedPayload', ['body', 'etag', 'encoded'], defaults=(None,))
+
+
+def serialize(payload):
+    """
+    Encode a payload exactly like Flask's jsonify does outside debug mode
+    """
+    text = json.dumps(payload, separators=(',', ':'), sort_keys=True, ensure_ascii=True)
+    return (text + '\n').encode('utf-8')
+
+
+def make_etag(body):
+    """
+    Derive a strong ETag from the serialized bytes
+    """
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+def make_payload(payload, precompressed=False):
+    """
+    Serialize payload; precompressed also stores gzip/br variants, for bodies
+    that are served many times
+    """
+    body = serialize(payload)
+    return CachedPayload(body, make_etag(body), precompress(body) if precompressed else None)
+
+
+def extend_payload(entry, key, value):
+    """
+    Add key: value to a cached JSON object without re-encoding it
+    The body is checked rather than trusted to be a serialize()d object;
+    key is appended after the existing keys
+    """
+    body = entry.body
+    if not (body.startswith(b'{') and body.endswith(b'}\n')):
+        raise ValueError('Only a serialized JSON object can be extended')
+    separator = b'' if body == b'{}\n' else b','
+    member = json.dumps(key, ensure_ascii=True).encode('utf-8') + b':' + serialize(value)[:-1]
+    extended = body[:-2] + separator + member + b'}\n'
+    return CachedPayload(extended, make_etag(extended))
+
+
+class ContentCache:
+    """
+    Key -> CachedPayload store, rebuilt whenever content is (re)loaded
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def put(self, key, payload):
+        entry = make_payload(payload, precompressed=True)
+        self._entries[key] = entry
+        return entry
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+
+class LRUCache:
+    """
+    Thread-safe bounded mapping that evicts the least recently used key
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return default
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._entries.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
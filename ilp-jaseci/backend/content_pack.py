@@ -0,0 +1,232 @@
+"""
+Binary content pack built from sample_data
+Layout: MAGIC, a little-endian uint32 header length, a JSON header holding
+lesson/quiz/concept/exercise metadata, then length-prefixed UTF-8 blobs for
+every section body and code example, plus their pre-rendered HTML and
+highlight tokens. The API memory-maps the pack and reads blobs only when a
+section field is accessed, so startup cost and resident memory track the
+metadata rather than the size of the lesson text. The search index's analyzed
+documents are built into one more blob, so indexing never touches the bodies
+
+The header records a hash of sample_data.py; open_pack() rebuilds a pack
+whose hash no longer matches. Build it by hand after editing content:
+    python content_pack.py [--output data/content.pack]
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from collections.abc import Mapping
+
+from content_render import RenderCache
+from search_index import analyze, catalog_documents
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'ILPPACK\x01'
+LENGTH = struct.Struct('<I')
+# Section fields stored as blobs instead of in the header
+BLOB_FIELDS = ('body', 'code_example')
+# Pre-rendered section fields; code_tokens blobs hold JSON
+RENDERED_FIELDS = ('body_html', 'code_tokens')
+JSON_FIELDS = ('code_tokens',)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+DEFAULT_PACK_PATH = os.path.join(DATA_DIR, 'content.pack')
+DEFAULT_RENDER_CACHE_PATH = os.path.join(DATA_DIR, 'render-cache.json')
+SAMPLE_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sample_data.py')
+
+
+def source_hash(path=SAMPLE_DATA_PATH):
+    """
+    Hash of the content source a pack is built from
+    """
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_sample_data():
+    """
+    The sample_data module, re-imported so edits since the last import are picked up
+    """
+    module = sys.modules.get('sample_data')
+    return importlib.reload(module) if module else importlib.import_module('sample_data')
+
+
+def build_pack(path, lessons, quizzes, concepts, exercises=(), renderer=None, source=None):
+    """
+    Write a pack to path atomically; returns the number of bytes written
+    With a RenderCache, sections also carry body_html and code_tokens; source
+    is the source_hash() recorded in the header
+    """
+    blobs = bytearray()
+
+    def add_blob(text):
+        data = (text or '').encode('utf-8')
+        offset = len(blobs)
+        blobs.extend(LENGTH.pack(len(data)))
+        blobs.extend(data)
+        return offset
+
+    packed_lessons = []
+    for lesson in lessons:
+        sections = []
+        for section in lesson.get('sections', []):
+            meta = {key: value for key, value in section.items() if key not in BLOB_FIELDS}
+            meta['_blobs'] = {field: add_blob(section.get(field, '')) for field in BLOB_FIELDS}
+            if renderer is not None:
+                meta['_blobs']['body_html'] = add_blob(renderer.body_html(section.get('body', '')))
+                tokens = renderer.code_tokens(section.get('code_example', ''))
+                meta['_blobs']['code_tokens'] = add_blob(json.dumps(tokens, separators=(',', ':')))
+            sections.append(meta)
+        packed_lessons.append(dict(lesson, sections=sections))
+
+    search = [
+        [list(key), *analyze(fields)]
+        for key, fields in catalog_documents(lessons, concepts).items()
+    ]
+
+    header = json.dumps({
+        'source': source,
+        'lessons': packed_lessons,
+        'quizzes': list(quizzes),
+        'concepts': list(concepts),
+        'exercises': list(exercises),
+        'search': add_blob(json.dumps(search, separators=(',', ':')))
+    }, separators=(',', ':')).encode('utf-8')
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    # A unique temporary name, since several processes may rebuild a stale pack at once
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(MAGIC)
+        f.write(LENGTH.pack(len(header)))
+        f.write(header)
+        f.write(blobs)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+    return len(MAGIC) + LENGTH.size + len(header) + len(blobs)
+
+
+class LazySection(Mapping):
+    """
+    Read-only section mapping whose body and code example are read from the pack on access
+    """
+
+    __slots__ = ('_pack', '_meta', '_blobs')
+
+    def __init__(self, pack, meta):
+        self._pack = pack
+        self._blobs = meta.pop('_blobs')
+        self._meta = meta
+
+    def __getitem__(self, key):
+        offset = self._blobs.get(key)
+        if offset is not None:
+            value = self._pack.read_blob(offset)
+            return json.loads(value) if key in JSON_FIELDS else value
+        return self._meta[key]
+
+    def __iter__(self):
+        yield from self._meta
+        yield from self._blobs
+
+    def __len__(self):
+        return len(self._meta) + len(self._blobs)
+
+    def __repr__(self):
+        return f'LazySection({self._meta.get("section_num")!r})'
+
+
+class ContentPack:
+    """
+    Memory-mapped pack; the mapping stays open while any LazySection refers to it
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'{path} is not an ILP content pack')
+        (header_length,) = LENGTH.unpack_from(self._map, len(MAGIC))
+        header_start = len(MAGIC) + LENGTH.size
+        self._blob_start = header_start + header_length
+        header = json.loads(self._map[header_start:self._blob_start])
+
+        self.lessons = header['lessons']
+        for lesson in self.lessons:
+            lesson['sections'] = [LazySection(self, meta) for meta in lesson['sections']]
+        self.quizzes = header['quizzes']
+        self.concepts = header['concepts']
+        self.exercises = header['exercises']
+        self.source = header.get('source')
+        self._search = header.get('search')
+
+    def read_blob(self, offset):
+        start = self._blob_start + offset
+        (length,) = LENGTH.unpack_from(self._map, start)
+        start += LENGTH.size
+        return self._map[start:start + length].decode('utf-8')
+
+    def search_documents(self):
+        """
+        {document key: analyze() result} for SearchIndex.sync_analyzed(), or
+        None for packs built without them
+        """
+        if self._search is None:
+            return None
+        return {tuple(key): tuple(analyzed) for key, *analyzed in json.loads(self.read_blob(self._search))}
+
+
+def build_from_sample_data(path=DEFAULT_PACK_PATH, render_cache_path=DEFAULT_RENDER_CACHE_PATH):
+    """
+    Build the pack at path from a fresh import of sample_data; returns (module, bytes written, renderer)
+    """
+    source = source_hash()
+    sample_data = load_sample_data()
+    renderer = RenderCache(render_cache_path)
+    size = build_pack(path, sample_data.SAMPLE_LESSONS, sample_data.SAMPLE_QUIZZES,
+                      sample_data.SAMPLE_CONCEPTS, sample_data.SAMPLE_EXERCISES, renderer, source)
+    renderer.save()
+    return sample_data, size, renderer
+
+
+def open_pack(path=DEFAULT_PACK_PATH):
+    """
+    The pack at path, rebuilt first if sample_data.py has changed since it was
+    built; None when no pack has been built
+    """
+    if not os.path.exists(path):
+        return None
+    pack = ContentPack(path)
+    # Deployments may ship the pack without its source
+    if os.path.exists(SAMPLE_DATA_PATH) and pack.source != source_hash():
+        logger.warning('%s was built from an older sample_data.py; rebuilding it', path)
+        build_from_sample_data(path)
+        pack = ContentPack(path)
+    return pack
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compile sample_data into a binary content pack')
+    parser.add_argument('--output', default=DEFAULT_PACK_PATH)
+    parser.add_argument('--render-cache', default=DEFAULT_RENDER_CACHE_PATH,
+                        help='rendered sections keyed by content hash, reused between builds')
+    args = parser.parse_args(argv)
+
+    sample_data, size, renderer = build_from_sample_data(args.output, args.render_cache)
+    print(f'Wrote {len(sample_data.SAMPLE_LESSONS)} lessons ({size} bytes) to {args.output}; '
+          f'rendered {renderer.rendered} of {len(renderer.used)} section fields')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,304 @@
+"""
+Pre-rendering for lesson sections
+Bodies (Markdown, or the HTML fragments the sample content uses) become
+sanitized HTML and code examples become [kind, text] highlight tokens from the
+jaclang parser. Results are memoized by content hash, optionally in a JSON
+file, so a content build only re-renders sections whose text changed
+"""
+
+import hashlib
+import html
+import json
+import os
+import re
+import tempfile
+import textwrap
+from html.parser import HTMLParser
+
+# Bump when rendering output changes so stale cache entries are ignored
+RENDER_VERSION = 1
+
+ALLOWED_TAGS = {
+    'a', 'b', 'blockquote', 'br', 'code', 'em', 'h1', 'h2', 'h3', 'h4', 'hr', 'i', 'li',
+    'ol', 'p', 'pre', 'span', 'strong', 'table', 'tbody', 'td', 'th', 'thead', 'tr', 'ul'
+}
+VOID_TAGS = {'br', 'hr'}
+ALLOWED_ATTRS = {'a': {'href', 'title'}, 'span': {'class'}, 'code': {'class'}}
+# Elements dropped together with their content
+DROP_CONTENT_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'template'}
+SAFE_URL = re.compile(r'^(https?:|mailto:|/|#|\.{0,2}/|[^:]*$)', re.IGNORECASE)
+
+
+# ============================================================================
+# HTML
+# ============================================================================
+
+class _Sanitizer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.open_tags = []
+        self.dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping += 1
+            return
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+        kept = []
+        for name, value in attrs:
+            if name not in ALLOWED_ATTRS.get(tag, ()) or value is None:
+                continue
+            if name == 'href' and not SAFE_URL.match(value.strip()):
+                continue
+            kept.append(f' {name}="{html.escape(value, quote=True)}"')
+        self.out.append(f'<{tag}{"".join(kept)}>')
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping = max(0, self.dropping - 1)
+            return
+        if self.dropping or tag not in self.open_tags:
+            return
+        # Close anything left open inside this element
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.out.append(f'</{open_tag}>')
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.out.append(html.escape(data, quote=False))
+
+    def result(self):
+        self.close()
+        return ''.join(self.out) + ''.join(f'</{tag}>' for tag in reversed(self.open_tags))
+
+
+def sanitize_html(fragment):
+    sanitizer = _Sanitizer()
+    sanitizer.feed(fragment)
+    return sanitizer.result()
+
+
+# ============================================================================
+# MARKDOWN
+# ============================================================================
+
+INLINE_RULES = (
+    (re.compile(r'\*\*(.+?)\*\*'), r'<strong>\1</strong>'),
+    (re.compile(r'(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)'), r'<em>\1</em>'),
+    (re.compile(r'\[([^\]]+)\]\(([^)\s]+)\)'), r'<a href="\2">\1</a>'),
+)
+
+
+def _inline(text):
+    # Code spans first, so their contents are not treated as emphasis
+    parts = re.split(r'(`[^`]+`)', text)
+    rendered = []
+    for part in parts:
+        if part.startswith('`') and part.endswith('`') and len(part) > 1:
+            rendered.append(f'<code>{html.escape(part[1:-1], quote=False)}</code>')
+            continue
+        part = html.escape(part, quote=False)
+        for pattern, replacement in INLINE_RULES:
+            part = pattern.sub(replacement, part)
+        rendered.append(part)
+    return ''.join(rendered)
+
+
+def render_markdown(text):
+    """
+    Render the Markdown subset lessons use: headings, paragraphs, bullet and
+    numbered lists, fenced code, inline code, bold, italics and links
+    """
+    out = []
+    paragraph = []
+    list_tag = None
+    lines = textwrap.dedent(text).strip('\n').split('\n')
+
+    def flush_paragraph():
+        if paragraph:
+            out.append(f'<p>{_inline(" ".join(paragraph))}</p>')
+            paragraph.clear()
+
+    def close_list():
+        nonlocal list_tag
+        if list_tag:
+            out.append(f'</{list_tag}>')
+            list_tag = None
+
+    i = 0
+    while i < len(lines):
+        line = lines[i].rstrip()
+        stripped = line.strip()
+        if stripped.startswith('```'):
+            flush_paragraph()
+            close_list()
+            code = []
+            i += 1
+            while i < len(lines) and not lines[i].strip().startswith('```'):
+                code.append(lines[i])
+                i += 1
+            out.append(f'<pre><code>{html.escape(chr(10).join(code), quote=False)}</code></pre>')
+        elif not stripped:
+            flush_paragraph()
+            close_list()
+        elif re.match(r'#{1,4} ', stripped):
+            flush_paragraph()
+            close_list()
+            level = len(stripped.split(' ', 1)[0])
+            out.append(f'<h{level}>{_inline(stripped[level + 1:].strip())}</h{level}>')
+        elif re.match(r'([-*+]|\d+\.) ', stripped):
+            flush_paragraph()
+            tag = 'ol' if stripped[0].isdigit() else 'ul'
+            if list_tag != tag:
+                close_list()
+                out.append(f'<{tag}>')
+                list_tag = tag
+            out.append(f'<li>{_inline(stripped.split(" ", 1)[1].strip())}</li>')
+        else:
+            close_list()
+            paragraph.append(stripped)
+        i += 1
+    flush_paragraph()
+    close_list()
+    return '\n'.join(out)
+
+
+def render_body(text):
+    """
+    Sanitized HTML for a section body; bodies that are already HTML are only sanitized
+    """
+    text = text or ''
+    if text.lstrip().startswith('<'):
+        fragment = '\n'.join(line.strip() for line in text.strip().split('\n'))
+    else:
+        fragment = render_markdown(text)
+    return sanitize_html(fragment)
+
+
+# ============================================================================
+# CODE
+# ============================================================================
+
+TOKEN_KINDS = {
+    'String': 'string', 'MultiString': 'string', 'FString': 'string',
+    'Int': 'number', 'Float': 'number',
+    'Bool': 'constant', 'Null': 'constant', 'Ellipsis': 'constant',
+    'BuiltinType': 'type', 'SpecialVarRef': 'keyword',
+    'Name': 'name', 'CommentToken': 'comment'
+}
+
+
+def _token_kind(token):
+    kind = TOKEN_KINDS.get(type(token).__name__)
+    if kind:
+        return kind
+    name = token.name
+    if name.startswith('KW_'):
+        return 'keyword'
+    if name.startswith('TYP_'):
+        return 'type'
+    if name.startswith('F_') or 'STRING' in name:
+        return 'string'
+    return 'punctuation'
+
+
+def tokenize_jac(code):
+    """
+    Highlight tokens for Jac source as [kind, text] pairs that concatenate
+    back to the original code; plain text when jaclang is unavailable
+    """
+    if not code:
+        return []
+    try:
+        from jaclang.compiler.program import JacProgram
+    except ImportError:
+        return [['text', code]]
+
+    module = JacProgram().parse_str(code, 'example.jac')
+    terminals = list(getattr(module, 'src_terminals', [])) + list(module.source.comments)
+    terminals.sort(key=lambda token: token.pos_start)
+
+    tokens = []
+    position = 0
+
+    def emit(kind, text):
+        if not text:
+            return
+        if tokens and tokens[-1][0] == kind:
+            tokens[-1][1] += text
+        else:
+            tokens.append([kind, text])
+
+    for token in terminals:
+        if token.pos_start < position:
+            continue
+        emit('text', code[position:token.pos_start])
+        emit(_token_kind(token), code[token.pos_start:token.pos_end])
+        position = token.pos_end
+    emit('text', code[position:])
+    return tokens
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+def content_hash(kind, text):
+    return hashlib.sha256(f'{RENDER_VERSION}\0{kind}\0{text or ""}'.encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """
+    content hash -> rendered output, loaded from and saved to an optional JSON file
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        self.used = set()
+        self.rendered = 0
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def _get(self, kind, text, render):
+        key = content_hash(kind, text)
+        self.used.add(key)
+        value = self.entries.get(key)
+        if value is None:
+            value = self.entries[key] = render(text)
+            self.rendered += 1
+        return value
+
+    def body_html(self, text):
+        return self._get('body', text, render_body)
+
+    def code_tokens(self, text):
+        return self._get('code', text, tokenize_jac)
+
+    def save(self):
+        """
+        Write entries used since loading; sections that no longer exist are dropped
+        """
+        if not self.path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({key: self.entries[key] for key in sorted(self.used)}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,112 @@
+"""
+Streaming NDJSON export of progress, quiz attempt and exercise events
+Lines are read from the event log in bounded chunks and passed through as
+stored, so memory stays flat however long the history is. Every line carries
+its seq; an interrupted export resumes by passing the last seq received as
+the cursor (--after here, cursor= on /api/export/events)
+
+    python event_export.py [--log data/events.log] [--type quiz_attempt]
+                           [--user USER] [--since 2026-01-01] [--until ...]
+                           [--after SEQ] [--output history.ndjson]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+from event_store import EventStore
+
+EXPORT_TYPES = ('lesson_progress', 'quiz_attempt', 'exercise_submission')
+# UserProgress and QuizAttempt history
+DEFAULT_TYPES = ('lesson_progress', 'quiz_attempt')
+CHUNK_EVENTS = 500
+# Sleep after every CHUNK_EVENTS lines read so a running export leaves CPU and
+# disk to API requests
+CHUNK_PAUSE = 0.002
+
+DEFAULT_LOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'events.log')
+
+
+def parse_time(value):
+    """
+    Epoch seconds or an ISO 8601 timestamp (UTC unless it has an offset) as epoch seconds
+    """
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f'Invalid time: {value}')
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def export_chunks(store, types=DEFAULT_TYPES, user_id=None, since=None, until=None, after_seq=0,
+                  chunk_events=CHUNK_EVENTS, pause=CHUNK_PAUSE):
+    """
+    Yield byte chunks of NDJSON lines for committed events matching the filters
+    since is inclusive and until exclusive, both epoch seconds
+    """
+    types = set(types)
+    # Records are compact JSON, so a user filter can skip most lines unparsed
+    user_needle = None
+    if user_id is not None:
+        user_needle = b'"userId":' + json.dumps(user_id).encode('utf-8')
+
+    chunk = []
+    scanned = 0
+    for line in store.committed_records(store.seek_offset(after_seq, since)):
+        scanned += 1
+        if pause and scanned % chunk_events == 0:
+            time.sleep(pause)
+        if user_needle is not None and user_needle not in line:
+            continue
+        event = json.loads(line)
+        if event['seq'] <= after_seq or event['type'] not in types:
+            continue
+        if user_id is not None and event.get('userId') != user_id:
+            continue
+        if (since is not None and event['ts'] < since) or (until is not None and event['ts'] >= until):
+            continue
+        chunk.append(line)
+        if len(chunk) >= chunk_events:
+            yield b''.join(chunk)
+            chunk = []
+    if chunk:
+        yield b''.join(chunk)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export event history as newline-delimited JSON')
+    parser.add_argument('--log', default=os.environ.get('ILP_EVENT_LOG', DEFAULT_LOG_PATH))
+    parser.add_argument('--type', action='append', choices=EXPORT_TYPES, dest='types',
+                        help='event type to include (repeatable; default: lesson_progress and quiz_attempt)')
+    parser.add_argument('--user', help='only events for this userId')
+    parser.add_argument('--since', type=parse_time, help='epoch seconds or ISO 8601, inclusive')
+    parser.add_argument('--until', type=parse_time, help='epoch seconds or ISO 8601, exclusive')
+    parser.add_argument('--after', type=int, default=0, help='resume after this seq')
+    parser.add_argument('--output', help='write here instead of stdout')
+    args = parser.parse_args(argv)
+
+    # Reading does not open the store for writing, so this is safe next to a running API
+    store = EventStore(args.log)
+    out = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    try:
+        for chunk in export_chunks(store, args.types or DEFAULT_TYPES, args.user, args.since,
+                                   args.until, args.after, pause=0):
+            out.write(chunk)
+    finally:
+        if args.output:
+            out.close()
+        else:
+            out.flush()
+
+
+if __name__ == '__main__':
+    main()
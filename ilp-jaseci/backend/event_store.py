@@ -0,0 +1,294 @@
+"""
+Append-only event log for progress, quiz and exercise events
+Requests enqueue events into a bounded in-memory buffer; a single writer
+thread group-commits whatever has accumulated with one write + fsync, so
+ingestion never pays an fsync per request. Callers that acknowledge an event
+wait_durable() on its sequence number, which returns once its batch is on disk.
+Events reach the open() callback only once committed, in sequence order, so
+in-memory state built from it always matches what a replay would rebuild
+
+Sparse byte-offset checkpoints let readers such as the history export seek
+close to a sequence number or timestamp instead of scanning the whole log
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+# Bytes of log between checkpoints; bounds how far a seek can land before its target
+CHECKPOINT_BYTES = 256 * 1024
+# Write attempts per batch before its events are failed, and the backoff step between them
+COMMIT_ATTEMPTS = 3
+COMMIT_RETRY_DELAY = 0.05
+# Failed batches remembered for wait_durable()
+MAX_FAILED_BATCHES = 1024
+
+
+class BufferFullError(RuntimeError):
+    """
+    Raised when the write buffer stays full for longer than the put timeout
+    """
+
+
+class CommitError(RuntimeError):
+    """
+    Raised by wait_durable() when an event's batch could not be written
+    """
+
+
+class EventStore:
+    """
+    JSON-lines event log with group commit and startup replay
+    """
+
+    def __init__(self, path, max_buffer=10000, batch_size=1000, put_timeout=0.5, fsync=True):
+        self.path = path
+        self.batch_size = batch_size
+        self.put_timeout = put_timeout
+        self.fsync = fsync
+        self._queue = queue.Queue(maxsize=max_buffer)
+        self._seq_lock = threading.Lock()
+        self._next_seq = 1
+        self._durable_seq = 0
+        self._durable = threading.Condition()
+        self._durable_offset = 0
+        # (first seq, last seq) of batches that could not be written, newest last
+        self._failed = deque(maxlen=MAX_FAILED_BATCHES)
+        # Set after a failed write, which may have left part of a batch on disk
+        self._torn = False
+        # (first seq at offset, latest ts before offset, offset), in log order
+        self._checkpoints = [(1, 0.0, 0)]
+        self._max_ts = 0.0
+        self._file = None
+        self._writer = None
+        self._on_event = None
+
+    def open(self, on_event=None):
+        """
+        Replay the existing log through on_event, then start the writer, which
+        passes each newly committed event to on_event before waking its waiters
+        Events whose batch fails to commit never reach on_event
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        last_seq = 0
+        for event, offset in self._replay_records():
+            self._track(event, offset)
+            last_seq = max(last_seq, event['seq'])
+            if on_event is not None:
+                on_event(event)
+        self._next_seq = last_seq + 1
+        self._durable_seq = last_seq
+        self._on_event = on_event
+        self._file = open(self.path, 'ab', buffering=0)
+        self._durable_offset = self._file.tell()
+        self._writer = threading.Thread(target=self._run, name='event-store-writer', daemon=True)
+        self._writer.start()
+
+    def replay(self, since_seq=0):
+        """
+        Yield stored events in order, skipping unreadable records
+        """
+        for event, _ in self._replay_records():
+            if event['seq'] > since_seq:
+                yield event
+
+    def _replay_records(self):
+        """
+        Yield (event, byte offset of its record) from the start of the log
+        Before the writer starts, a torn final record (no trailing newline) is
+        truncated away and unparseable records elsewhere are copied to
+        <path>.corrupt; either way they are skipped, never the records after them
+        """
+        if not os.path.exists(self.path):
+            return
+        offset = 0
+        torn = False
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    torn = True
+                    break
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    event = None
+                if isinstance(event, dict) and isinstance(event.get('seq'), int) and 'ts' in event:
+                    yield event, offset
+                elif self._file is None:
+                    self._quarantine(line, offset)
+                offset += len(line)
+        if torn and self._file is None:
+            logger.warning('Truncating torn record at offset %d of %s', offset, self.path)
+            with open(self.path, 'r+b') as f:
+                f.truncate(offset)
+
+    def _quarantine(self, line, offset):
+        logger.warning('Skipping unreadable record at offset %d of %s', offset, self.path)
+        record = {'offset': offset, 'record': line.decode('utf-8', 'replace')}
+        with open(self.path + '.corrupt', 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+
+    def _track(self, event, offset):
+        """
+        Add a checkpoint at the record starting at offset if the last one is far enough back
+        """
+        if offset - self._checkpoints[-1][2] >= CHECKPOINT_BYTES:
+            self._checkpoints.append((event['seq'], self._max_ts, offset))
+        self._max_ts = max(self._max_ts, event['ts'])
+
+    def seek_offset(self, after_seq=0, since_ts=None):
+        """
+        Byte offset from which every event with seq > after_seq and ts >= since_ts
+        is still ahead; without an open log this is the start of the file
+        """
+        checkpoints = self._checkpoints
+        count = len(checkpoints)
+        # Events before a checkpoint all have seq below its seq and ts at most its ts
+        by_seq = bisect_right(checkpoints, after_seq + 1, hi=count, key=lambda cp: cp[0]) - 1
+        by_ts = 0
+        if since_ts is not None:
+            by_ts = bisect_left(checkpoints, since_ts, hi=count, key=lambda cp: cp[1]) - 1
+        return checkpoints[max(by_seq, by_ts, 0)][2]
+
+    def committed_records(self, offset=0):
+        """
+        Yield raw JSON lines from offset up to the last commit at the time of the
+        call; reads a separate file handle and never blocks the writer
+        """
+        if not os.path.exists(self.path):
+            return
+        with self._durable:
+            end = self._durable_offset if self._file is not None else None
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if end is not None and offset >= end:
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                offset += len(line)
+                yield line
+
+    def append(self, event_type, **fields):
+        """
+        Stamp and buffer an event; returns it once queued, before it is
+        durable (see wait_durable)
+        """
+        with self._seq_lock:
+            event = {'seq': self._next_seq, 'ts': time.time(), 'type': event_type, **fields}
+            self._next_seq += 1
+            try:
+                self._queue.put(event, timeout=self.put_timeout)
+            except queue.Full:
+                self._next_seq -= 1
+                raise BufferFullError('Event buffer is full')
+        return event
+
+    def wait_durable(self, seq, timeout=None):
+        """
+        Block until the event with this sequence number has been committed
+        Returns False on timeout; raises CommitError if its batch could not be written
+        """
+        with self._durable:
+            if not self._durable.wait_for(lambda: self._durable_seq >= seq, timeout):
+                return False
+            if any(first <= seq <= last for first, last in self._failed):
+                raise CommitError(f'Event {seq} could not be written to {self.path}')
+        return True
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def close(self):
+        if self._writer is None:
+            return
+        self._queue.put(_STOP)
+        self._writer.join()
+        self._writer = None
+        self._file.close()
+        self._file = None
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            # Everything that arrived while the previous commit was in
+            # flight goes into this one
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if any(event is _STOP for event in batch):
+                stopping = True
+                batch = [event for event in batch if event is not _STOP]
+            if batch:
+                self._commit(batch)
+
+    def _reset_file(self):
+        """
+        Reopen the log cut back to the last commit, dropping any partial write
+        """
+        try:
+            self._file.close()
+        except OSError:
+            pass
+        with open(self.path, 'r+b') as f:
+            f.truncate(self._durable_offset)
+        self._file = open(self.path, 'ab', buffering=0)
+
+    def _write(self, data):
+        if self._torn:
+            self._reset_file()
+            self._torn = False
+        view = memoryview(data)
+        while view:
+            view = view[self._file.write(view):]
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def _commit(self, batch):
+        records = [json.dumps(event, separators=(',', ':')).encode('utf-8') + b'\n' for event in batch]
+        data = b''.join(records)
+        for attempt in range(1, COMMIT_ATTEMPTS + 1):
+            try:
+                self._write(data)
+                break
+            except OSError:
+                self._torn = True
+                logger.exception('Failed to commit %d events to %s (attempt %d of %d)',
+                                 len(batch), self.path, attempt, COMMIT_ATTEMPTS)
+                if attempt < COMMIT_ATTEMPTS:
+                    time.sleep(COMMIT_RETRY_DELAY * attempt)
+        else:
+            # Give up on this batch: its waiters get CommitError and the log
+            # is cut back to the last commit before the next batch is written
+            with self._durable:
+                self._failed.append((batch[0]['seq'], batch[-1]['seq']))
+                self._durable_seq = batch[-1]['seq']
+                self._durable.notify_all()
+            return
+        offset = self._durable_offset
+        for event, record in zip(batch, records):
+            self._track(event, offset)
+            offset += len(record)
+        if self._on_event is not None:
+            for event in batch:
+                try:
+                    self._on_event(event)
+                except Exception:
+                    logger.exception('Failed to apply committed event %d', event['seq'])
+        with self._durable:
+            self._durable_seq = batch[-1]['seq']
+            self._durable_offset = offset
+            self._durable.notify_all()
@@ -0,0 +1,570 @@
+"""
+Pre-warmed worker pool for validating code exercise submissions
+Each worker process imports jaclang and warms a JacProgram once at startup;
+every submission then runs under CPU, memory and wall-clock limits in a
+fork of a warm worker, so a crashing or looping submission costs one child
+process rather than a worker or the API. That fork is only a harness: it
+forks again to run the submission and reports the verdict itself, so the
+submission never holds the pipe the verdict travels on. Before running
+anything the submission's process closes every inherited descriptor but its
+own pipe to the harness, enters fresh network and mount namespaces, chroots
+into an empty directory and drops to an unprivileged uid. The harness passes
+on only reports with one well-formed entry per test; anything else counts as
+a crash. Linux only (fork, namespaces, resource limits)
+
+Workers speak line-delimited JSON over stdin/stdout; every reply echoes the
+job's nonce, and a worker that answers with anything else is replaced:
+    {"id": nonce, "source": ..., "tests": [...], "limits": {...}}  ->  {"id": nonce, "result": {...}}
+"""
+
+import json
+import os
+import queue
+import secrets
+import select
+import subprocess
+import sys
+import threading
+import time
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+CPU_SECONDS = 2
+MEMORY_MB = 256
+WALL_SECONDS = 5
+# How long a request waits for a free worker before giving up
+ACQUIRE_TIMEOUT = 10
+# Extra time allowed for the harness to report a killed submission, and for
+# the worker itself to report back, after the wall limit
+HARNESS_GRACE = 1
+REPLY_GRACE = 2
+MAX_OUTPUT_CHARS = 4000
+# Identity submissions run under when the worker is root (nobody)
+SANDBOX_UID = 65534
+SANDBOX_GID = 65534
+# Variables passed on to workers; everything else (secrets included) stays in the API
+WORKER_ENV = ('PATH', 'PYTHONPATH', 'PYTHONHOME', 'PYENV_VERSION', 'LANG', 'LC_ALL', 'TMPDIR')
+
+# Statuses a submission's own process may report; timeouts, CPU limits and
+# crashes are only ever decided by the harness
+REPORTED_STATUSES = ('ok', 'compile_error', 'runtime_error', 'memory_limit', 'crashed')
+HARNESS_STATUSES = REPORTED_STATUSES + ('timeout', 'cpu_limit')
+# prctl(PR_SET_DUMPABLE): a non-dumpable harness cannot be ptraced by its submission
+PR_SET_DUMPABLE = 4
+
+SUBMISSION_PATH = 'exercise.jac'
+WARMUP_SOURCE = 'node Warmup { has ready: bool = True; }\nwith entry { w = Warmup(); }\n'
+WARMUP_TEST = 'assert w.ready;'
+
+
+class PoolUnavailableError(RuntimeError):
+    """
+    Raised when the pool is closed or its workers cannot start
+    """
+
+
+class PoolBusyError(RuntimeError):
+    """
+    Raised when no worker frees up within ACQUIRE_TIMEOUT
+    """
+
+
+def test_name(test_case, index):
+    """
+    A test's display name is its leading '# comment' line, if any
+    """
+    first_line = test_case.strip().splitlines()[0] if test_case.strip() else ''
+    if first_line.startswith('#'):
+        return f'Test {index}: {first_line.lstrip("#").strip()}'
+    return f'Test {index}'
+
+
+def failed_result(tests, status, message):
+    return {
+        'status': status,
+        'compileErrors': [],
+        'tests': [
+            {'name': test_name(test, i), 'passed': False, 'message': message}
+            for i, test in enumerate(tests, 1)
+        ],
+        'output': ''
+    }
+
+
+def checked_result(result, tests, statuses=HARNESS_STATUSES):
+    """
+    A copy of result if it is a well-formed report for tests, else None
+    Well-formed: one of statuses and exactly one entry per test, in order, with
+    the test's name, a boolean passed and a message
+    """
+    if not isinstance(result, dict) or result.get('status') not in statuses:
+        return None
+    entries = result.get('tests')
+    compile_errors = result.get('compileErrors')
+    output = result.get('output')
+    if not isinstance(entries, list) or len(entries) != len(tests):
+        return None
+    if not isinstance(compile_errors, list) or not isinstance(output, str):
+        return None
+    checked = []
+    for i, (entry, test) in enumerate(zip(entries, tests), 1):
+        if (not isinstance(entry, dict) or entry.get('name') != test_name(test, i)
+                or not isinstance(entry.get('passed'), bool) or not isinstance(entry.get('message'), str)):
+            return None
+        checked.append({'name': entry['name'], 'passed': entry['passed'], 'message': entry['message']})
+    for error in compile_errors:
+        if (not isinstance(error, dict) or not isinstance(error.get('line'), int)
+                or not isinstance(error.get('message'), str)):
+            return None
+    return {
+        'status': result['status'],
+        'compileErrors': [{'line': error['line'], 'message': error['message']} for error in compile_errors],
+        'tests': checked,
+        'output': output[-MAX_OUTPUT_CHARS:]
+    }
+
+
+# ============================================================================
+# WORKER PROCESS
+# ============================================================================
+
+def _compile(source, file_path):
+    """
+    Compile Jac source to a code object; returns (code, [error dicts])
+    """
+    import marshal
+    from jaclang.compiler.program import JacProgram
+
+    program = JacProgram()
+    module = program.compile(file_path, use_str=source)
+    errors = [
+        {'line': error.loc.first_line, 'message': error.msg}
+        for error in program.errors_had
+    ]
+    if errors or not module.gen.py_bytecode:
+        return None, errors or [{'line': 0, 'message': 'Compilation produced no code'}]
+    return marshal.loads(module.gen.py_bytecode), []
+
+
+def _run_job(source, tests):
+    """
+    Compile the submission, execute it, then run each test case in its namespace
+    Runs inside the forked child
+    """
+    import io
+    import types
+    from contextlib import redirect_stderr, redirect_stdout
+
+    code, errors = _compile(source, SUBMISSION_PATH)
+    if code is None:
+        result = failed_result(tests, 'compile_error', 'Submission did not compile')
+        result['compileErrors'] = errors
+        return result
+
+    module = types.ModuleType('exercise')
+    module.__file__ = SUBMISSION_PATH
+    sys.modules['exercise'] = module
+    output = io.StringIO()
+    with redirect_stdout(output), redirect_stderr(output):
+        try:
+            exec(code, module.__dict__)
+        except MemoryError:
+            return failed_result(tests, 'memory_limit', 'Memory limit exceeded')
+        except BaseException as exc:
+            result = failed_result(tests, 'runtime_error', f'{type(exc).__name__}: {exc}')
+            result['output'] = output.getvalue()[-MAX_OUTPUT_CHARS:]
+            return result
+
+        results = []
+        for i, test in enumerate(tests, 1):
+            # Each test case is a block of Jac statements, usually ending in assert
+            test_code, test_errors = _compile('with entry {\n' + test + '\n}\n', f'test_{i}.jac')
+            if test_code is None:
+                message = f'Test does not compile: {test_errors[0]["message"]}'
+                results.append({'name': test_name(test, i), 'passed': False, 'message': message})
+                continue
+            try:
+                exec(test_code, module.__dict__)
+            except AssertionError as exc:
+                message = str(exc) or 'Assertion failed'
+                results.append({'name': test_name(test, i), 'passed': False, 'message': message})
+            except MemoryError:
+                results.append({'name': test_name(test, i), 'passed': False, 'message': 'Memory limit exceeded'})
+            except Exception as exc:
+                message = f'{type(exc).__name__}: {exc}'
+                results.append({'name': test_name(test, i), 'passed': False, 'message': message})
+            else:
+                results.append({'name': test_name(test, i), 'passed': True, 'message': ''})
+
+    return {
+        'status': 'ok',
+        'compileErrors': [],
+        'tests': results,
+        'output': output.getvalue()[-MAX_OUTPUT_CHARS:]
+    }
+
+
+def _limit_child(limits):
+    import resource
+
+    cpu = limits['cpuSeconds']
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+    # The child starts with the warm worker's address space; budget on top of it
+    with open('/proc/self/statm') as f:
+        current = int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    memory = current + limits['memoryMb'] * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+    # No file writes and no further processes
+    resource.setrlimit(resource.RLIMIT_FSIZE, (0, 0))
+    resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+
+
+def _isolate_child(jail):
+    """
+    Cut the child off from the network and the filesystem and drop its privileges
+    """
+    if os.geteuid() == 0:
+        os.unshare(os.CLONE_NEWNET | os.CLONE_NEWNS)
+        os.chroot(jail)
+        os.chdir('/')
+        os.setgroups([])
+        os.setgid(SANDBOX_GID)
+        os.setuid(SANDBOX_UID)
+        return
+    # Unprivileged: a user namespace grants the capabilities to chroot; a second,
+    # nested one then takes them away again, since the mount and network
+    # namespaces stay owned by the first
+    os.unshare(os.CLONE_NEWUSER | os.CLONE_NEWNET | os.CLONE_NEWNS)
+    os.chroot(jail)
+    os.chdir('/')
+    os.unshare(os.CLONE_NEWUSER)
+
+
+def _close_inherited(keep_fd):
+    """
+    Close every descriptor above stderr except keep_fd, the worker's channel included
+    """
+    max_fd = os.sysconf('SC_OPEN_MAX')
+    os.closerange(3, keep_fd)
+    os.closerange(keep_fd + 1, max_fd)
+
+
+def _probe_isolation(jail):
+    """
+    Fork a child that isolates itself; returns None if that works, else the error
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            _isolate_child(jail)
+            message = b''
+        except BaseException as exc:
+            message = f'{type(exc).__name__}: {exc}'.encode('utf-8')
+        try:
+            os.write(write_fd, message)
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd, 'rb') as pipe:
+        message = pipe.read()
+    os.waitpid(pid, 0)
+    return message.decode('utf-8') or None
+
+
+def _run_submission(job, jail, write_fd):
+    """
+    Body of the submission's process: limit, isolate, run the job, report to
+    the harness on write_fd; never returns
+    """
+    tests = job['tests']
+    try:
+        # Also closes the harness's own result pipe, inherited across the fork
+        _close_inherited(write_fd)
+        # Limits first: they read /proc, which the jail hides
+        _limit_child(job['limits'])
+        if jail is not None:
+            _isolate_child(jail)
+        result = _run_job(job['source'], tests)
+        payload = json.dumps(result).encode('utf-8')
+    except MemoryError:
+        payload = json.dumps(failed_result(tests, 'memory_limit', 'Memory limit exceeded')).encode('utf-8')
+    except BaseException as exc:
+        payload = json.dumps(failed_result(tests, 'crashed', f'{type(exc).__name__}: {exc}')).encode('utf-8')
+    try:
+        with os.fdopen(write_fd, 'wb') as out:
+            out.write(payload)
+    finally:
+        os._exit(0)
+
+
+def _harness(job, jail):
+    """
+    Run the submission in a child of its own and return its checked result
+    Runs in the forked harness, which keeps the verdict pipe to the worker
+    """
+    import ctypes
+
+    # Not traceable, so a submission sharing our uid cannot write through us
+    ctypes.CDLL(None, use_errno=True).prctl(PR_SET_DUMPABLE, 0, 0, 0, 0)
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        _run_submission(job, jail, write_fd)
+    os.close(write_fd)
+    return _collect(pid, read_fd, job['tests'], job['limits'], job['limits']['wallSeconds'], REPORTED_STATUSES)
+
+
+def _execute(job, jail=None):
+    """
+    Run one job in a forked harness and collect its verdict under the wall-clock limit
+    The submission is isolated in jail, an empty directory, unless jail is None
+    """
+    tests = job['tests']
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            devnull = os.open(os.devnull, os.O_RDWR)
+            os.dup2(devnull, 0)
+            os.dup2(devnull, 1)
+            os.dup2(devnull, 2)
+            _close_inherited(write_fd)
+            payload = json.dumps(_harness(job, jail)).encode('utf-8')
+        except BaseException as exc:
+            payload = json.dumps(failed_result(tests, 'crashed', f'{type(exc).__name__}: {exc}')).encode('utf-8')
+        try:
+            with os.fdopen(write_fd, 'wb') as out:
+                out.write(payload)
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    return _collect(pid, read_fd, tests, job['limits'], job['limits']['wallSeconds'] + HARNESS_GRACE)
+
+
+def _collect(pid, read_fd, tests, limits, wall_seconds, statuses=HARNESS_STATUSES):
+    """
+    Read child pid's report from read_fd, killing it after wall_seconds
+    Returns the report checked against tests and statuses, or a failed result
+    saying why there is none
+    """
+    import signal
+
+    chunks = []
+    deadline = time.monotonic() + wall_seconds
+    timed_out = False
+    with os.fdopen(read_fd, 'rb') as pipe:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+            ready, _, _ = select.select([pipe], [], [], remaining)
+            if not ready:
+                continue
+            chunk = os.read(pipe.fileno(), 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    if timed_out:
+        os.kill(pid, signal.SIGKILL)
+    _, status = os.waitpid(pid, 0)
+
+    if timed_out:
+        return failed_result(tests, 'timeout', f'Time limit of {limits["wallSeconds"]}s exceeded')
+    if os.WIFSIGNALED(status) and os.WTERMSIG(status) in (signal.SIGXCPU, signal.SIGKILL):
+        return failed_result(tests, 'cpu_limit', f'CPU limit of {limits["cpuSeconds"]}s exceeded')
+    try:
+        result = checked_result(json.loads(b''.join(chunks)), tests, statuses)
+    except ValueError:
+        result = None
+    if result is None:
+        return failed_result(tests, 'crashed', 'Submission crashed the test runner')
+    return result
+
+
+def worker_main(isolate=True):
+    """
+    Entry point of a worker process: warm up, then serve jobs until stdin closes
+    """
+    import tempfile
+
+    # Keep the protocol channel private; anything else written to stdout goes to stderr
+    channel = os.fdopen(os.dup(1), 'w', buffering=1)
+    os.dup2(2, 1)
+
+    jail = None
+    try:
+        # Run a job in-process so everything a child imports lazily is already
+        # loaded (resource for _limit_child, ctypes for _harness); the chrooted
+        # child cannot import anything new
+        import ctypes
+        import resource
+        warmup = _run_job(WARMUP_SOURCE, [WARMUP_TEST])
+        if warmup['status'] != 'ok':
+            raise RuntimeError(f'warmup job failed: {warmup}')
+        if isolate:
+            jail = tempfile.mkdtemp(prefix='ilp-exercise-jail-')
+            # Empty, but readable once the child is nobody (compiling lists the cwd)
+            os.chmod(jail, 0o755)
+            error = _probe_isolation(jail)
+            if error:
+                raise RuntimeError(f'cannot isolate submissions ({error})')
+    except Exception as exc:
+        channel.write(json.dumps({'ready': False, 'error': f'{type(exc).__name__}: {exc}'}) + '\n')
+        return
+    channel.write(json.dumps({'ready': True}) + '\n')
+
+    try:
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            job = json.loads(line)
+            try:
+                result = _execute(job, jail)
+            except Exception as exc:
+                result = failed_result(job['tests'], 'crashed', f'{type(exc).__name__}: {exc}')
+            channel.write(json.dumps({'id': job['id'], 'result': result}) + '\n')
+    finally:
+        if jail is not None:
+            os.rmdir(jail)
+
+
+# ============================================================================
+# POOL (API PROCESS)
+# ============================================================================
+
+class _Worker:
+    def __init__(self, isolate=True):
+        args = [sys.executable, os.path.abspath(__file__)]
+        if not isolate:
+            args.append('--no-isolation')
+        self.process = subprocess.Popen(
+            args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env={name: os.environ[name] for name in WORKER_ENV if name in os.environ},
+            text=True,
+            bufsize=1
+        )
+
+    def read_line(self, timeout):
+        ready, _, _ = select.select([self.process.stdout], [], [], timeout)
+        if not ready:
+            return None
+        return self.process.stdout.readline() or None
+
+    def kill(self):
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+class ExercisePool:
+    """
+    Fixed-size pool of warm workers; run() blocks until a worker is free
+    isolate=False skips the namespace/chroot/uid sandbox, for hosts that cannot
+    provide it; resource limits still apply
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, cpu_seconds=CPU_SECONDS, memory_mb=MEMORY_MB,
+                 wall_seconds=WALL_SECONDS, acquire_timeout=ACQUIRE_TIMEOUT, isolate=True):
+        self.size = workers
+        self.isolate = isolate
+        self.limits = {'cpuSeconds': cpu_seconds, 'memoryMb': memory_mb, 'wallSeconds': wall_seconds}
+        self.acquire_timeout = acquire_timeout
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._workers = set()
+        self._closed = False
+        self.startup_error = None
+
+    def start(self):
+        """
+        Launch all workers; each joins the idle queue once warm
+        """
+        for _ in range(self.size):
+            self._spawn()
+
+    def _spawn(self):
+        with self._lock:
+            if self._closed:
+                return
+            worker = _Worker(self.isolate)
+            self._workers.add(worker)
+        threading.Thread(target=self._await_ready, args=(worker,), daemon=True).start()
+
+    def _await_ready(self, worker):
+        line = worker.read_line(timeout=60)
+        status = json.loads(line) if line else {'ready': False, 'error': 'worker did not start'}
+        if status.get('ready'):
+            self._idle.put(worker)
+            return
+        self.startup_error = status.get('error')
+        self._discard(worker)
+
+    def _discard(self, worker):
+        with self._lock:
+            self._workers.discard(worker)
+        worker.kill()
+
+    def idle(self):
+        return self._idle.qsize()
+
+    def run(self, source, tests):
+        """
+        Compile source and run it against tests; returns the result dict, always
+        one checked by checked_result(), so it is safe to cache
+        """
+        if self._closed:
+            raise PoolUnavailableError('Exercise runner is shut down')
+        if not self._workers:
+            raise PoolUnavailableError(self.startup_error or 'No exercise workers are running')
+        try:
+            worker = self._idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            if not self._workers:
+                raise PoolUnavailableError(self.startup_error or 'No exercise workers are running')
+            raise PoolBusyError('All exercise workers are busy')
+
+        nonce = secrets.token_hex(16)
+        job = {'id': nonce, 'source': source, 'tests': list(tests), 'limits': self.limits}
+        reply = None
+        try:
+            worker.process.stdin.write(json.dumps(job) + '\n')
+            worker.process.stdin.flush()
+            line = worker.read_line(timeout=self.limits['wallSeconds'] + REPLY_GRACE)
+            reply = json.loads(line) if line is not None else None
+        except (OSError, ValueError):
+            pass
+        result = checked_result(reply.get('result'), tests) if isinstance(reply, dict) else None
+        if result is None or reply.get('id') != nonce:
+            # The worker is wedged, gone, late or out of step with its jobs; replace it
+            self._discard(worker)
+            self._spawn()
+            return failed_result(tests, 'crashed', 'Exercise worker failed')
+        self._idle.put(worker)
+        return result
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            try:
+                worker.process.stdin.close()
+            except OSError:
+                pass
+            worker.kill()
+
+
+if __name__ == '__main__':
+    worker_main(isolate='--no-isolation' not in sys.argv[1:])
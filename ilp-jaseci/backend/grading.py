@@ -0,0 +1,121 @@
+"""
+Server-side grading for quiz attempts
+Each quiz is compiled once per content load into answer matchers that mirror
+the QuizAssessor walker's per-type evaluation rules
+"""
+
+from keyword_matcher import KeywordAutomaton
+
+PASSING_SCORE = 70
+# Free-text answers must mention at least this many of the question's keywords
+MIN_KEYWORD_MATCHES = 1
+
+TRUE_ANSWERS = frozenset(['true', 't', 'yes', 'y', '1'])
+FALSE_ANSWERS = frozenset(['false', 'f', 'no', 'n', '0'])
+
+
+def normalize_choice(text):
+    """
+    Case-fold and collapse whitespace so equivalent choices hash the same
+    """
+    return ' '.join(str(text).casefold().split())
+
+
+class CompiledQuestion:
+    """
+    Answer matcher plus prebuilt feedback for a single question
+    """
+
+    __slots__ = ('question_id', 'question_type', 'accepted', 'automaton',
+                 'correct_feedback', 'incorrect_feedback')
+
+    def __init__(self, question):
+        self.question_id = question['question_id']
+        self.question_type = question['question_type']
+        self.accepted = frozenset()
+        self.automaton = None
+
+        if self.question_type == 'multiple_choice':
+            answer = question.get('correct_answer')
+            answers = answer if isinstance(answer, (list, tuple)) else [answer]
+            self.accepted = frozenset(normalize_choice(a) for a in answers if a is not None)
+        elif self.question_type == 'true_false':
+            self.accepted = TRUE_ANSWERS if question.get('correct_answer') else FALSE_ANSWERS
+        elif self.question_type == 'free_text':
+            self.automaton = KeywordAutomaton(question.get('keywords', []))
+
+        explanation = question.get('explanation', '')
+        self.correct_feedback = {
+            'correct': True,
+            'message': 'Great job!',
+            'explanation': explanation
+        }
+        self.incorrect_feedback = {
+            'correct': False,
+            'message': 'Not quite right.',
+            'explanation': explanation
+        }
+        if self.question_type in ('multiple_choice', 'true_false'):
+            self.incorrect_feedback['correctAnswer'] = question.get('correct_answer')
+
+    def is_correct(self, user_answer):
+        if user_answer is None:
+            return False
+        if self.accepted:
+            return normalize_choice(user_answer) in self.accepted
+        if self.question_type == 'code':
+            # Call QuizAssessor.evaluate_code_answer() for richer grading
+            return len(str(user_answer).strip()) > 20
+        return False
+
+    def grade(self, user_answer):
+        """
+        Return (correct, feedback); choice feedback dicts are shared and must not be mutated
+        """
+        if self.automaton is not None:
+            # Call QuizAssessor.evaluate_free_text_answer() for richer grading
+            matched, coverage = self.automaton.match(user_answer or '')
+            correct = len(matched) >= MIN_KEYWORD_MATCHES
+            base = self.correct_feedback if correct else self.incorrect_feedback
+            return correct, {**base, 'matchedKeywords': matched, 'coverage': coverage}
+        if self.is_correct(user_answer):
+            return True, self.correct_feedback
+        return False, self.incorrect_feedback
+
+
+class QuizGrader:
+    """
+    All compiled questions of one quiz, in quiz order
+    """
+
+    def __init__(self, quiz):
+        self.quiz_id = quiz['quiz_id']
+        self.questions = tuple(CompiledQuestion(q) for q in quiz['questions'])
+        self.by_id = {q.question_id: q for q in self.questions}
+
+    def grade(self, answers):
+        """
+        Grade every question of the quiz in one pass
+        answers: question_id -> user answer; unanswered questions count as incorrect
+        """
+        feedback = {}
+        correct_count = 0
+        for question in self.questions:
+            correct, question_feedback = question.grade(answers.get(question.question_id))
+            correct_count += correct
+            feedback[question.question_id] = question_feedback
+
+        total_questions = len(self.questions)
+        score = (correct_count / total_questions * 100) if total_questions > 0 else 0
+
+        return {
+            'feedback': feedback,
+            'score': score,
+            'correctAnswers': correct_count,
+            'totalQuestions': total_questions,
+            'passed': score >= PASSING_SCORE
+        }
+
+
+def compile_graders(quizzes):
+    return {quiz['quiz_id']: QuizGrader(quiz) for quiz in quizzes}
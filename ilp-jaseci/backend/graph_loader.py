@@ -0,0 +1,339 @@
+"""
+Bulk loader for the OSP content graph
+Materializes lessons, sections, quizzes, questions, exercises and concepts
+from the catalog as Lesson, LessonContent, Quiz, Question, CodeExercise and
+OSPNode nodes in one pass. Anchors are allocated directly with ids cut from
+one random buffer, edges are attached to both endpoints with add_edge()
+rather than Jac.connect (which runs access checks and a save() per edge), and
+everything is registered with the context's memory in one update and
+persisted with a single commit
+
+    root --> Lesson -[prerequisite]-> required Lesson
+             Lesson --> LessonContent (one per section)
+             Lesson --> Quiz -[contains_question]-> Question
+             Lesson -[contains_exercise]-> CodeExercise
+    root --> OSPNode -[unlocks_lesson]-> Lesson (its resources)
+
+Time a synthetic catalog (jaclang needs Python 3.12):
+    python graph_loader.py [--lessons 10000] [--questions 10]
+"""
+
+import argparse
+import os
+import time
+from uuid import UUID
+
+from content_pack import DEFAULT_PACK_PATH, open_pack
+
+# Node and edge archetypes the loader creates, by name
+GRAPH_ARCHETYPES = (
+    'Lesson', 'LessonContent', 'CodeExercise', 'Quiz', 'Question', 'OSPNode',
+    'prerequisite', 'contains_exercise', 'contains_question', 'unlocks_lesson'
+)
+# Anchor ids drawn from each os.urandom() call
+ID_BLOCK_SIZE = 4096
+UUID_RANDOM_BITS = 0xFFFFFFFFFFFF0FFF3FFFFFFFFFFFFFFF
+UUID_V4_BITS = 0x00000000000040008000000000000000
+
+
+def read_catalog(pack_path=DEFAULT_PACK_PATH):
+    """
+    (lessons, quizzes, concepts, exercises) from the content pack (rebuilt
+    first if stale), or from sample_data when the pack has not been built
+    """
+    pack = open_pack(pack_path)
+    if pack is not None:
+        return pack.lessons, pack.quizzes, pack.concepts, pack.exercises
+    import sample_data
+    return (sample_data.SAMPLE_LESSONS, sample_data.SAMPLE_QUIZZES, sample_data.SAMPLE_CONCEPTS,
+            sample_data.SAMPLE_EXERCISES)
+
+
+class ContentGraph:
+    """
+    Nodes of one loaded catalog by content id, plus every anchor they own
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.lessons = {}
+        self.quizzes = {}
+        self.questions = {}
+        self.exercises = {}
+        self.concepts = {}
+        self.anchors = []
+
+    def counts(self):
+        from jaclang.runtimelib.archetype import NodeAnchor
+
+        nodes = sum(1 for anchor in self.anchors if isinstance(anchor, NodeAnchor))
+        return {'nodes': nodes, 'edges': len(self.anchors) - nodes}
+
+    def unload(self, mem):
+        """
+        Detach the catalog from its root and drop its anchors from mem and its shelf
+        """
+        owned = set(self.anchors)
+        root = self.root.__jac__
+        root.edges[:] = [edge for edge in root.edges if edge not in owned]
+        # Deleted directly rather than through mem.remove(), whose commit
+        # loads every removed anchor back from the shelf before dropping it
+        cached = mem.get_mem()
+        shelf = getattr(mem, '__shelf__', None)
+        for anchor in self.anchors:
+            cached.pop(anchor.id, None)
+            if shelf is not None and str(anchor.id) in shelf:
+                del shelf[str(anchor.id)]
+        if root.persistent:
+            mem.commit(root)
+        self.anchors = []
+
+
+class _Builder:
+    def __init__(self, root, persistent, block_size=ID_BLOCK_SIZE):
+        self.root = root.__jac__
+        self.persistent = persistent
+        self.root_id = self.root.id if persistent else None
+        self.anchors = []
+        self._ids = self._id_source(block_size)
+
+    @staticmethod
+    def _id_source(block_size):
+        # One urandom call per block of ids instead of one per uuid4()
+        while True:
+            block = os.urandom(16 * block_size)
+            for start in range(0, len(block), 16):
+                # Version 4, RFC 4122 variant, as uuid4() sets them
+                value = int.from_bytes(block[start:start + 16], 'big')
+                yield UUID(int=(value & UUID_RANDOM_BITS) | UUID_V4_BITS)
+
+    def node(self, archetype):
+        from jaclang.runtimelib.archetype import NodeAnchor
+
+        anchor = NodeAnchor(archetype=archetype, edges=[], id=next(self._ids),
+                            root=self.root_id, persistent=self.persistent)
+        archetype.__dict__['__jac__'] = anchor
+        self.anchors.append(anchor)
+        return anchor
+
+    def edge(self, archetype, source, target):
+        from jaclang.runtimelib.archetype import EdgeAnchor
+
+        anchor = EdgeAnchor(archetype=archetype, source=source, target=target, is_undirected=False,
+                            id=next(self._ids), root=self.root_id, persistent=self.persistent)
+        archetype.__jac__ = anchor
+        source.add_edge(anchor)
+        target.add_edge(anchor)
+        self.anchors.append(anchor)
+        return anchor
+
+
+def load_graph(archetypes, lessons, quizzes, concepts, exercises=(), root=None, persistent=True):
+    """
+    Build the catalog's graph under root (the active context's root by default)
+    archetypes maps names in GRAPH_ARCHETYPES to classes; returns a ContentGraph
+    References to lessons that are not in the catalog are skipped
+    """
+    from jaclang.runtimelib.archetype import GenericEdge
+    from jaclang.runtimelib.runtime import JacRuntime as Jac
+
+    Lesson = archetypes['Lesson']
+    LessonContent = archetypes['LessonContent']
+    CodeExercise = archetypes['CodeExercise']
+    Quiz = archetypes['Quiz']
+    Question = archetypes['Question']
+    OSPNode = archetypes['OSPNode']
+    prerequisite = archetypes['prerequisite']
+    contains_exercise = archetypes['contains_exercise']
+    contains_question = archetypes['contains_question']
+    unlocks_lesson = archetypes['unlocks_lesson']
+
+    ctx = Jac.get_context()
+    root = root if root is not None else ctx.get_root()
+    graph = ContentGraph(root)
+    build = _Builder(root, persistent)
+    node, edge = build.node, build.edge
+    root_anchor = build.root
+
+    for lesson in lessons:
+        lesson_id = lesson['lesson_id']
+        anchor = node(Lesson(
+            lesson_id=lesson_id,
+            title=lesson['title'],
+            description=lesson.get('description', ''),
+            category=lesson.get('category', ''),
+            difficulty=lesson.get('difficulty', 'beginner'),
+            duration_minutes=lesson.get('duration_minutes', 0),
+            prerequisites=list(lesson.get('prerequisites', ()))
+        ))
+        graph.lessons[lesson_id] = anchor
+        edge(GenericEdge(), root_anchor, anchor)
+        for sec in lesson.get('sections', ()):
+            edge(GenericEdge(), anchor, node(LessonContent(
+                lesson_id=lesson_id,
+                section_num=sec['section_num'],
+                section_title=sec['section_title'],
+                body=sec.get('body', ''),
+                code_example=sec.get('code_example', ''),
+                key_concepts=list(sec.get('key_concepts', ()))
+            )))
+
+    # Prerequisites can point forward in the catalog, so they are wired once every lesson exists
+    for lesson in lessons:
+        anchor = graph.lessons[lesson['lesson_id']]
+        for required_id in lesson.get('prerequisites', ()):
+            required = graph.lessons.get(required_id)
+            if required is not None:
+                edge(prerequisite(), anchor, required)
+
+    for quiz in quizzes:
+        quiz_id = quiz['quiz_id']
+        questions = quiz.get('questions', ())
+        difficulty = quiz.get('difficulty', 'beginner')
+        anchor = node(Quiz(
+            quiz_id=quiz_id,
+            lesson_id=quiz['lesson_id'],
+            title=quiz['title'],
+            description=quiz.get('description', ''),
+            difficulty=difficulty,
+            num_questions=len(questions)
+        ))
+        graph.quizzes[quiz_id] = anchor
+        lesson = graph.lessons.get(quiz['lesson_id'])
+        edge(GenericEdge(), lesson if lesson is not None else root_anchor, anchor)
+        for order, question in enumerate(questions, 1):
+            question_anchor = node(Question(
+                question_id=question['question_id'],
+                quiz_id=quiz_id,
+                question_text=question['question_text'],
+                question_type=question['question_type'],
+                difficulty=difficulty
+            ))
+            # Question ids are only unique within their quiz
+            graph.questions[(quiz_id, question['question_id'])] = question_anchor
+            edge(contains_question(question_order=order), anchor, question_anchor)
+
+    for exercise in exercises:
+        lesson = graph.lessons.get(exercise['lesson_id'])
+        if lesson is None:
+            continue
+        anchor = node(CodeExercise(
+            exercise_id=exercise['exercise_id'],
+            lesson_id=exercise['lesson_id'],
+            title=exercise['title'],
+            description=exercise.get('description', ''),
+            starter_code=exercise.get('starter_code', ''),
+            solution_code=exercise.get('solution_code', ''),
+            test_cases=list(exercise.get('test_cases', ())),
+            difficulty=exercise.get('difficulty', 'beginner')
+        ))
+        graph.exercises[exercise['exercise_id']] = anchor
+        edge(contains_exercise(), lesson, anchor)
+
+    for concept in concepts:
+        archetype = OSPNode(
+            concept_id=concept['concept_id'],
+            concept_name=concept['concept_name'],
+            category=concept.get('category', ''),
+            description=concept.get('description', ''),
+            resources=list(concept.get('resources', ()))
+        )
+        anchor = node(archetype)
+        graph.concepts[concept['concept_id']] = anchor
+        edge(GenericEdge(), root_anchor, anchor)
+        for lesson_id in archetype.resources:
+            lesson = graph.lessons.get(lesson_id)
+            if lesson is not None:
+                edge(unlocks_lesson(threshold=archetype.unlock_threshold), anchor, lesson)
+
+    graph.anchors = build.anchors
+    if persistent:
+        ctx.mem.get_mem().update((anchor.id, anchor) for anchor in build.anchors)
+        # Every anchor is new, so it is written as is instead of being diffed
+        # against the shelf; the one commit then only has the root's edges to sync
+        shelf = getattr(ctx.mem, '__shelf__', None)
+        if shelf is not None:
+            for anchor in build.anchors:
+                shelf[str(anchor.id)] = anchor
+        ctx.mem.set(root_anchor)
+        ctx.mem.commit(root_anchor)
+    return graph
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def synthetic_catalog(n_lessons, questions_per_quiz, sections=3):
+    lessons = [{
+        'lesson_id': f'lesson-{i}',
+        'title': f'Lesson {i}',
+        'description': 'Synthetic lesson',
+        'category': 'jac_basics',
+        'prerequisites': [f'lesson-{i - 1}'] if i else [],
+        'sections': [{
+            'section_num': n,
+            'section_title': f'Section {n}',
+            'body': '<p>Body</p>',
+            'code_example': 'node A {}',
+            'key_concepts': ['Nodes']
+        } for n in range(1, sections + 1)]
+    } for i in range(n_lessons)]
+    quizzes = [{
+        'quiz_id': f'quiz-{i}',
+        'lesson_id': f'lesson-{i}',
+        'title': f'Quiz {i}',
+        'questions': [{
+            'question_id': f'q{n}',
+            'question_text': 'Is this a question?',
+            'question_type': 'true_false',
+            'correct_answer': True
+        } for n in range(1, questions_per_quiz + 1)]
+    } for i in range(n_lessons)]
+    concepts = [{
+        'concept_id': f'concept-{i}',
+        'concept_name': f'Concept {i}',
+        'category': 'core',
+        'description': 'Synthetic concept',
+        'resources': [f'lesson-{i}']
+    } for i in range(0, n_lessons, 10)]
+    return lessons, quizzes, concepts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time a bulk load of a synthetic catalog into the OSP graph')
+    parser.add_argument('--lessons', type=int, default=10000)
+    parser.add_argument('--questions', type=int, default=10, help='questions per lesson quiz')
+    parser.add_argument('--session', help='shelf file to persist to (default: in memory)')
+    args = parser.parse_args(argv)
+
+    from jaclang.compiler.program import JacProgram
+    from jaclang.runtimelib.runtime import JacRuntime as Jac
+    from walker_bridge import BASE_PATH, JAC_MODULES
+
+    Jac.attach_program(JacProgram())
+    archetypes = {}
+    for name in JAC_MODULES:
+        if name.startswith('models.'):
+            (module,) = Jac.jac_import(name, BASE_PATH)
+            archetypes.update((attr, getattr(module, attr)) for attr in GRAPH_ARCHETYPES if hasattr(module, attr))
+    lessons, quizzes, concepts = synthetic_catalog(args.lessons, args.questions)
+
+    ctx = Jac.create_j_context(session=args.session)
+    Jac.set_context(ctx)
+    for label in ('load', 'reload'):
+        started = time.perf_counter()
+        if label == 'reload':
+            graph.unload(ctx.mem)
+        graph = load_graph(archetypes, lessons, quizzes, concepts)
+        elapsed = time.perf_counter() - started
+        counts = graph.counts()
+        print(f'{label}: {counts["nodes"]} nodes, {counts["edges"]} edges in {elapsed:.2f}s')
+    if args.session:
+        # Everything is already on the shelf; skip close()'s full re-sync
+        ctx.mem.get_mem().clear()
+    ctx.close()
+
+
+if __name__ == '__main__':
+    main()
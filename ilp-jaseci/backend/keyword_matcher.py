@@ -0,0 +1,103 @@
+"""
+Multi-pattern keyword matching for free-text answers
+Keywords are normalized and stemmed into token sequences and compiled into a
+token-level Aho-Corasick automaton, so one scan of an answer reports every
+keyword it contains regardless of how many keywords a question carries
+"""
+
+import re
+from collections import deque
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def stem(token):
+    """
+    Light suffix stripping so plural and inflected forms share a stem
+    """
+    if len(token) <= 3:
+        return token
+    if token.endswith('ies') and len(token) > 4:
+        return token[:-3] + 'y'
+    if token.endswith('sses'):
+        return token[:-2]
+    if token.endswith('ing') and len(token) > 5:
+        return token[:-3]
+    if token.endswith('ed') and len(token) > 4:
+        return token[:-2]
+    if token.endswith('es') and token[:-2].endswith(('s', 'x', 'z', 'ch', 'sh')):
+        return token[:-2]
+    if token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        return token[:-1]
+    return token
+
+
+def normalize(text):
+    """
+    Case-fold, split on anything that isn't a letter or digit, and stem
+    """
+    return [stem(token) for token in TOKEN_RE.findall(str(text).casefold())]
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over stemmed tokens
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(keywords)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        for index, keyword in enumerate(self.keywords):
+            tokens = normalize(keyword)
+            if not tokens:
+                continue
+            state = 0
+            for token in tokens:
+                next_state = self._goto[state].get(token)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[state][token] = next_state
+                state = next_state
+            self._out[state] += (index,)
+
+        # Breadth-first failure links; outputs inherit from their fail state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(token, 0)
+                self._out[next_state] += self._out[self._fail[next_state]]
+                queue.append(next_state)
+
+    def scan(self, text):
+        """
+        Return the set of keyword indices found in text
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        for token in normalize(text):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+    def match(self, text):
+        """
+        Return (matched keywords in declaration order, coverage in 0.0-1.0)
+        """
+        found = self.scan(text)
+        matched = [self.keywords[i] for i in sorted(found)]
+        coverage = len(found) / len(self.keywords) if self.keywords else 0.0
+        return matched, coverage
@@ -0,0 +1,141 @@
+"""
+Secondary indexes and cursor pagination for the lesson catalog
+Built once per content load so listing endpoints cost O(page size)
+"""
+
+import base64
+import json
+from bisect import bisect_left, bisect_right
+
+DIFFICULTY_RANK = {'beginner': 0, 'intermediate': 1, 'advanced': 2}
+
+# Sort keys are unique tuples ending in the lesson id, so they double as
+# keyset cursors: resuming a page is a bisect into the posting list
+SORT_KEYS = {
+    'position': lambda lesson, pos: (pos, lesson['lesson_id']),
+    'title': lambda lesson, pos: (lesson['title'].lower(), lesson['lesson_id']),
+    'difficulty': lambda lesson, pos: (
+        DIFFICULTY_RANK.get(lesson['difficulty'], len(DIFFICULTY_RANK)), pos, lesson['lesson_id']
+    ),
+    'duration': lambda lesson, pos: (lesson['duration_minutes'], pos, lesson['lesson_id']),
+}
+
+FILTER_FIELDS = ('category', 'difficulty', 'prerequisite')
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def encode_cursor(sort, descending, key):
+    raw = json.dumps({'s': sort, 'd': descending, 'k': list(key)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, sort, descending):
+    """
+    Decode a cursor issued for the same sort and direction, or raise ValueError
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        key = tuple(data['k'])
+    except (ValueError, TypeError, KeyError):
+        raise ValueError('Malformed cursor')
+    if data.get('s') != sort or data.get('d') != descending:
+        raise ValueError('Cursor does not match sort order')
+    return key
+
+
+class LessonIndex:
+    """
+    Sorted posting lists per (field, value) and sort key, plus prebuilt summaries
+    """
+
+    def __init__(self):
+        self.summaries = {}
+        self._postings = {}
+        self._members = {}
+
+    def build(self, lessons, summarize):
+        summaries = {}
+        members = {(None, None): []}
+        for lesson in lessons:
+            lesson_id = lesson['lesson_id']
+            summaries[lesson_id] = summarize(lesson)
+            values = [
+                ('category', lesson['category']),
+                ('difficulty', lesson['difficulty']),
+            ]
+            values.extend(('prerequisite', prereq) for prereq in lesson.get('prerequisites', []))
+            members[(None, None)].append((lesson_id, lesson))
+            for field_value in values:
+                members.setdefault(field_value, []).append((lesson_id, lesson))
+
+        positions = {lesson['lesson_id']: pos for pos, lesson in enumerate(lessons)}
+        postings = {}
+        for field_value, entries in members.items():
+            postings[field_value] = {
+                sort: sorted(make_key(lesson, positions[lesson_id]) for lesson_id, lesson in entries)
+                for sort, make_key in SORT_KEYS.items()
+            }
+
+        self.summaries = summaries
+        self._postings = postings
+        self._members = {
+            field_value: frozenset(lesson_id for lesson_id, _ in entries)
+            for field_value, entries in members.items()
+        }
+
+    def count(self, filters=None):
+        """
+        Number of lessons matching filters across all pages
+        """
+        active = [(field, value) for field, value in (filters or {}).items() if value is not None]
+        if not active:
+            return len(self.summaries)
+        if any(field_value not in self._members for field_value in active):
+            return 0
+        members = sorted((self._members[field_value] for field_value in active), key=len)
+        return len(members[0].intersection(*members[1:]))
+
+    def page(self, sort='position', descending=False, limit=DEFAULT_LIMIT, cursor=None, filters=None):
+        """
+        Return (summaries, next_cursor) for one page of matching lessons
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f'Unknown sort key: {sort}')
+
+        active = [(field, value) for field, value in (filters or {}).items() if value is not None]
+        if not active:
+            active = [(None, None)]
+        if any(field_value not in self._postings for field_value in active):
+            return [], None
+
+        # Drive the scan from the most selective posting list
+        driver = min(active, key=lambda field_value: len(self._members[field_value]))
+        others = [self._members[field_value] for field_value in active if field_value != driver]
+        keys = self._postings[driver][sort]
+
+        if cursor is not None:
+            after = decode_cursor(cursor, sort, descending)
+            try:
+                i = bisect_left(keys, after) - 1 if descending else bisect_right(keys, after)
+            except TypeError:
+                raise ValueError('Malformed cursor')
+        else:
+            i = len(keys) - 1 if descending else 0
+        step = -1 if descending else 1
+
+        results = []
+        last_key = None
+        while 0 <= i < len(keys):
+            key = keys[i]
+            i += step
+            lesson_id = key[-1]
+            if others and not all(lesson_id in member_ids for member_ids in others):
+                continue
+            if len(results) == limit:
+                return results, encode_cursor(sort, descending, last_key)
+            results.append(self.summaries[lesson_id])
+            last_key = key
+        return results, None
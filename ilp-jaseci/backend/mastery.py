@@ -0,0 +1,246 @@
+"""
+Incrementally maintained per-user progress aggregates
+Every progress, quiz and exercise event updates its user's aggregate in
+amortized O(1), so dashboards read precomputed numbers instead of scanning
+event history
+"""
+
+import math
+import threading
+from collections import deque
+
+SECONDS_PER_DAY = 86400
+# Rolling windows that MasteryAggregator.window_days can be answered from
+WINDOW_DAYS = (7, 30, 90)
+RECENT_LESSONS = 5
+
+
+def day_of(ts):
+    """
+    UTC day number of a unix timestamp
+    """
+    return int(ts // SECONDS_PER_DAY)
+
+
+class RollingBuckets:
+    """
+    Per-day totals in a ring buffer with a running sum for each window
+    """
+
+    __slots__ = ('windows', 'size', 'buckets', 'sums', 'day')
+
+    def __init__(self, windows=WINDOW_DAYS):
+        self.windows = tuple(sorted(windows))
+        self.size = self.windows[-1]
+        self.buckets = [0.0] * self.size
+        self.sums = dict.fromkeys(self.windows, 0.0)
+        self.day = None
+
+    def advance(self, day):
+        """
+        Move the window end to day, expiring buckets that fall out of each window
+        """
+        if self.day is None or day - self.day >= self.size:
+            self.buckets = [0.0] * self.size
+            self.sums = dict.fromkeys(self.windows, 0.0)
+            self.day = day
+            return
+        for d in range(self.day + 1, day + 1):
+            for window in self.windows:
+                self.sums[window] -= self.buckets[(d - window) % self.size]
+            self.buckets[d % self.size] = 0.0
+        self.day = max(self.day, day)
+
+    def add(self, day, amount):
+        self.advance(day)
+        age = self.day - day
+        if age >= self.size:
+            return
+        self.buckets[day % self.size] += amount
+        for window in self.windows:
+            if age < window:
+                self.sums[window] += amount
+
+    def total(self, window, today):
+        self.advance(today)
+        return max(self.sums[window], 0.0)
+
+
+class UserAggregate:
+    """
+    Running totals for one learner
+    """
+
+    __slots__ = ('version', 'lessons', 'completed', 'recent_lessons', 'best_quiz_by_lesson',
+                 'practice_by_lesson', 'quiz_attempts', 'quiz_score_total', 'points',
+                 'total_seconds', 'activity', 'last_active_day', 'streak', 'skill_cache')
+
+    def __init__(self):
+        self.version = 0
+        self.lessons = {}  # lesson_id -> {status, timeSpent, updatedAt}
+        self.completed = set()
+        self.recent_lessons = deque(maxlen=RECENT_LESSONS)
+        self.best_quiz_by_lesson = {}
+        self.practice_by_lesson = {}  # lesson_id -> (times practiced, last ts)
+        self.quiz_attempts = 0
+        self.quiz_score_total = 0.0
+        self.points = 0
+        self.total_seconds = 0.0
+        self.activity = RollingBuckets()
+        self.last_active_day = None
+        self.streak = 0
+        self.skill_cache = None
+
+    def apply(self, event):
+        """
+        Fold an event in; returns which recommendation inputs it changed for
+        its lesson, a subset of {'completed', 'score', 'practiced'}: the lesson
+        was completed, got a new best quiz score, or was practiced for the first time
+        """
+        self.version += 1
+        changes = set()
+        day = day_of(event['ts'])
+        self._touch(day)
+        event_type = event['type']
+        lesson_id = event.get('lessonId')
+        if lesson_id is not None and event_type in ('lesson_progress', 'quiz_attempt'):
+            count, _ = self.practice_by_lesson.get(lesson_id, (0, None))
+            self.practice_by_lesson[lesson_id] = (count + 1, event['ts'])
+            if not count:
+                changes.add('practiced')
+
+        if event_type == 'lesson_progress':
+            # Logs written before timeSpent was validated may hold NaN or Infinity
+            seconds = event['timeSpent'] if math.isfinite(event['timeSpent']) else 0
+            entry = self.lessons.setdefault(lesson_id, {'status': 'not_started', 'timeSpent': 0})
+            # Completion is sticky; revisiting a lesson doesn't undo it
+            if entry['status'] != 'completed':
+                entry['status'] = event['status']
+            entry['timeSpent'] += seconds
+            entry['updatedAt'] = event['ts']
+            if entry['status'] == 'completed' and lesson_id not in self.completed:
+                self.completed.add(lesson_id)
+                changes.add('completed')
+            if lesson_id in self.recent_lessons:
+                self.recent_lessons.remove(lesson_id)
+            self.recent_lessons.appendleft(lesson_id)
+            self.total_seconds += seconds
+            self.activity.add(day, seconds)
+
+        elif event_type == 'quiz_attempt':
+            self.quiz_attempts += 1
+            self.quiz_score_total += event['score']
+            if lesson_id is not None:
+                best = self.best_quiz_by_lesson.get(lesson_id)
+                if best is None or event['score'] > best:
+                    self.best_quiz_by_lesson[lesson_id] = event['score']
+                    changes.add('score')
+
+        elif event_type == 'exercise_submission':
+            self.points += event.get('pointsEarned', 0)
+
+        return changes
+
+    def _touch(self, day):
+        if self.last_active_day is None or day > self.last_active_day + 1:
+            self.streak = 1
+        elif day == self.last_active_day + 1:
+            self.streak += 1
+        else:
+            # Same day, or a late event for a day already counted
+            return
+        self.last_active_day = day
+
+    def current_streak(self, today):
+        if self.last_active_day is None or today - self.last_active_day > 1:
+            return 0
+        return self.streak
+
+    def avg_quiz_score(self):
+        return self.quiz_score_total / self.quiz_attempts if self.quiz_attempts else 0.0
+
+
+class MasteryStore:
+    """
+    user_id -> UserAggregate, updated on every recorded event
+    """
+
+    def __init__(self):
+        self._users = {}
+        self._lock = threading.Lock()
+
+    def apply(self, event):
+        with self._lock:
+            aggregate = self._users.get(event['userId'])
+            if aggregate is None:
+                aggregate = self._users[event['userId']] = UserAggregate()
+            return aggregate.apply(event)
+
+    def practiced(self, user_id, lesson_ids):
+        """
+        Whether the user has practiced any of lesson_ids
+        """
+        with self._lock:
+            aggregate = self._users.get(user_id)
+            if aggregate is None:
+                return False
+            return any(lesson_id in aggregate.practice_by_lesson for lesson_id in lesson_ids)
+
+    def completed_lessons(self, user_id):
+        with self._lock:
+            aggregate = self._users.get(user_id)
+            return frozenset(aggregate.completed) if aggregate is not None else frozenset()
+
+    def version_key(self, user_id, skill_graph):
+        """
+        The key skill_state() returns; it changes with every event for the user
+        and every rebuild of the concept graph
+        """
+        with self._lock:
+            aggregate = self._users.get(user_id)
+            return (skill_graph.version, aggregate.version if aggregate is not None else 0)
+
+    def skill_state(self, user_id, skill_graph):
+        """
+        Return (version_key, SkillState), re-evaluated only after the user's
+        aggregates or the concept graph have changed
+        """
+        with self._lock:
+            aggregate = self._users.get(user_id)
+            if aggregate is None:
+                return (skill_graph.version, 0), skill_graph.evaluate({}, set(), {})
+            key = (skill_graph.version, aggregate.version)
+            if aggregate.skill_cache is None or aggregate.skill_cache[0] != key:
+                state = skill_graph.evaluate(
+                    aggregate.best_quiz_by_lesson, aggregate.completed, aggregate.practice_by_lesson
+                )
+                aggregate.skill_cache = (key, state)
+            return aggregate.skill_cache
+
+    def snapshot(self, user_id, now, window_days=None):
+        """
+        Precomputed totals for a user as of now; window_days must be in WINDOW_DAYS
+        """
+        if window_days is not None and window_days not in WINDOW_DAYS:
+            raise ValueError(f'window_days must be one of {WINDOW_DAYS}')
+        today = day_of(now)
+        with self._lock:
+            aggregate = self._users.get(user_id) or UserAggregate()
+            snapshot = {
+                'lessons_completed': len(aggregate.completed),
+                'avg_quiz_score': aggregate.avg_quiz_score(),
+                'quiz_attempts': aggregate.quiz_attempts,
+                'current_streak': aggregate.current_streak(today),
+                'hours_this_week': aggregate.activity.total(7, today) / 3600,
+                'hours_this_month': aggregate.activity.total(30, today) / 3600,
+                'total_hours': aggregate.total_seconds / 3600,
+                'points': aggregate.points,
+                'recent_lessons': [
+                    (lesson_id, dict(aggregate.lessons[lesson_id]))
+                    for lesson_id in aggregate.recent_lessons
+                ],
+                'best_quiz_by_lesson': dict(aggregate.best_quiz_by_lesson)
+            }
+            if window_days is not None:
+                snapshot['window_hours'] = aggregate.activity.total(window_days, today) / 3600
+        return snapshot
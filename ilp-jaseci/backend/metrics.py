@@ -0,0 +1,212 @@
+"""
+Request instrumentation and Prometheus text exposition for the Flask API
+Records per-route latency and response-size histograms, in-flight gauges and
+status counters, plus sub-timers for time spent in walker and LLM calls
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def format_labels(names, values):
+    if not names:
+        return ''
+    pairs = ','.join(
+        '%s="%s"' % (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in zip(names, values)
+    )
+    return '{' + pairs + '}'
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    def __init__(self, name, help_text, label_names, lock):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._lock = lock
+        self._values = {}
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self, kind='counter'):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {kind}']
+        for labels, value in sorted(self._values.items()):
+            lines.append(f'{self.name}{format_labels(self.label_names, labels)} {format_value(value)}')
+        return lines
+
+
+class Gauge(Counter):
+    def dec(self, labels, amount=1):
+        self.inc(labels, -amount)
+
+    def render(self):
+        return super().render('gauge')
+
+
+class Histogram:
+    def __init__(self, name, help_text, label_names, buckets, lock):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._lock = lock
+        self._series = {}  # labels -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, labels, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        bucket_names = self.label_names + ('le',)
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series):
+                cumulative += count
+                lines.append(
+                    f'{self.name}_bucket{format_labels(bucket_names, labels + (format_value(float(bound)),))} '
+                    f'{cumulative}'
+                )
+            label_text = format_labels(self.label_names, labels)
+            lines.append(f'{self.name}_sum{label_text} {format_value(series[-1])}')
+            lines.append(f'{self.name}_count{label_text} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = []
+        self._callbacks = []
+
+    def counter(self, name, help_text, label_names=()):
+        return self._register(Counter(name, help_text, label_names, self._lock))
+
+    def gauge(self, name, help_text, label_names=()):
+        return self._register(Gauge(name, help_text, label_names, self._lock))
+
+    def histogram(self, name, help_text, label_names=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, help_text, label_names, buckets, self._lock))
+
+    def gauge_callback(self, name, help_text, fn):
+        """
+        Gauge whose value is read from fn() at scrape time
+        """
+        self._callbacks.append((name, help_text, fn))
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        with self._lock:
+            lines = [line for metric in self._metrics for line in metric.render()]
+        for name, help_text, fn in self._callbacks:
+            lines.extend([f'# HELP {name} {help_text}', f'# TYPE {name} gauge', f'{name} {format_value(fn())}'])
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+request_latency = registry.histogram(
+    'ilp_http_request_duration_seconds', 'Request latency by route', ('method', 'route')
+)
+response_size = registry.histogram(
+    'ilp_http_response_size_bytes', 'Response body size by route', ('method', 'route'), SIZE_BUCKETS
+)
+responses = registry.counter(
+    'ilp_http_responses_total', 'Responses by route and status code', ('method', 'route', 'status')
+)
+in_flight = registry.gauge(
+    'ilp_http_requests_in_flight', 'Requests currently being handled', ('method', 'route')
+)
+subcall_latency = registry.histogram(
+    'ilp_subcall_duration_seconds', 'Time spent in timed steps of a request, by kind', ('kind', 'name', 'route')
+)
+
+
+@contextmanager
+def subtimer(kind, name):
+    """
+    Time one step of handling a request. kind is what actually runs:
+      'walker'  a compiled Jac walker (bridge or walker service)
+      'compute' in-process Python that stands in for a walker ability; name
+                is the ability it replaces
+      'runner'  a job on the exercise worker pool
+      'store'   event log work: append and apply, or waiting for the commit
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        route = g.get('metrics_route', 'none') if has_request_context() else 'none'
+        subcall_latency.observe((kind, name, route), time.perf_counter() - start)
+
+
+def _route_labels():
+    rule = request.url_rule
+    return request.method, rule.rule if rule is not None else 'unmatched'
+
+
+def init_app(app):
+    """
+    Install request hooks on app and expose the registry at /metrics
+    """
+
+    @app.before_request
+    def _start_timer():
+        labels = _route_labels()
+        g.metrics_route = labels[1]
+        g.metrics_labels = labels
+        g.metrics_start = time.perf_counter()
+        in_flight.inc(labels)
+
+    @app.after_request
+    def _record_response(response):
+        labels = g.get('metrics_labels')
+        if labels is not None:
+            request_latency.observe(labels, time.perf_counter() - g.metrics_start)
+            responses.inc(labels + (response.status_code,))
+            if not response.is_streamed:
+                response_size.observe(labels, response.calculate_content_length() or 0)
+            g.metrics_recorded = True
+        return response
+
+    @app.teardown_request
+    def _finish(exc):
+        labels = g.get('metrics_labels')
+        if labels is None:
+            return
+        in_flight.dec(labels)
+        if not g.get('metrics_recorded'):
+            # Unhandled exception: after_request never ran
+            request_latency.observe(labels, time.perf_counter() - g.metrics_start)
+            responses.inc(labels + (500,))
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        return app.response_class(registry.render(), content_type=CONTENT_TYPE)
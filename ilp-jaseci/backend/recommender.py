@@ -0,0 +1,109 @@
+"""
+Deterministic next-lesson ranking over the lesson prerequisite graph
+Backs LearningPathOptimizer.recommend_next_lesson without an LLM call
+"""
+
+from lesson_index import DIFFICULTY_RANK
+
+# Relative weight of each ranking signal
+PREREQ_WEIGHT = 0.5
+WEAK_CONCEPT_WEIGHT = 0.3
+DIFFICULTY_WEIGHT = 0.2
+
+DEFAULT_RECOMMENDATIONS = 3
+DEFAULT_STRUGGLING = 3
+
+
+class Recommender:
+    """
+    Per-lesson ranking inputs, rebuilt by build() whenever content is (re)loaded
+    """
+
+    def __init__(self):
+        self.lessons = []
+        self.prerequisites = {}
+        self.difficulty = {}
+        self.concept_mask = {}
+        self.review_lesson = []
+
+    def build(self, lessons, skill_graph):
+        self.lessons = list(lessons)
+        self.prerequisites = {
+            lesson['lesson_id']: tuple(lesson.get('prerequisites', [])) for lesson in lessons
+        }
+        self.difficulty = {
+            lesson['lesson_id']: DIFFICULTY_RANK.get(lesson['difficulty'], len(DIFFICULTY_RANK))
+            for lesson in lessons
+        }
+        self.concept_mask = {}
+        for lesson in lessons:
+            mask = 0
+            for i in skill_graph.lesson_concepts.get(lesson['lesson_id'], ()):
+                mask |= 1 << i
+            self.concept_mask[lesson['lesson_id']] = mask
+        # First resource lesson of each concept, used to suggest a review
+        self.review_lesson = [resources[0] if resources else None for resources in skill_graph.resources]
+
+    def recommend(self, completed, skill_state, limit=DEFAULT_RECOMMENDATIONS):
+        """
+        Rank uncompleted lessons; returns [(lesson, score, reasons)] best first
+        Ties keep catalog order, so results are deterministic
+        """
+        weak_bits = skill_state.unlocked_bits & ~skill_state.mastered_bits
+        level = max((self.difficulty[lesson_id] for lesson_id in completed if lesson_id in self.difficulty),
+                    default=0)
+
+        ranked = []
+        for position, lesson in enumerate(self.lessons):
+            lesson_id = lesson['lesson_id']
+            if lesson_id in completed:
+                continue
+            reasons = []
+
+            prereqs = self.prerequisites[lesson_id]
+            met = sum(1 for prereq in prereqs if prereq in completed)
+            prereq_score = met / len(prereqs) if prereqs else 1.0
+            if prereq_score == 1.0:
+                reasons.append('All prerequisites complete')
+
+            mask = self.concept_mask[lesson_id]
+            taught = bin(mask).count('1')
+            weak_taught = bin(mask & weak_bits).count('1')
+            weak_score = weak_taught / taught if taught else 0.0
+            if weak_taught:
+                reasons.append('Builds concepts you are still developing')
+
+            step = self.difficulty[lesson_id] - level
+            if step in (0, 1):
+                difficulty_score = 1.0
+                if step == 1:
+                    reasons.append('Next step up in difficulty')
+            elif step < 0:
+                difficulty_score = 0.5
+            else:
+                difficulty_score = 0.0
+
+            score = (PREREQ_WEIGHT * prereq_score
+                     + WEAK_CONCEPT_WEIGHT * weak_score
+                     + DIFFICULTY_WEIGHT * difficulty_score)
+            ranked.append((-score, position, lesson, reasons))
+
+        ranked.sort(key=lambda item: (item[0], item[1]))
+        return [(lesson, -neg_score, reasons) for neg_score, _, lesson, reasons in ranked[:limit]]
+
+    def struggling(self, skill_graph, skill_state, limit=DEFAULT_STRUGGLING):
+        """
+        Unlocked, practiced concepts still below their mastery threshold, weakest first
+        Returns [(concept, mastery, review lesson id)]
+        """
+        weak_bits = skill_state.unlocked_bits & ~skill_state.mastered_bits
+        candidates = [
+            (skill_state.mastery[i], i)
+            for i in range(len(skill_graph.concepts))
+            if weak_bits >> i & 1 and skill_state.times_practiced[i] > 0
+        ]
+        candidates.sort()
+        return [
+            (skill_graph.concepts[i], mastery, self.review_lesson[i])
+            for mastery, i in candidates[:limit]
+        ]
@@ -1054,3 +1054,83 @@ SAMPLE_CONCEPTS = [
         "resources": ["jac-advanced-walkers-2"]
     }
 ]
+
+SAMPLE_EXERCISES = [
+    {
+        "exercise_id": "ex-nodes-1",
+        "lesson_id": "jac-nodes-1",
+        "title": "Model People and Friendships",
+        "description": "Define a Person node with a name and an age, and a friend_of edge that records the year the friendship started",
+        "starter_code": """node Person {
+    # Add name and age attributes
+}
+
+edge friend_of {
+    # Add a since_year attribute
+}""",
+        "solution_code": """node Person {
+    has name: str;
+    has age: int = 0;
+}
+
+edge friend_of {
+    has since_year: int;
+}""",
+        "test_cases": [
+            """# Basic node creation
+p = Person(name="Ada");
+assert p.name == "Ada";""",
+            """# Node attributes
+p = Person(name="Alan", age=41);
+assert p.age == 41;""",
+            """# Edge creation
+a = Person(name="Ada");
+b = Person(name="Alan");
+a +>:friend_of(since_year=1843):+> b;
+assert len([a ->:friend_of:->]) == 1;"""
+        ],
+        "difficulty": "beginner"
+    },
+    {
+        "exercise_id": "ex-walkers-1",
+        "lesson_id": "jac-walkers-1",
+        "title": "Count Visited Nodes",
+        "description": "Write a Counter walker that visits every Room reachable from where it is spawned and counts them",
+        "starter_code": """node Room {
+    has name: str;
+}
+
+walker Counter {
+    has count: int = 0;
+
+    # Visit rooms and count them
+}""",
+        "solution_code": """node Room {
+    has name: str;
+}
+
+walker Counter {
+    has count: int = 0;
+
+    can visit_room with Room entry {
+        self.count += 1;
+        visit [-->];
+    }
+}""",
+        "test_cases": [
+            """# Single room
+r = Room(name="hall");
+c = Counter() spawn r;
+assert c.count == 1;""",
+            """# Chain of rooms
+a = Room(name="a");
+b = Room(name="b");
+d = Room(name="d");
+a ++> b;
+b ++> d;
+c = Counter() spawn a;
+assert c.count == 3;"""
+        ],
+        "difficulty": "intermediate"
+    }
+]
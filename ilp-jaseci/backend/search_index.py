@@ -0,0 +1,310 @@
+"""
+Inverted index with BM25 ranking for lesson, section and concept search
+Documents are added, replaced and removed individually; sync() diffs a full
+document set against the indexed one by content hash, so reloading content
+only re-tokenizes what changed. sync_analyzed() takes documents already run
+through analyze(), as the content pack stores them, so serving from a pack
+never decodes lesson text to build the index. The last query term also
+matches as a prefix for search-as-you-type
+
+Each term's BM25 impacts are precomputed and kept sorted on first use, and
+queries walk the impact-ordered lists with the threshold algorithm, stopping
+once no unseen document can enter the top results
+"""
+
+import hashlib
+import heapq
+import html
+import math
+import re
+import threading
+from bisect import bisect_left
+
+from keyword_matcher import TOKEN_RE, normalize, stem
+
+K1 = 1.2
+B = 0.75
+# Score multiplier for terms matched only through prefix expansion
+PREFIX_WEIGHT = 0.6
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_TERMS = 50
+# Prefix candidates considered before keeping the MAX_PREFIX_TERMS most common
+MAX_PREFIX_SCAN = 500
+# Cached impacts use the average document length they were computed with;
+# all of them are recomputed once it drifts further than this
+AVG_LENGTH_DRIFT = 0.1
+
+TAG_RE = re.compile(r'<[^>]+>')
+
+
+def plain_text(text):
+    """
+    Strip tags and entities from an HTML fragment
+    """
+    return html.unescape(TAG_RE.sub(' ', text or ''))
+
+
+def fields_hash(fields):
+    digest = hashlib.sha256()
+    for text, weight in fields:
+        digest.update(f'{weight}\0{text}\0'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def analyze(fields):
+    """
+    (content hash, {term: weighted frequency}, length) of a (text, weight) field list
+    """
+    counts = {}
+    length = 0
+    for text, weight in fields:
+        for term in normalize(text):
+            counts[term] = counts.get(term, 0) + weight
+            length += weight
+    return fields_hash(fields), counts, length
+
+
+def catalog_documents(lessons, concepts):
+    """
+    Indexed fields for every lesson, section and concept as (text, weight) lists
+    """
+    documents = {}
+    for lesson in lessons:
+        lesson_id = lesson['lesson_id']
+        documents[('lesson', lesson_id)] = [(lesson['title'], 3), (lesson['description'], 1)]
+        for index, sec in enumerate(lesson['sections']):
+            documents[('section', lesson_id, index)] = [
+                (sec['section_title'], 2),
+                (plain_text(sec['body']), 1),
+                (' '.join(sec.get('key_concepts', [])), 2)
+            ]
+    for concept in concepts:
+        documents[('concept', concept['concept_id'])] = [
+            (concept['concept_name'], 3), (concept['description'], 1)
+        ]
+    return documents
+
+
+class SearchIndex:
+    """
+    Thread-safe BM25 index over (text, weight) field lists keyed by document key
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.postings = {}  # term -> {doc id: weighted term frequency}
+        self.doc_keys = []  # doc id -> key (None for free slots)
+        self.doc_lengths = []
+        self.doc_terms = []
+        self.doc_hashes = {}  # key -> (doc id, fields hash)
+        self._free = []
+        self._total_length = 0
+        self._vocabulary = []
+        self._vocabulary_dirty = False
+        self._impacts = {}  # term -> ([(impact, doc id)] best first, {doc id: impact})
+        self._impact_avg_length = None
+
+    def __len__(self):
+        return len(self.doc_hashes)
+
+    def _add(self, key, content_hash, counts, length):
+        doc_id = self._free.pop() if self._free else len(self.doc_keys)
+        if doc_id == len(self.doc_keys):
+            self.doc_keys.append(key)
+            self.doc_lengths.append(length)
+            self.doc_terms.append(tuple(counts))
+        else:
+            self.doc_keys[doc_id] = key
+            self.doc_lengths[doc_id] = length
+            self.doc_terms[doc_id] = tuple(counts)
+        for term, count in counts.items():
+            self._impacts.pop(term, None)
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = {}
+                self._vocabulary_dirty = True
+            posting[doc_id] = count
+        self._total_length += length
+        self.doc_hashes[key] = (doc_id, content_hash)
+
+    def _remove(self, key):
+        doc_id, _ = self.doc_hashes.pop(key)
+        for term in self.doc_terms[doc_id]:
+            self._impacts.pop(term, None)
+            posting = self.postings[term]
+            del posting[doc_id]
+            if not posting:
+                del self.postings[term]
+                self._vocabulary_dirty = True
+        self._total_length -= self.doc_lengths[doc_id]
+        self.doc_keys[doc_id] = None
+        self.doc_lengths[doc_id] = 0
+        self.doc_terms[doc_id] = ()
+        self._free.append(doc_id)
+
+    def upsert(self, key, fields):
+        """
+        Index or re-index one document; unchanged documents are left alone
+        """
+        content_hash = fields_hash(fields)
+        with self._lock:
+            current = self.doc_hashes.get(key)
+            if current is not None and current[1] == content_hash:
+                return False
+        return self.upsert_analyzed(key, *analyze(fields))
+
+    def upsert_analyzed(self, key, content_hash, counts, length):
+        """
+        upsert() for a document already run through analyze()
+        """
+        with self._lock:
+            current = self.doc_hashes.get(key)
+            if current is not None:
+                if current[1] == content_hash:
+                    return False
+                self._remove(key)
+            self._add(key, content_hash, counts, length)
+            return True
+
+    def remove(self, key):
+        with self._lock:
+            if key in self.doc_hashes:
+                self._remove(key)
+
+    def sync(self, documents):
+        """
+        Make the index match {key: fields}; returns (added or changed, removed) counts
+        """
+        changed = sum(1 for key, fields in documents.items() if self.upsert(key, fields))
+        return changed, self._remove_missing(documents)
+
+    def sync_analyzed(self, documents):
+        """
+        sync() for {key: analyze() result}
+        """
+        changed = sum(1 for key, analyzed in documents.items() if self.upsert_analyzed(key, *analyzed))
+        return changed, self._remove_missing(documents)
+
+    def _remove_missing(self, documents):
+        stale = [key for key in list(self.doc_hashes) if key not in documents]
+        for key in stale:
+            self.remove(key)
+        return len(stale)
+
+    def _expand_prefix(self, prefix):
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self.postings)
+            self._vocabulary_dirty = False
+        start = bisect_left(self._vocabulary, prefix)
+        candidates = []
+        for term in self._vocabulary[start:start + MAX_PREFIX_SCAN]:
+            if not term.startswith(prefix):
+                break
+            candidates.append(term)
+        if len(candidates) > MAX_PREFIX_TERMS:
+            candidates = heapq.nlargest(MAX_PREFIX_TERMS, candidates, key=lambda term: len(self.postings[term]))
+        return candidates
+
+    def query_terms(self, query, prefix=True):
+        """
+        Map query text to {index term: weight}; the last word also expands as a prefix
+        """
+        words = TOKEN_RE.findall(query.casefold())
+        terms = {stem(word): 1.0 for word in words}
+        if prefix and words and not query[-1:].isspace() and len(words[-1]) >= MIN_PREFIX_LENGTH:
+            for term in self._expand_prefix(words[-1]):
+                terms.setdefault(term, PREFIX_WEIGHT)
+        return terms
+
+    def _term_impacts(self, term, avg_length):
+        """
+        BM25 term-frequency component of term for every document containing it
+        """
+        cached = self._impacts.get(term)
+        if cached is None:
+            lengths = self.doc_lengths
+            by_doc = {
+                doc_id: tf * (K1 + 1) / (tf + K1 * (1 - B + B * lengths[doc_id] / avg_length))
+                for doc_id, tf in self.postings[term].items()
+            }
+            ordered = sorted(((impact, doc_id) for doc_id, impact in by_doc.items()), key=lambda item: (-item[0], item[1]))
+            cached = self._impacts[term] = (ordered, by_doc)
+        return cached
+
+    def search(self, query, limit=10, prefix=True, accept=None):
+        """
+        Return [(key, score, matched terms)] best first
+        accept(key) can restrict results, e.g. to one document type
+        """
+        with self._lock:
+            terms = self.query_terms(query, prefix)
+            n_docs = len(self.doc_hashes)
+            if not terms or not n_docs:
+                return []
+            avg_length = self._total_length / n_docs or 1.0
+            if (self._impact_avg_length is None
+                    or abs(avg_length - self._impact_avg_length) > AVG_LENGTH_DRIFT * self._impact_avg_length):
+                self._impacts.clear()
+                self._impact_avg_length = avg_length
+            avg_length = self._impact_avg_length
+
+            lists = []
+            for term, weight in terms.items():
+                posting = self.postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5)) * weight
+                ordered, by_doc = self._term_impacts(term, avg_length)
+                lists.append((term, idf, ordered, by_doc))
+
+            # Threshold algorithm: read every list in impact order, fully score each
+            # newly seen document, and stop when the k-th best beats any unseen one
+            keys = self.doc_keys
+            top = []  # min-heap of (score, -doc id)
+            seen = set()
+            depth = 0
+            while True:
+                bound = 0.0
+                exhausted = True
+                for _, idf, ordered, _ in lists:
+                    if depth >= len(ordered):
+                        continue
+                    exhausted = False
+                    impact, doc_id = ordered[depth]
+                    bound += idf * impact
+                    if doc_id in seen:
+                        continue
+                    seen.add(doc_id)
+                    if accept is not None and not accept(keys[doc_id]):
+                        continue
+                    score = sum(weight * by_doc.get(doc_id, 0.0) for _, weight, _, by_doc in lists)
+                    entry = (score, -doc_id)
+                    if len(top) < limit:
+                        heapq.heappush(top, entry)
+                    elif entry > top[0]:
+                        heapq.heapreplace(top, entry)
+                if exhausted or (len(top) >= limit and top[0][0] > bound):
+                    break
+                depth += 1
+
+            results = []
+            for score, neg_doc_id in sorted(top, reverse=True):
+                doc_id = -neg_doc_id
+                matched = [term for term, _, _, by_doc in lists if doc_id in by_doc]
+                results.append((keys[doc_id], score, matched))
+            return results
+
+
+def snippet(text, terms, width=160):
+    """
+    Plain-text excerpt of text around the first occurrence of any index term
+    """
+    text = ' '.join(plain_text(text).split())
+    wanted = set(terms)
+    for match in TOKEN_RE.finditer(text.casefold()):
+        token = match.group()
+        if stem(token) in wanted or any(token.startswith(term) for term in wanted):
+            start = max(0, match.start() - width // 3)
+            excerpt = text[start:start + width]
+            return ('...' if start else '') + excerpt + ('...' if start + width < len(text) else '')
+    return text[:width] + ('...' if len(text) > width else '')
@@ -0,0 +1,154 @@
+"""
+Concept prerequisite DAG compiled from SAMPLE_CONCEPTS and lesson prerequisites
+Concepts are topologically ordered and each one's prerequisites are stored as
+a bitmask, so a learner's unlock status for every concept comes from one pass
+of integer AND operations over their mastered-concept bitset
+"""
+
+from collections import deque, namedtuple
+
+# OSPNode.unlock_threshold default
+DEFAULT_UNLOCK_THRESHOLD = 0.7
+# MasteryNode.strength levels, checked in order
+STRENGTH_LEVELS = ((0.9, 'mastered'), (0.7, 'strong'), (0.4, 'developing'), (0.0, 'weak'))
+
+# mastery/times_practiced/last_practiced are per-concept lists in topological order
+SkillState = namedtuple(
+    'SkillState', ['mastery', 'times_practiced', 'last_practiced', 'mastered_bits', 'unlocked_bits']
+)
+
+
+def strength_of(score):
+    for floor, label in STRENGTH_LEVELS:
+        if score >= floor:
+            return label
+    return 'weak'
+
+
+class SkillGraph:
+    """
+    Compiled concept graph; rebuilt by build() whenever content is (re)loaded
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.concepts = []
+        self.index = {}
+        self.prereq_mask = []
+        self.prereq_ids = []
+        self.thresholds = []
+        self.resources = []
+        self.lesson_concepts = {}
+        self.quizzed_lessons = frozenset()
+
+    def build(self, concepts, lessons, quizzes):
+        """
+        Derive concept -> concept edges (a concept requires another when one of
+        its resource lessons lists a prerequisite lesson taught by the other,
+        or when it names it in an explicit 'prerequisites' list) and topologically
+        order them; raises ValueError on a cycle
+        """
+        by_id = {concept['concept_id']: concept for concept in concepts}
+        lessons_by_id = {lesson['lesson_id']: lesson for lesson in lessons}
+        teaches = {}
+        for concept in concepts:
+            for lesson_id in concept.get('resources', []):
+                teaches.setdefault(lesson_id, set()).add(concept['concept_id'])
+
+        requires = {}
+        for concept in concepts:
+            concept_id = concept['concept_id']
+            deps = {dep for dep in concept.get('prerequisites', []) if dep in by_id}
+            for lesson_id in concept.get('resources', []):
+                for prereq_lesson in lessons_by_id.get(lesson_id, {}).get('prerequisites', []):
+                    deps.update(teaches.get(prereq_lesson, ()))
+            deps.discard(concept_id)
+            requires[concept_id] = deps
+
+        # Kahn's algorithm, keeping catalog order among ready concepts
+        remaining = {concept_id: len(deps) for concept_id, deps in requires.items()}
+        dependents = {concept_id: [] for concept_id in requires}
+        for concept_id, deps in requires.items():
+            for dep in deps:
+                dependents[dep].append(concept_id)
+        ready = deque(concept['concept_id'] for concept in concepts if not requires[concept['concept_id']])
+        order = []
+        while ready:
+            concept_id = ready.popleft()
+            order.append(concept_id)
+            for dependent in dependents[concept_id]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(requires):
+            cyclic = sorted(concept_id for concept_id, count in remaining.items() if count > 0)
+            raise ValueError(f'Concept prerequisites form a cycle among: {", ".join(cyclic)}')
+
+        index = {concept_id: i for i, concept_id in enumerate(order)}
+        prereq_mask = []
+        for concept_id in order:
+            mask = 0
+            for dep in requires[concept_id]:
+                mask |= 1 << index[dep]
+            prereq_mask.append(mask)
+
+        lesson_concepts = {}
+        for concept_id in order:
+            for lesson_id in by_id[concept_id].get('resources', []):
+                lesson_concepts.setdefault(lesson_id, []).append(index[concept_id])
+
+        self.concepts = [by_id[concept_id] for concept_id in order]
+        self.index = index
+        self.prereq_mask = prereq_mask
+        self.prereq_ids = [sorted(requires[concept_id], key=index.get) for concept_id in order]
+        self.thresholds = [
+            by_id[concept_id].get('unlock_threshold', DEFAULT_UNLOCK_THRESHOLD) for concept_id in order
+        ]
+        self.resources = [
+            tuple(lesson_id for lesson_id in by_id[concept_id].get('resources', []) if lesson_id in lessons_by_id)
+            for concept_id in order
+        ]
+        self.lesson_concepts = {lesson_id: tuple(ids) for lesson_id, ids in lesson_concepts.items()}
+        self.quizzed_lessons = frozenset(quiz.get('lesson_id') for quiz in quizzes)
+        self.version += 1
+
+    def evaluate(self, best_quiz_by_lesson, completed, practice_by_lesson):
+        """
+        Compute a learner's SkillState from their lesson-level aggregates
+        A lesson with quizzes counts its best quiz score; one without counts completion
+        """
+        lesson_mastery = {}
+        mastery = []
+        times_practiced = []
+        last_practiced = []
+        for lesson_ids in self.resources:
+            total = 0.0
+            practiced = 0
+            last = None
+            for lesson_id in lesson_ids:
+                score = lesson_mastery.get(lesson_id)
+                if score is None:
+                    if lesson_id in self.quizzed_lessons:
+                        score = best_quiz_by_lesson.get(lesson_id, 0.0) / 100
+                    else:
+                        score = 1.0 if lesson_id in completed else 0.0
+                    lesson_mastery[lesson_id] = score
+                total += score
+                count, ts = practice_by_lesson.get(lesson_id, (0, None))
+                practiced += count
+                if ts is not None and (last is None or ts > last):
+                    last = ts
+            mastery.append(total / len(lesson_ids) if lesson_ids else 0.0)
+            times_practiced.append(practiced)
+            last_practiced.append(last)
+
+        mastered_bits = 0
+        for i, score in enumerate(mastery):
+            if score >= self.thresholds[i]:
+                mastered_bits |= 1 << i
+        unlocked_bits = 0
+        for i, mask in enumerate(self.prereq_mask):
+            if mask & mastered_bits == mask:
+                unlocked_bits |= 1 << i
+
+        return SkillState(mastery, times_practiced, last_practiced, mastered_bits, unlocked_bits)
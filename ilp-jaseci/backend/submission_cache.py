@@ -0,0 +1,210 @@
+"""
+Result cache for code exercise validation
+Submissions are keyed by exercise, test cases, grader version (jaclang, the
+runner's own code and its limits) and a hash of the normalized source, so
+resubmitted starter code or a canonical solution is answered without touching
+the compiler. Entries live in an in-memory LRU with an optional JSON file tier
+that survives restarts; the file tier is pruned by age and total size
+"""
+
+import hashlib
+import importlib.metadata
+import json
+import os
+import tempfile
+import threading
+import time
+
+from content_cache import LRUCache
+
+DEFAULT_MAX_ENTRIES = 5000
+# Disk tier bounds: entries older than this are misses and get deleted, and
+# the oldest entries go once the tier is over its size budget
+DEFAULT_MAX_AGE_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_DISK_BYTES = 256 * 1024 * 1024
+# Disk writes between prune passes
+PRUNE_INTERVAL = 500
+RUNNER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'exercise_runner.py')
+# Results that depend only on the source; timeouts and resource-limit kills can
+# be load-dependent, so they are always re-run. Reports that fail the runner's
+# shape check come back as 'crashed' and are never stored
+CACHEABLE_STATUSES = ('ok', 'compile_error', 'runtime_error')
+
+
+def normalize_source(source):
+    """
+    Ignore line-ending style, trailing whitespace and trailing blank lines
+    """
+    lines = [line.rstrip() for line in source.replace('\r\n', '\n').replace('\r', '\n').split('\n')]
+    while lines and not lines[-1]:
+        lines.pop()
+    return '\n'.join(lines)
+
+
+def runner_tag(limits, runner_path=RUNNER_PATH):
+    """
+    Identify the grader a cached result was produced by: compiler, runner code and resource limits
+    """
+    try:
+        version = importlib.metadata.version('jaclang')
+    except importlib.metadata.PackageNotFoundError:
+        version = 'unknown'
+    with open(runner_path, 'rb') as f:
+        runner = hashlib.sha256(f.read()).hexdigest()
+    return json.dumps({'jaclang': version, 'runner': runner, 'limits': limits}, sort_keys=True)
+
+
+def submission_key(exercise_id, test_cases, source, tag=''):
+    digest = hashlib.sha256()
+    for part in (tag, exercise_id, json.dumps(list(test_cases)), normalize_source(source)):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class _Pending:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SubmissionCache:
+    """
+    key -> validation result, in memory and optionally under directory
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, directory=None, max_age=DEFAULT_MAX_AGE_SECONDS,
+                 max_disk_bytes=DEFAULT_MAX_DISK_BYTES):
+        self.memory = LRUCache(max_entries)
+        self.directory = directory
+        self.max_age = max_age
+        self.max_disk_bytes = max_disk_bytes
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._writes = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self.prune()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.json')
+
+    def prune(self):
+        """
+        Delete disk entries past max_age, then the oldest until the tier fits max_disk_bytes
+        Returns the number of files removed
+        """
+        if not self.directory:
+            return 0
+        cutoff = time.time() - self.max_age
+        entries = []
+        removed = 0
+        for dirpath, _, filenames in os.walk(self.directory):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                    # Leftover .tmp files are from interrupted writes
+                    if stat.st_mtime < cutoff or not name.endswith('.json'):
+                        os.remove(path)
+                        removed += 1
+                        continue
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+            total -= size
+        return removed
+
+    def lookup(self, key):
+        """
+        Return (result, tier) where tier is 'memory', 'disk' or None on a miss
+        """
+        result = self.memory.get(key)
+        if result is not None:
+            return result, 'memory'
+        if not self.directory:
+            return None, None
+        path = self._path(key)
+        try:
+            if os.path.getmtime(path) < time.time() - self.max_age:
+                return None, None
+            with open(path, encoding='utf-8') as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None, None
+        self.memory.put(key, result)
+        return result, 'disk'
+
+    def put(self, key, result):
+        self.memory.put(key, result)
+        if not self.directory:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(result, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except OSError:
+            # The disk tier is best effort; the memory tier already has the entry
+            return
+        with self._lock:
+            self._writes += 1
+            due = self._writes % PRUNE_INTERVAL == 0
+        if due:
+            self.prune()
+
+    def fetch(self, key, compute):
+        """
+        Return (result, tier) for key, calling compute() on a miss
+        Concurrent misses for the same key share one compute() call ('shared')
+        """
+        result, tier = self.lookup(key)
+        if result is not None:
+            return result, tier
+
+        with self._lock:
+            pending = self._inflight.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._inflight[key] = _Pending()
+
+        if not leader:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.result, 'shared'
+
+        try:
+            result = compute()
+            if result.get('status') in CACHEABLE_STATUSES:
+                self.put(key, result)
+            pending.result = result
+            return result, None
+        except Exception as exc:
+            pending.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            pending.done.set()
+
+    def clear(self):
+        self.memory.clear()
+
+    def __len__(self):
+        return len(self.memory)
@@ -0,0 +1,158 @@
+"""
+API regression tests through the Flask test client: exercise validation with
+tampered submissions (needs jaclang and Linux namespaces) and progress events
+that fail to commit, carry bad values or leave recommendations unchanged, and
+search index syncs; run from backend/:
+    python -m unittest discover tests
+"""
+
+import importlib.util
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HAVE_APP = all(importlib.util.find_spec(name) is not None for name in ('flask', 'flask_cors', 'jaclang'))
+
+# A full report claiming one passed test, for an exercise with more
+FORGED_PASS = (
+    '{"status":"ok","compileErrors":[],"tests":[{"name":"Test 1","passed":true,"message":""}],"output":""}'
+)
+
+app = None
+
+
+def setUpModule():
+    global app
+    if not HAVE_APP:
+        return
+    directory = tempfile.mkdtemp()
+    unittest.addModuleCleanup(shutil.rmtree, directory)
+    os.environ.update({
+        'ILP_EVENT_LOG': os.path.join(directory, 'events.log'),
+        'ILP_EXERCISE_WORKERS': '1',
+        'ILP_WALKER_WORKERS': '0',
+    })
+    os.environ.pop('ILP_SUBMISSION_CACHE_DIR', None)
+    import app as app_module
+    app = app_module
+    unittest.addModuleCleanup(app.exercise_pool.close)
+    unittest.addModuleCleanup(app.event_store.close)
+
+
+@unittest.skipUnless(HAVE_APP, 'flask or jaclang is not installed')
+class ExerciseValidationTest(unittest.TestCase):
+    def setUp(self):
+        self.client = app.app.test_client()
+        deadline = time.monotonic() + 60
+        while not app.exercise_pool.idle() and time.monotonic() < deadline:
+            time.sleep(0.1)
+
+    def test_forged_verdict_is_neither_trusted_nor_cached(self):
+        exercise = app.exercises_by_id['ex-nodes-1']
+        for forged in ('{"status":"ok"}', FORGED_PASS):
+            payload = forged.replace('"', '\\"')
+            writes = ''.join(
+                f'    try {{ os.write({fd}, b"{payload}"); }} except Exception {{ }}\n' for fd in range(3, 64)
+            )
+            code = exercise['solution_code'] + '\nimport os;\nwith entry {\n' + writes + '    os._exit(0);\n}\n'
+            for _ in range(2):
+                response = self.client.post('/api/exercises/validate',
+                                            json={'exerciseId': 'ex-nodes-1', 'code': code})
+                self.assertEqual(response.status_code, 200)
+                body = response.get_json()
+                self.assertFalse(body['allPassed'])
+                self.assertFalse(body['cached'])
+                self.assertEqual(body['totalTests'], len(exercise['test_cases']))
+
+
+
+@unittest.skipUnless(HAVE_APP, 'flask or jaclang is not installed')
+class ProgressEventTest(unittest.TestCase):
+    def setUp(self):
+        self.client = app.app.test_client()
+        self.lesson_id = next(iter(app.lessons_by_id))
+
+    def track(self, user_id, body=None, **fields):
+        fields = {'userId': user_id, 'lessonId': self.lesson_id, 'status': 'completed', **fields}
+        return self.client.post('/api/progress/track', data=body or json.dumps(fields),
+                                content_type='application/json')
+
+    def test_failed_commit_leaves_aggregates_unchanged(self):
+        user_id = 'commit-failure-user'
+        before = app.progress_summary(user_id)
+        with mock.patch.object(app.event_store, '_write', side_effect=OSError('disk full')), \
+                mock.patch('event_store.COMMIT_RETRY_DELAY', 0), self.assertLogs('event_store', 'ERROR'):
+            response = self.track(user_id, timeSpent=60)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(app.progress_summary(user_id), before)
+        self.assertEqual(app.mastery_store.completed_lessons(user_id), frozenset())
+        # The retry is counted once
+        self.assertEqual(self.track(user_id, timeSpent=60).status_code, 200)
+        self.assertEqual(app.progress_summary(user_id)['lessonsCompleted'], 1)
+
+    def test_time_spent_must_be_a_finite_number(self):
+        for value in ('NaN', 'Infinity', '-Infinity', 'true', '-5', '"60"'):
+            with self.subTest(value=value):
+                body = ('{"userId": "bad-time-user", "lessonId": "%s", "timeSpent": %s}'
+                        % (self.lesson_id, value))
+                self.assertEqual(self.track('bad-time-user', body=body).status_code, 400)
+
+    def test_logged_non_finite_time_spent_is_ignored(self):
+        user_id = 'nan-log-user'
+        for seconds in (float('nan'), float('inf'), 90):
+            app.apply_event({'seq': 0, 'ts': time.time(), 'type': 'lesson_progress', 'userId': user_id,
+                             'lessonId': self.lesson_id, 'status': 'in_progress', 'timeSpent': seconds})
+        summary = app.progress_summary(user_id)
+        self.assertTrue(math.isfinite(summary['totalHours']))
+        self.assertEqual(summary['totalHours'], round(90 / 3600, 1))
+        response = self.client.get(f'/api/users/{user_id}/progress')
+        self.assertNotIn(b'NaN', response.get_data())
+
+    def test_only_ranking_changes_drop_cached_recommendations(self):
+        user_id = 'recommendation-cache-user'
+        lesson_id = next(iter(app.skill_graph.lesson_concepts))
+
+        def progress(status):
+            app.apply_event({'seq': 0, 'ts': time.time(), 'type': 'lesson_progress', 'userId': user_id,
+                             'lessonId': lesson_id, 'status': status, 'timeSpent': 30})
+            return app.recommendation_cache.get(user_id) is not None
+
+        self.assertEqual(self.client.get(f'/api/users/{user_id}/recommendations').status_code, 200)
+        self.assertFalse(progress('in_progress'))  # first practice of the lesson's concepts
+        self.client.get(f'/api/users/{user_id}/recommendations')
+        self.assertTrue(progress('in_progress'))
+        self.assertFalse(progress('completed'))
+
+
+
+@unittest.skipUnless(HAVE_APP, 'flask or jaclang is not installed')
+class SearchSyncTest(unittest.TestCase):
+    def test_reload_during_a_sync_is_synced_again(self):
+        app.ensure_search_index()
+        syncs = []
+
+        def sync(documents):
+            syncs.append(documents)
+            if len(syncs) == 1:
+                # A content reload lands while the first sync is running
+                app.search_sync['generation'] = next(app.search_generations)
+
+        app.search_sync['generation'] = next(app.search_generations)
+        with mock.patch.object(app.search_index, 'sync', side_effect=sync), \
+                mock.patch.object(app.search_index, 'sync_analyzed', side_effect=sync):
+            app.ensure_search_index()
+            app.ensure_search_index()
+            app.ensure_search_index()
+        self.assertEqual(len(syncs), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Event log durability tests: failed commits and damaged records on replay
+    python -m unittest discover tests
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import event_store
+from event_store import CommitError, EventStore
+
+
+class EventStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'events.log')
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def write_events(self, count):
+        store = EventStore(self.path)
+        store.open()
+        events = [store.append('tick', n=n) for n in range(count)]
+        self.assertTrue(store.wait_durable(events[-1]['seq'], 5))
+        store.close()
+
+    def test_failed_commit_fails_its_waiters_and_keeps_the_log_clean(self):
+        store = EventStore(self.path)
+        applied = []
+        store.open(applied.append)
+        self.addCleanup(store.close)
+        self.assertTrue(store.wait_durable(store.append('tick', n=0)['seq'], 5))
+
+        write = store._write
+
+        def partial_write(data):
+            store._file.write(data[:5])
+            raise OSError('No space left on device')
+
+        store._write = partial_write
+        with self.assertLogs(event_store.logger, 'ERROR'):
+            failed = store.append('tick', n=1)
+            with self.assertRaises(CommitError):
+                store.wait_durable(failed['seq'], 5)
+        store._write = write
+        self.assertTrue(store.wait_durable(store.append('tick', n=2)['seq'], 5))
+        # The partial write was cut away, so offsets still match the bytes on disk
+        self.assertEqual(os.path.getsize(self.path), store._durable_offset)
+        self.assertEqual([event['n'] for event in store.replay()], [0, 2])
+        # Only committed events reach the callback, so memory matches a replay
+        self.assertEqual([event['n'] for event in applied], [0, 2])
+
+    def test_replay_skips_a_corrupt_record_and_truncates_a_torn_tail(self):
+        self.write_events(4)
+        with open(self.path, 'rb') as f:
+            lines = f.readlines()
+        with open(self.path, 'wb') as f:
+            f.writelines(lines[:2] + [b'{"seq": 3, "ts"\n'] + lines[2:] + [b'{"seq": 9'])
+
+        store = EventStore(self.path)
+        replayed = []
+        with self.assertLogs(event_store.logger, 'WARNING'):
+            store.open(replayed.append)
+        self.addCleanup(store.close)
+        self.assertEqual([event['n'] for event in replayed], [0, 1, 2, 3])
+        self.assertTrue(os.path.exists(self.path + '.corrupt'))
+        with open(self.path, 'rb') as f:
+            self.assertTrue(f.read().endswith(b'}\n'))
+        self.assertEqual(os.path.getsize(self.path), store._durable_offset)
+
+
+if __name__ == '__main__':
+    unittest.main()
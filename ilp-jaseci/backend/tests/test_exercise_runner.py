@@ -0,0 +1,152 @@
+"""
+Exercise pool regression tests: sandbox escapes, bad worker replies and limits
+Needs jaclang and Linux namespaces; run from backend/:
+    python -m unittest discover tests
+"""
+
+import importlib.util
+import os
+import subprocess
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import exercise_runner
+from exercise_runner import ExercisePool
+
+HAVE_JACLANG = importlib.util.find_spec('jaclang') is not None
+
+ADD_SOURCE = 'def add(a: int, b: int) -> int { return a + b; }'
+FORGED_PASS = (
+    '{"id":"x","result":{"status":"ok","compileErrors":[],'
+    '"tests":[{"name":"Test 1","passed":true,"message":""}],"output":""}}'
+)
+FORGED_RESULTS = (
+    '{"status":"ok"}',
+    '{"status":"ok","compileErrors":[],"tests":[{"name":"Test 1","passed":true,"message":""}],"output":""}',
+)
+THREE_TESTS = ['assert add(1, 1) == 3;', 'assert add(2, 2) == 5;', 'assert add(3, 3) == 7;']
+
+
+def fd_spray(payload, exit_after=False):
+    """
+    Jac source that writes payload to every descriptor it might have inherited
+    """
+    payload = payload.replace('"', '\\"')
+    writes = ''.join(
+        f'    try {{ os.write({fd}, b"{payload}"); }} except Exception {{ }}\n' for fd in range(3, 64)
+    )
+    exit = '    os._exit(0);\n' if exit_after else ''
+    return 'import os;\n' + ADD_SOURCE + '\nwith entry {\n' + writes + exit + '}\n'
+
+
+def wait_until_ready(pool, timeout=60):
+    deadline = time.monotonic() + timeout
+    while not pool.idle() and time.monotonic() < deadline:
+        if not pool._workers:
+            raise RuntimeError(pool.startup_error or 'exercise workers did not start')
+        time.sleep(0.1)
+
+
+@unittest.skipUnless(HAVE_JACLANG, 'jaclang is not installed')
+class SandboxTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = ExercisePool(1, cpu_seconds=5, memory_mb=64, wall_seconds=2)
+        cls.pool.start()
+        wait_until_ready(cls.pool)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def test_passing_and_failing_tests(self):
+        result = self.pool.run(ADD_SOURCE, ['assert add(1, 2) == 3;', 'assert False;'])
+        self.assertEqual(result['status'], 'ok')
+        self.assertEqual([test['passed'] for test in result['tests']], [True, False])
+
+    def test_inherited_fds_cannot_spoof_a_reply(self):
+        result = self.pool.run(fd_spray(FORGED_PASS + '\\n'), ['assert False;'])
+        self.assertFalse(result['tests'][0]['passed'])
+        # The next job gets its own reply, not a stale forged one
+        result = self.pool.run(ADD_SOURCE, ['assert add(2, 2) == 5;'])
+        self.assertEqual(result['status'], 'ok')
+        self.assertFalse(result['tests'][0]['passed'])
+
+    def test_submission_cannot_report_its_own_verdict(self):
+        for forged in FORGED_RESULTS:
+            for exit_after in (False, True):
+                with self.subTest(forged=forged, exit_after=exit_after):
+                    result = self.pool.run(fd_spray(forged, exit_after), THREE_TESTS)
+                    self.assertEqual(len(result['tests']), 3)
+                    self.assertFalse(any(test['passed'] for test in result['tests']))
+                    self.assertEqual(result['status'], 'crashed')
+
+    def test_filesystem_and_identity_are_isolated(self):
+        result = self.pool.run('with entry { open("/etc/passwd"); }', ['assert True;'])
+        self.assertEqual(result['status'], 'runtime_error')
+        result = self.pool.run('import os;\nwith entry { uid = os.getuid(); }', ['assert uid != 0;'])
+        self.assertTrue(result['tests'][0]['passed'])
+
+    def test_timeout_kills_the_child(self):
+        result = self.pool.run('with entry { while True { } }', ['assert True;'])
+        self.assertEqual(result['status'], 'timeout')
+        self.assertEqual(self.pool.run(ADD_SOURCE, ['assert add(1, 1) == 2;'])['status'], 'ok')
+
+    def test_memory_limit(self):
+        result = self.pool.run('with entry { hog = [0] * 100000000; }', ['assert True;'])
+        self.assertEqual(result['status'], 'memory_limit')
+        self.assertEqual(self.pool.run(ADD_SOURCE, ['assert add(1, 1) == 2;'])['status'], 'ok')
+
+
+class _ScriptedWorker(exercise_runner._Worker):
+    """
+    Worker stand-in that announces itself ready and answers every job with REPLY
+    """
+    REPLY = ''
+
+    def __init__(self, isolate=True):
+        script = (
+            'import sys\n'
+            'print(\'{"ready": true}\', flush=True)\n'
+            'for line in sys.stdin:\n'
+            f'    print({self.REPLY!r}, flush=True)\n'
+        )
+        self.process = subprocess.Popen([sys.executable, '-c', script], stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE, text=True, bufsize=1)
+
+
+class BadReplyTest(unittest.TestCase):
+    def run_with_reply(self, reply):
+        worker_class = type('Worker', (_ScriptedWorker,), {'REPLY': reply})
+        with mock.patch.object(exercise_runner, '_Worker', worker_class):
+            pool = ExercisePool(1, wall_seconds=1)
+            pool.start()
+            try:
+                wait_until_ready(pool)
+                first = next(iter(pool._workers))
+                result = pool.run(ADD_SOURCE, ['assert True;'])
+                # The misbehaving worker is killed and replaced rather than reused
+                self.assertIsNotNone(first.process.poll())
+                self.assertNotIn(first, pool._workers)
+                self.assertEqual(len(pool._workers), 1)
+            finally:
+                pool.close()
+        return result
+
+    def test_garbage_reply(self):
+        result = self.run_with_reply('not json {')
+        self.assertEqual(result['status'], 'crashed')
+        self.assertFalse(result['tests'][0]['passed'])
+
+    def test_reply_for_another_job(self):
+        result = self.run_with_reply(FORGED_PASS)
+        self.assertEqual(result['status'], 'crashed')
+        self.assertFalse(result['tests'][0]['passed'])
+
+
+if __name__ == '__main__':
+    unittest.main()
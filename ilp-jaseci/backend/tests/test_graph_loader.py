@@ -0,0 +1,99 @@
+"""
+Adjacency index tests: typed edge queries stay correct when a catalog is
+unloaded and the same number of edges is loaded back (jaclang needs Python 3.12)
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from jaclang.compiler.constant import EdgeDir
+    from jaclang.compiler.program import JacProgram
+    from jaclang.runtimelib.archetype import EdgeAnchor, GenericEdge, NodeAnchor
+    from jaclang.runtimelib.runtime import JacRuntime as Jac
+except ImportError:
+    Jac = None
+
+from graph_loader import GRAPH_ARCHETYPES, load_graph, synthetic_catalog
+
+
+def scan(anchor, direction):
+    # What the index must agree with: a full pass over the edge list
+    attr = 'source' if direction == EdgeDir.OUT else 'target'
+    return [edge for edge in anchor.edges if getattr(edge, attr) == anchor]
+
+
+@unittest.skipIf(Jac is None, 'jaclang is not installed')
+class EdgeIndexTest(unittest.TestCase):
+    def make_edges(self, node, others):
+        edges = []
+        for other in others:
+            edge = EdgeAnchor(archetype=GenericEdge(), source=node, target=other, is_undirected=False)
+            node.add_edge(edge)
+            other.add_edge(edge)
+            edges.append(edge)
+        return edges
+
+    def setUp(self):
+        self.node = NodeAnchor(archetype=None, edges=[])
+        self.others = [NodeAnchor(archetype=None, edges=[]) for _ in range(6)]
+        self.edges = self.make_edges(self.node, self.others)
+        self.assertEqual(self.node.edges_of((GenericEdge,), EdgeDir.OUT), self.edges)
+
+    def test_remove_then_add_through_methods(self):
+        for edge in self.edges[:3]:
+            self.node.remove_edge(edge)
+        added = self.make_edges(self.node, self.others[:3])
+        self.assertEqual(self.node.edges_of((GenericEdge,), EdgeDir.OUT), self.edges[3:] + added)
+
+    def test_remove_then_add_by_editing_edges(self):
+        self.node.edges[:] = self.edges[3:]
+        added = self.make_edges(self.node, self.others[:3])
+        self.assertEqual(self.node.edges_of((GenericEdge,), EdgeDir.OUT), self.edges[3:] + added)
+
+    def test_replaced_edge_list(self):
+        self.node.edges = list(self.edges[:2])
+        self.assertEqual(self.node.edges_of((GenericEdge,), EdgeDir.OUT), self.edges[:2])
+
+
+@unittest.skipIf(Jac is None, 'jaclang is not installed')
+class ReloadTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from walker_bridge import BASE_PATH, JAC_MODULES
+
+        Jac.attach_program(JacProgram())
+        cls.archetypes = {}
+        for name in JAC_MODULES:
+            if name.startswith('models.'):
+                (module,) = Jac.jac_import(name, BASE_PATH)
+                cls.archetypes.update(
+                    (attr, getattr(module, attr)) for attr in GRAPH_ARCHETYPES if hasattr(module, attr)
+                )
+
+    def setUp(self):
+        self.ctx = Jac.create_j_context(session=None)
+        Jac.set_context(self.ctx)
+        self.addCleanup(self.ctx.close)
+
+    def test_reload_replaces_root_edges(self):
+        catalog = synthetic_catalog(20, 2)
+        graph = load_graph(self.archetypes, *catalog)
+        root = self.ctx.get_root().__jac__
+        stale = root.edges_of((GenericEdge,), EdgeDir.OUT)
+        self.assertEqual(stale, scan(root, EdgeDir.OUT))
+        
+        graph.unload(self.ctx.mem)
+        load_graph(self.archetypes, *catalog)
+        live = root.edges_of((GenericEdge,), EdgeDir.OUT)
+        self.assertEqual(len(live), len(stale))
+        self.assertEqual(live, scan(root, EdgeDir.OUT))
+        self.assertFalse(set(live) & set(stale))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+"""
+In-process bridge from the Flask API to the Jac walkers
+start() compiles models/, walkers/ and agents/ once into a single JacProgram
+through Jac.jac_import and registers every walker, node and edge archetype by
+name. run() spawns a registered walker against a long-lived ExecutionContext,
+so a request pays only for the traversal, never for parsing or bytecode
+generation. load_graph() materializes the content catalog on that context's
+root for walkers to traverse. jaclang needs Python 3.12; when it cannot be loaded the bridge
+stays unavailable and the API keeps answering from its Python aggregates
+"""
+
+import io
+import os
+import threading
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import asdict, is_dataclass
+
+from graph_loader import load_graph
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+# Models first: walkers and agents refer to their node and edge types
+JAC_MODULES = (
+    'models.lesson',
+    'models.quiz',
+    'models.user',
+    'models.osp_graph',
+    'walkers.content',
+    'walkers.progress',
+    'walkers.quiz',
+    'agents.learning_optimizer'
+)
+# How long run() waits for a start() that is still compiling
+READY_TIMEOUT = 60
+
+
+class BridgeUnavailableError(RuntimeError):
+    """
+    Raised when jaclang could not be loaded or the Jac modules failed to compile
+    """
+
+
+class UnknownWalkerError(LookupError):
+    """
+    Raised for a walker name that is not in the registry
+    """
+
+
+def jsonable(value):
+    """
+    Reports as JSON-ready values; archetypes become {'id', 'context'}
+    """
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, dict):
+        return {str(key): jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [jsonable(item) for item in value]
+    anchor = getattr(value, '__jac__', None)
+    if anchor is not None:
+        report = anchor.report()
+        return {'id': report.id, 'context': jsonable(report.context)}
+    if is_dataclass(value) and not isinstance(value, type):
+        return jsonable(asdict(value))
+    return str(value)
+
+
+class WalkerBridge:
+    """
+    Compile-once registry of Jac archetypes plus a reusable execution context
+    """
+
+    def __init__(self, base_path=BASE_PATH, modules=JAC_MODULES):
+        self.base_path = base_path
+        self.module_names = modules
+        self.modules = {}
+        self.walkers = {}
+        self.nodes = {}
+        self.edges = {}
+        self.graph = None
+        self.startup_error = None
+        self._jac = None
+        self._context = None
+        # jaclang keeps one process-wide active context, so runs take turns
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+    def start(self):
+        """
+        Compile and import every module, then build the registry; never raises
+        """
+        try:
+            from jaclang.compiler.program import JacProgram
+            from jaclang.runtimelib.constructs import EdgeArchetype, NodeArchetype, WalkerArchetype
+            from jaclang.runtimelib.runtime import JacRuntime as Jac
+
+            Jac.attach_program(JacProgram())
+            for name in self.module_names:
+                (module,) = Jac.jac_import(name, self.base_path)
+                self.modules[name] = module
+                for attr, value in vars(module).items():
+                    if not isinstance(value, type) or value.__module__ != module.__name__:
+                        continue
+                    if issubclass(value, WalkerArchetype):
+                        self.walkers[attr] = value
+                    elif issubclass(value, NodeArchetype):
+                        self.nodes[attr] = value
+                    elif issubclass(value, EdgeArchetype):
+                        self.edges[attr] = value
+            self._context = Jac.create_j_context()
+            self._jac = Jac
+        except Exception as exc:
+            self.startup_error = f'{type(exc).__name__}: {exc}'
+        finally:
+            self._ready.set()
+
+    def available(self):
+        return self._ready.is_set() and self._jac is not None
+
+    def _await_ready(self):
+        if not self._ready.wait(READY_TIMEOUT):
+            raise BridgeUnavailableError('Jac modules are still compiling')
+        if self._jac is None:
+            raise BridgeUnavailableError(self.startup_error or 'Walker bridge was not started')
+
+    def walker_class(self, walker_name):
+        self._await_ready()
+        walker_class = self.walkers.get(walker_name)
+        if walker_class is None:
+            raise UnknownWalkerError(walker_name)
+        return walker_class
+
+    @contextmanager
+    def context(self):
+        """
+        Hold the shared ExecutionContext as the active one, e.g. to build a graph on its root
+        """
+        self._await_ready()
+        with self._lock:
+            self._jac.set_context(self._context)
+            yield self._context
+
+    def run(self, walker_name, node=None, **fields):
+        """
+        Spawn walker_name with fields on node (the context root by default)
+        and return its reports; raises TypeError for fields the walker lacks
+        """
+        walker_class = self.walker_class(walker_name)
+        with self.context() as ctx:
+            walker = walker_class(**fields)
+            ctx.reports = []
+            # report also prints; keep the API's stdout clean
+            with redirect_stdout(io.StringIO()):
+                self._jac.spawn(walker, node if node is not None else ctx.get_root())
+            reports = ctx.reports
+            ctx.reports = []
+        return reports
+
+    def load_graph(self, lessons, quizzes, concepts, exercises=()):
+        """
+        Replace the content graph on the shared context's root with the catalog's
+        """
+        with self.context() as ctx:
+            if self.graph is not None:
+                self.graph.unload(ctx.mem)
+            self.graph = load_graph({**self.nodes, **self.edges}, lessons, quizzes, concepts, exercises)
+        return self.graph
+
+    def close(self):
+        with self._lock:
+            if self._context is not None:
+                self._context.close()
+                self._context = None
+                self._jac = None
@@ -0,0 +1,438 @@
+"""
+Multi-process walker execution service
+Walker traversal is pure Python and holds the GIL, so CPU-heavy walkers such
+as MasteryAggregator and LearningPathOptimizer run in a pool of worker
+processes (ILP_WALKER_WORKERS; none by default). The Jac modules are compiled once into a
+shared bytecode artifact (data/walkers.bytecode); workers exec that bytecode
+at startup instead of compiling, and the artifact is only rebuilt when a
+.jac source, jaclang or the interpreter changes. Each worker then bulk-loads
+the content catalog into its graph; restart() replaces workers after a reload
+
+Workers speak length-prefixed JSON frames over stdin/stdout:
+    {"w": walker, "f": {fields}}  ->  {"r": report}* then {"ok": true} or {"e": type, "m": message}
+Reports are sent as the walker produces them, so callers can stream them on
+
+Build or refresh the artifact by hand:
+    python walker_service.py --build [data/walkers.bytecode]
+"""
+
+import hashlib
+import json
+import os
+import queue
+import select
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+from content_pack import DEFAULT_PACK_PATH
+from graph_loader import load_graph, read_catalog
+from walker_bridge import BASE_PATH, JAC_MODULES, BridgeUnavailableError, UnknownWalkerError, jsonable
+
+# Off unless configured: each worker is a jaclang process holding its own copy of the catalog
+DEFAULT_WORKERS = 0
+DEFAULT_ARTIFACT_PATH = os.path.join(BASE_PATH, 'data', 'walkers.bytecode')
+# How long a request waits for a free worker, and for one whole walker run
+ACQUIRE_TIMEOUT = 10
+WALL_SECONDS = 30
+FRAME = struct.Struct('>I')
+# jaclang modules changed by patches/jaclang-0.9.3-ilp.patch; their sources are
+# part of the fingerprint, since the version alone does not say whether the patch is in
+JACLANG_PATCHED_MODULES = (
+    'jaclang.compiler.passes.main.pyast_gen_pass',
+    'jaclang.runtimelib.archetype',
+    'jaclang.runtimelib.runtime',
+)
+# Errors raised in a worker that are the caller's fault rather than the service's
+CALLER_ERRORS = {'TypeError': TypeError, 'UnknownWalkerError': UnknownWalkerError}
+
+
+class ServiceBusyError(RuntimeError):
+    """
+    Raised when no walker worker frees up within ACQUIRE_TIMEOUT
+    """
+
+
+class WalkerFailedError(RuntimeError):
+    """
+    Raised when a walker errors, overruns WALL_SECONDS or its worker dies mid-run
+    """
+
+
+def write_frame(stream, message):
+    data = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    stream.write(FRAME.pack(len(data)) + data)
+    stream.flush()
+
+
+def read_exactly(stream, size):
+    data = b''
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+def read_frame(stream):
+    header = read_exactly(stream, FRAME.size)
+    if header is None:
+        return None
+    (length,) = FRAME.unpack(header)
+    data = read_exactly(stream, length)
+    return json.loads(data) if data is not None else None
+
+
+# ============================================================================
+# ARTIFACT
+# ============================================================================
+
+def source_fingerprint(base_path=BASE_PATH, modules=JAC_MODULES):
+    """
+    What compiled bytecode depends on: module sources, jaclang (its version and
+    the sources of its patched modules) and the interpreter
+    """
+    import importlib.metadata
+    import importlib.util
+
+    digest = hashlib.sha256()
+    digest.update(importlib.util.MAGIC_NUMBER)
+    try:
+        digest.update(importlib.metadata.version('jaclang').encode('utf-8'))
+    except importlib.metadata.PackageNotFoundError:
+        pass
+    for name in JACLANG_PATCHED_MODULES:
+        spec = importlib.util.find_spec(name)
+        if spec is not None and spec.origin:
+            with open(spec.origin, 'rb') as f:
+                digest.update(name.encode('utf-8') + b'\0' + f.read() + b'\0')
+    for name in modules:
+        with open(os.path.join(base_path, *name.split('.')) + '.jac', 'rb') as f:
+            digest.update(name.encode('utf-8') + b'\0' + f.read() + b'\0')
+    return digest.hexdigest()
+
+
+def build_artifact(path, base_path=BASE_PATH, modules=JAC_MODULES):
+    """
+    Compile every module to bytecode and write {fingerprint, modules} to path
+    Returns False when the existing artifact is already current
+    """
+    import marshal
+    from jaclang.compiler.program import JacProgram
+
+    fingerprint = source_fingerprint(base_path, modules)
+    try:
+        with open(path, 'rb') as f:
+            if marshal.load(f).get('fingerprint') == fingerprint:
+                return False
+    except (OSError, EOFError, ValueError, TypeError, AttributeError):
+        pass
+
+    compiled = []
+    for name in modules:
+        file_path = os.path.join(base_path, *name.split('.')) + '.jac'
+        program = JacProgram()
+        module = program.compile(file_path)
+        if program.errors_had or not module.gen.py_bytecode:
+            errors = '; '.join(f'line {error.loc.first_line}: {error.msg}' for error in program.errors_had)
+            raise RuntimeError(f'{file_path} did not compile: {errors or "no bytecode"}')
+        compiled.append((name, file_path, module.gen.py_bytecode))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        marshal.dump({'fingerprint': fingerprint, 'modules': compiled}, f)
+    os.replace(tmp_path, path)
+    return True
+
+
+def load_artifact(path):
+    """
+    Exec the artifact's bytecode into fresh modules; returns {archetype name: class}
+    """
+    import marshal
+    import types
+    from jaclang.runtimelib.constructs import Archetype
+
+    with open(path, 'rb') as f:
+        artifact = marshal.load(f)
+    archetypes = {}
+    for name, file_path, bytecode in artifact['modules']:
+        module = types.ModuleType(name)
+        module.__file__ = file_path
+        # Archetype dataclasses look their module up in sys.modules
+        sys.modules[name] = module
+        exec(marshal.loads(bytecode), module.__dict__)
+        for attr, value in vars(module).items():
+            if isinstance(value, type) and value.__module__ == name and issubclass(value, Archetype):
+                archetypes[attr] = value
+    return archetypes
+
+
+# ============================================================================
+# WORKER PROCESS
+# ============================================================================
+
+class _StreamedReports(list):
+    """
+    ctx.reports stand-in that sends each report to the caller as it is made
+    """
+
+    def __init__(self, channel):
+        super().__init__()
+        self.channel = channel
+
+    def append(self, report):
+        write_frame(self.channel, {'r': jsonable(report)})
+
+
+def worker_main(artifact_path):
+    """
+    Entry point of a worker process: load the artifact, then serve runs until stdin closes
+    """
+    import io
+    from contextlib import redirect_stdout
+
+    # Keep the protocol channel private; report also prints to stdout
+    channel = os.fdopen(os.dup(1), 'wb')
+    os.dup2(2, 1)
+    commands = sys.stdin.buffer
+
+    try:
+        from jaclang.runtimelib.constructs import WalkerArchetype
+        from jaclang.runtimelib.runtime import JacRuntime as Jac
+        archetypes = load_artifact(artifact_path)
+        walkers = {name: cls for name, cls in archetypes.items() if issubclass(cls, WalkerArchetype)}
+        ctx = Jac.get_context()
+        load_graph(archetypes, *read_catalog(os.environ.get('ILP_CONTENT_PACK', DEFAULT_PACK_PATH)))
+    except Exception as exc:
+        write_frame(channel, {'ready': False, 'error': f'{type(exc).__name__}: {exc}'})
+        return
+    write_frame(channel, {'ready': True, 'walkers': sorted(walkers)})
+
+    while True:
+        job = read_frame(commands)
+        if job is None:
+            break
+        try:
+            walker_class = walkers.get(job['w'])
+            if walker_class is None:
+                raise UnknownWalkerError(job['w'])
+            walker = walker_class(**job['f'])
+            ctx.reports = _StreamedReports(channel)
+            with redirect_stdout(io.StringIO()):
+                Jac.spawn(walker, ctx.get_root())
+        except Exception as exc:
+            write_frame(channel, {'e': type(exc).__name__, 'm': str(exc)})
+        else:
+            write_frame(channel, {'ok': True})
+        finally:
+            ctx.reports = []
+
+
+# ============================================================================
+# SERVICE (API PROCESS)
+# ============================================================================
+
+class _Worker:
+    def __init__(self, artifact_path, generation):
+        self.generation = generation
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), '--worker', artifact_path],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            # Unbuffered, so select() never misses a frame already read into a buffer
+            bufsize=0
+        )
+
+    def read_frame(self, timeout):
+        ready, _, _ = select.select([self.process.stdout], [], [], timeout)
+        if not ready:
+            return None
+        try:
+            return read_frame(self.process.stdout)
+        except ValueError:
+            return None
+
+    def kill(self):
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+
+
+class WalkerService:
+    """
+    Fixed-size pool of walker processes; stream() blocks until a worker is free
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, artifact_path=DEFAULT_ARTIFACT_PATH,
+                 wall_seconds=WALL_SECONDS, acquire_timeout=ACQUIRE_TIMEOUT):
+        self.size = workers
+        self.artifact_path = artifact_path
+        self.wall_seconds = wall_seconds
+        self.acquire_timeout = acquire_timeout
+        self.walkers = ()
+        self.startup_error = None
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._workers = set()
+        self._closed = False
+        self._started = False
+        self._generation = 0
+        self._ready = threading.Event()
+
+    def launch(self):
+        """
+        Start the workers on a background thread, once
+        Called by the app's entry point, and by the first run if nothing else did
+        """
+        with self._lock:
+            if self._started or self._closed:
+                return
+            self._started = True
+        threading.Thread(target=self.start, name='walker-service-start', daemon=True).start()
+
+    def start(self):
+        """
+        Refresh the artifact in a one-off process, then launch the workers
+        Blocks while the artifact builds; run it on a background thread
+        """
+        build = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--build', self.artifact_path],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+        )
+        if build.returncode != 0:
+            lines = build.stderr.strip().splitlines()
+            self.startup_error = lines[-1] if lines else 'Walker artifact build failed'
+            self._ready.set()
+            return
+        for _ in range(self.size):
+            self._spawn()
+
+    def _spawn(self):
+        with self._lock:
+            if self._closed:
+                return
+            worker = _Worker(self.artifact_path, self._generation)
+            self._workers.add(worker)
+        threading.Thread(target=self._await_ready, args=(worker,), daemon=True).start()
+
+    def _await_ready(self, worker):
+        status = worker.read_frame(timeout=60) or {'ready': False, 'error': 'walker worker did not start'}
+        if status.get('ready'):
+            self.walkers = tuple(status['walkers'])
+            self._idle.put(worker)
+        else:
+            self.startup_error = status.get('error')
+            self._discard(worker)
+        self._ready.set()
+
+    def _discard(self, worker):
+        with self._lock:
+            self._workers.discard(worker)
+        worker.kill()
+
+    def restart(self):
+        """
+        Replace every worker, e.g. so they load a reloaded catalog
+        Busy workers finish their run first and are replaced when it ends
+        """
+        with self._lock:
+            self._generation += 1
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(worker)
+            self._spawn()
+
+    def idle(self):
+        return self._idle.qsize()
+
+    def available(self):
+        return self._ready.is_set() and bool(self._workers)
+
+    def _acquire(self):
+        self.launch()
+        if not self._ready.wait(self.acquire_timeout) and not self._closed:
+            raise BridgeUnavailableError('Walker workers are still starting')
+        if self._closed or not self._workers:
+            raise BridgeUnavailableError(self.startup_error or 'No walker workers are running')
+        try:
+            return self._idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            if not self._workers:
+                raise BridgeUnavailableError(self.startup_error or 'No walker workers are running')
+            raise ServiceBusyError('All walker workers are busy')
+
+    def stream(self, walker_name, **fields):
+        """
+        Yield walker_name's reports as a worker produces them
+        The whole run, not each report, must finish within wall_seconds; a
+        worker that overruns, dies or is abandoned mid-run is replaced
+        """
+        if self.available() and walker_name not in self.walkers:
+            raise UnknownWalkerError(walker_name)
+        worker = self._acquire()
+        finished = False
+        deadline = time.monotonic() + self.wall_seconds
+        try:
+            write_frame(worker.process.stdin, {'w': walker_name, 'f': fields})
+            while True:
+                remaining = deadline - time.monotonic()
+                frame = worker.read_frame(timeout=remaining) if remaining > 0 else None
+                if frame is None:
+                    if worker.process.poll() is not None:
+                        raise WalkerFailedError(f'{walker_name} failed: walker worker exited')
+                    raise WalkerFailedError(f'{walker_name} did not finish within {self.wall_seconds}s')
+                if 'r' in frame:
+                    yield frame['r']
+                    continue
+                finished = True
+                if 'e' in frame:
+                    error = CALLER_ERRORS.get(frame['e'])
+                    if error is not None:
+                        raise error(frame['m'])
+                    raise WalkerFailedError(f'{walker_name} failed: {frame["e"]}: {frame["m"]}')
+                return
+        except OSError:
+            raise BridgeUnavailableError('Walker worker failed')
+        finally:
+            if finished and worker.generation == self._generation:
+                self._idle.put(worker)
+            else:
+                self._discard(worker)
+                self._spawn()
+
+    def run(self, walker_name, **fields):
+        """
+        Run walker_name to completion and return all of its reports
+        """
+        return list(self.stream(walker_name, **fields))
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            try:
+                worker.process.stdin.close()
+            except OSError:
+                pass
+            worker.kill()
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--worker']:
+        worker_main(sys.argv[2])
+    elif sys.argv[1:2] == ['--build']:
+        path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_ARTIFACT_PATH
+        rebuilt = build_artifact(path)
+        print(f'{"Rebuilt" if rebuilt else "Up to date"}: {path}')
+    else:
+        sys.exit('usage: walker_service.py --build [PATH] | --worker PATH')
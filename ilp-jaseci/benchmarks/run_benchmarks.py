@@ -0,0 +1,330 @@
+"""
+Reproducible load test for the ILP API
+
+Drives the scenario mixes in scenarios.py either in-process through the Flask
+test client or over HTTP against a real local server, reports per-route
+p50/p95/p99 latency, throughput and RSS, and compares against a saved JSON
+baseline.
+
+    python benchmarks/run_benchmarks.py --mode client --save-baseline
+    python benchmarks/run_benchmarks.py --mode server --concurrency 16
+    python benchmarks/run_benchmarks.py --mode both --threshold 0.25
+
+Exits with status 1 when any route regresses past the threshold.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(os.path.dirname(BENCH_DIR), 'backend')
+sys.path.insert(0, BACKEND_DIR)
+
+from scenarios import MIXES, USER_POOL  # noqa: E402
+
+DEFAULT_BASELINE_DIR = os.path.join(BENCH_DIR, 'baselines')
+# Latency regressions smaller than this are treated as noise
+MIN_DELTA_MS = 0.5
+
+
+def percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def rss_mb(pid=None):
+    """
+    Resident set size of pid (or of this process) in MiB, when measurable
+    """
+    if pid is not None:
+        try:
+            with open(f'/proc/{pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        return int(line.split()[1]) / 1024
+        except OSError:
+            return None
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if platform.system() == 'Darwin' else peak / 1024
+
+
+class Recorder:
+    """
+    Thread-safe latency samples keyed by route and by scenario
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.routes = {}
+        self.scenarios = {}
+        self.errors = {}
+
+    def record(self, table, key, elapsed, ok=True):
+        with self._lock:
+            table.setdefault(key, []).append(elapsed)
+            if not ok:
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+    def summary(self, table):
+        result = {}
+        for key, samples in sorted(table.items()):
+            samples = sorted(samples)
+            result[key] = {
+                'count': len(samples),
+                'errors': self.errors.get(key, 0),
+                'p50_ms': round(percentile(samples, 50) * 1000, 3),
+                'p95_ms': round(percentile(samples, 95) * 1000, 3),
+                'p99_ms': round(percentile(samples, 99) * 1000, 3),
+            }
+        return result
+
+
+class TestClientTransport:
+    def __init__(self, app):
+        self.app = app
+
+    def session(self):
+        client = self.app.test_client()
+
+        def send(method, path, body, headers):
+            response = client.open(path, method=method, json=body, headers=headers or {})
+            response.get_data()
+            return response.status_code
+        return send
+
+
+class HTTPTransport:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+
+    def session(self):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+
+        def send(method, path, body, headers):
+            nonlocal conn
+            payload = json.dumps(body).encode('utf-8') if body is not None else None
+            all_headers = dict(headers or {})
+            if payload is not None:
+                all_headers['Content-Type'] = 'application/json'
+            try:
+                conn.request(method, path, body=payload, headers=all_headers)
+                response = conn.getresponse()
+                response.read()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+                raise
+            return response.status
+        return send
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(event_log):
+    """
+    Launch app.py in a threaded werkzeug server and wait until it answers
+    """
+    port = free_port()
+    env = dict(os.environ, ILP_EVENT_LOG=event_log)
+    code = f'import app; app.app.run(host="127.0.0.1", port={port}, threaded=True)'
+    proc = subprocess.Popen(
+        [sys.executable, '-c', code], cwd=BACKEND_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return proc, port
+        except OSError:
+            if proc.poll() is not None:
+                raise RuntimeError('Benchmark server exited during startup')
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError('Benchmark server did not start within 30s')
+
+
+def run_load(transport, mix, concurrency, iterations, warmup, seed):
+    recorder = Recorder()
+    names = list(mix)
+    weights = [mix[name][1] for name in names]
+
+    def worker(worker_id):
+        rng = random.Random(seed * 1000 + worker_id)
+        raw_send = transport.session()
+
+        def send(method, route, path, body=None, headers=None, recording=True):
+            start = time.perf_counter()
+            try:
+                status = raw_send(method, path, body, headers)
+                ok = status < 500
+            except Exception:
+                ok = False
+            if recording:
+                recorder.record(recorder.routes, f'{method} {route}', time.perf_counter() - start, ok)
+
+        for i in range(warmup + iterations):
+            name = rng.choices(names, weights)[0]
+            user_id = f'bench-user-{rng.randrange(USER_POOL)}'
+            recording = i >= warmup
+
+            def scenario_send(method, route, path, body=None, headers=None):
+                send(method, route, path, body, headers, recording)
+
+            start = time.perf_counter()
+            mix[name][0](scenario_send, rng, user_id)
+            if recording:
+                recorder.record(recorder.scenarios, name, time.perf_counter() - start)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    requests_done = sum(len(samples) for samples in recorder.routes.values())
+    return {
+        'elapsed_s': round(elapsed, 3),
+        'requests': requests_done,
+        'throughput_rps': round(requests_done / elapsed, 1) if elapsed else 0.0,
+        'routes': recorder.summary(recorder.routes),
+        'scenarios': recorder.summary(recorder.scenarios),
+    }
+
+
+def run_mode(mode, args):
+    with tempfile.TemporaryDirectory(prefix='ilp-bench-') as tmp:
+        event_log = os.path.join(tmp, 'events.log')
+        if mode == 'client':
+            os.environ['ILP_EVENT_LOG'] = event_log
+            import app
+            result = run_load(TestClientTransport(app.app), MIXES[args.mix], args.concurrency,
+                              args.iterations, args.warmup, args.seed)
+            result['rss_mb'] = rss_mb()
+            app.event_store.close()
+        else:
+            proc, port = start_server(event_log)
+            try:
+                result = run_load(HTTPTransport('127.0.0.1', port), MIXES[args.mix], args.concurrency,
+                                  args.iterations, args.warmup, args.seed)
+                result['rss_mb'] = rss_mb(proc.pid)
+            finally:
+                proc.terminate()
+                proc.wait(timeout=10)
+    if result['rss_mb'] is not None:
+        result['rss_mb'] = round(result['rss_mb'], 1)
+    result['mode'] = mode
+    result['config'] = {
+        'mix': args.mix,
+        'concurrency': args.concurrency,
+        'iterations': args.iterations,
+        'warmup': args.warmup,
+        'seed': args.seed,
+        'python': platform.python_version(),
+    }
+    return result
+
+
+def compare(result, baseline, threshold):
+    """
+    Return human-readable regressions of result relative to baseline
+    """
+    regressions = []
+    for route, stats in result['routes'].items():
+        before = baseline.get('routes', {}).get(route)
+        if before is None:
+            continue
+        for key in ('p95_ms', 'p99_ms'):
+            limit = before[key] * (1 + threshold)
+            if stats[key] > limit and stats[key] - before[key] > MIN_DELTA_MS:
+                regressions.append(f'{route} {key}: {before[key]} -> {stats[key]}')
+        if stats['errors'] > before.get('errors', 0):
+            regressions.append(f"{route} errors: {before.get('errors', 0)} -> {stats['errors']}")
+    if result['throughput_rps'] < baseline.get('throughput_rps', 0) * (1 - threshold):
+        regressions.append(f"throughput_rps: {baseline['throughput_rps']} -> {result['throughput_rps']}")
+    if result.get('rss_mb') and baseline.get('rss_mb') and result['rss_mb'] > baseline['rss_mb'] * (1 + threshold):
+        regressions.append(f"rss_mb: {baseline['rss_mb']} -> {result['rss_mb']}")
+    return regressions
+
+
+def print_report(result):
+    print(f"\n== {result['mode']} mode: {result['requests']} requests in {result['elapsed_s']}s "
+          f"({result['throughput_rps']} req/s), RSS {result['rss_mb']} MiB")
+    print(f"{'route':<52} {'count':>7} {'err':>5} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for route, stats in result['routes'].items():
+        print(f"{route:<52} {stats['count']:>7} {stats['errors']:>5} "
+              f"{stats['p50_ms']:>9.3f} {stats['p95_ms']:>9.3f} {stats['p99_ms']:>9.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--mode', choices=('client', 'server', 'both'), default='client')
+    parser.add_argument('--mix', choices=sorted(MIXES), default='classroom')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--iterations', type=int, default=200, help='scenarios per client')
+    parser.add_argument('--warmup', type=int, default=20, help='unrecorded scenarios per client')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--baseline-dir', default=DEFAULT_BASELINE_DIR)
+    parser.add_argument('--save-baseline', action='store_true', help='overwrite the baseline with this run')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed relative regression')
+    parser.add_argument('--output', help='also write the full results JSON here')
+    args = parser.parse_args(argv)
+
+    modes = ('client', 'server') if args.mode == 'both' else (args.mode,)
+    results = {}
+    failed = False
+    for mode in modes:
+        result = run_mode(mode, args)
+        results[mode] = result
+        print_report(result)
+
+        baseline_path = os.path.join(args.baseline_dir, f'{mode}-{args.mix}.json')
+        if args.save_baseline:
+            os.makedirs(args.baseline_dir, exist_ok=True)
+            with open(baseline_path, 'w') as f:
+                json.dump(result, f, indent=2, sort_keys=True)
+            print(f'Saved baseline to {baseline_path}')
+        elif os.path.exists(baseline_path):
+            with open(baseline_path) as f:
+                regressions = compare(result, json.load(f), args.threshold)
+            if regressions:
+                failed = True
+                print(f'REGRESSIONS vs {baseline_path}:')
+                for line in regressions:
+                    print(f'  {line}')
+            else:
+                print(f'No regressions vs {baseline_path}')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Realistic request mixes for the ILP API benchmarks
+Each scenario is one user journey; it calls send(method, route, path, body,
+headers) for every request, where route is the URL template used to group
+latencies
+"""
+
+from sample_data import SAMPLE_CONCEPTS, SAMPLE_LESSONS, SAMPLE_QUIZZES
+
+LESSON_IDS = [lesson['lesson_id'] for lesson in SAMPLE_LESSONS]
+CATEGORIES = sorted({lesson['category'] for lesson in SAMPLE_LESSONS})
+QUIZZES = SAMPLE_QUIZZES
+CONCEPT_IDS = [concept['concept_id'] for concept in SAMPLE_CONCEPTS]
+
+# Pool of simulated learners; small enough that dashboards hit warm caches
+USER_POOL = 200
+# Sent where a browser would; gzip rather than br so runs compare without Brotli installed
+GZIP = {'Accept-Encoding': 'gzip'}
+
+
+def sample_answer(question, rng):
+    """
+    An answer that is right about two times in three
+    """
+    correct = rng.random() < 0.66
+    question_type = question['question_type']
+    if question_type == 'multiple_choice':
+        return question['correct_answer'] if correct else rng.choice(question['options'])
+    if question_type == 'true_false':
+        return str(question['correct_answer'] if correct else not question['correct_answer']).lower()
+    if question_type == 'free_text':
+        keywords = question.get('keywords', [])
+        if correct and keywords:
+            return 'It involves ' + ' and '.join(rng.sample(keywords, min(2, len(keywords))))
+        return 'I am not sure about this one'
+    return question.get('starter_code', '') + '\n# attempt\n' * (2 if correct else 0)
+
+
+def lesson_browsing(send, rng, user_id):
+    headers = {'X-User-ID': user_id}
+    send('GET', '/api/lessons', '/api/lessons', headers=headers)
+    category = rng.choice(CATEGORIES)
+    send('GET', '/api/lessons/category/<category>', f'/api/lessons/category/{category}', headers=headers)
+    send('GET', '/api/lessons?sort&limit', '/api/lessons?sort=difficulty&limit=5', headers=headers)
+    for lesson_id in rng.sample(LESSON_IDS, 2):
+        send('GET', '/api/lessons/<lesson_id>', f'/api/lessons/{lesson_id}', headers=headers)
+        send('GET', '/api/quizzes/lesson/<lesson_id>', f'/api/quizzes/lesson/{lesson_id}', headers=headers)
+    send('GET', '/api/concepts', '/api/concepts', headers=headers)
+    term = rng.choice(('walker', 'graph', 'node', 'byllm', 'edge'))
+    send('GET', '/api/search?q', f'/api/search?q={term[:rng.randint(2, len(term))]}', headers=headers)
+
+
+def page_load(send, rng, user_id):
+    """
+    The SPA's first paint: bootstrap with the user's progress, then the lesson pages
+    """
+    headers = {'X-User-ID': user_id, **GZIP}
+    send('GET', '/api/bootstrap [gzip]', '/api/bootstrap', headers=headers)
+    send('GET', '/api/bootstrap', '/api/bootstrap')
+    send('GET', '/api/lessons [gzip]', '/api/lessons', headers=headers)
+    send('GET', '/api/lessons?limit [gzip]', '/api/lessons?limit=200', headers=headers)
+
+
+def lesson_reading(send, rng, user_id):
+    """
+    Rendered lesson bodies, then the section-at-a-time projections a reader pages through
+    """
+    headers = {'X-User-ID': user_id, **GZIP}
+    lesson_id = rng.choice(LESSON_IDS)
+    send('GET', '/api/lessons/<lesson_id>?rendered [gzip]', f'/api/lessons/{lesson_id}?rendered=1',
+         headers=headers)
+    for section in range(1, 4):
+        send('GET', '/api/lessons/<lesson_id>?fields&sections',
+             f'/api/lessons/{lesson_id}?fields=title,sections.body&sections={section}', headers=headers)
+    send('GET', '/api/lessons/<lesson_id>?rendered&fields',
+         f'/api/lessons/{lesson_id}?rendered=1&fields=sections.sectionTitle,sections.codeTokens',
+         headers=headers)
+
+
+def walker_runs(send, rng, user_id):
+    lesson_id = rng.choice(LESSON_IDS)
+    send('POST', '/api/walkers/<walker_name>', '/api/walkers/MasteryAggregator', body={'user_id': user_id})
+    send('POST', '/api/walkers/<walker_name>', '/api/walkers/ContentServer',
+         body={'user_id': user_id, 'lesson_id': lesson_id})
+    send('POST', '/api/walkers/<walker_name>?stream', '/api/walkers/LearningPathOptimizer?stream=1',
+         body={'user_id': user_id})
+
+
+def history_export(send, rng, user_id):
+    send('GET', '/api/export/events?userId', f'/api/export/events?userId={user_id}')
+    send('GET', '/api/export/events?type', '/api/export/events?type=quiz_attempt')
+
+
+def quiz_attempt(send, rng, user_id):
+    headers = {'X-User-ID': user_id}
+    send('GET', '/api/quizzes', '/api/quizzes', headers=headers)
+    quiz = rng.choice(QUIZZES)
+    send('GET', '/api/quizzes/<quiz_id>', f"/api/quizzes/{quiz['quiz_id']}", headers=headers)
+    answers = {q['question_id']: sample_answer(q, rng) for q in quiz['questions']}
+    send('POST', '/api/quizzes/<quiz_id>/evaluate', f"/api/quizzes/{quiz['quiz_id']}/evaluate",
+         body={'userId': user_id, 'answers': answers})
+
+
+def legacy_quiz_attempt(send, rng, user_id):
+    """
+    Per-question evaluation followed by a separate score call
+    """
+    quiz = rng.choice(QUIZZES)
+    answers = {}
+    for question in quiz['questions']:
+        answer = sample_answer(question, rng)
+        answers[question['question_id']] = answer
+        send('POST', '/api/quizzes/evaluate-answer', '/api/quizzes/evaluate-answer', body={
+            'quizId': quiz['quiz_id'],
+            'questionId': question['question_id'],
+            'userAnswer': answer,
+            'questionType': question['question_type'],
+            'userId': user_id
+        })
+    send('POST', '/api/quizzes/score', '/api/quizzes/score',
+         body={'quizId': quiz['quiz_id'], 'userId': user_id, 'answers': answers})
+
+
+def progress_tracking(send, rng, user_id):
+    lesson_id = rng.choice(LESSON_IDS)
+    for status in ('in_progress', 'completed'):
+        send('POST', '/api/progress/track', '/api/progress/track', body={
+            'userId': user_id,
+            'lessonId': lesson_id,
+            'status': status,
+            'timeSpent': rng.randint(30, 900)
+        })
+    send('POST', '/api/exercises/validate', '/api/exercises/validate',
+         body={'exerciseId': 'ex-nodes-1', 'code': 'node Person { has name: str; }', 'userId': user_id})
+    send('POST', '/api/exercises/submit', '/api/exercises/submit',
+         body={'exerciseId': 'ex-nodes-1', 'code': 'node Person { has name: str; }', 'userId': user_id})
+
+
+def dashboard(send, rng, user_id):
+    headers = {'X-User-ID': user_id}
+    send('GET', '/api/users/<user_id>/progress', f'/api/users/{user_id}/progress', headers=headers)
+    send('GET', '/api/users/<user_id>/skill-map', f'/api/users/{user_id}/skill-map', headers=headers)
+    send('GET', '/api/users/<user_id>/recommendations', f'/api/users/{user_id}/recommendations',
+         headers=headers)
+
+
+def monitoring(send, rng, user_id):
+    send('GET', '/metrics', '/metrics')
+
+
+# name -> (scenario, relative weight)
+MIXES = {
+    'classroom': {
+        'page_load': (page_load, 8),
+        'lesson_browsing': (lesson_browsing, 25),
+        'lesson_reading': (lesson_reading, 15),
+        'quiz_attempt': (quiz_attempt, 20),
+        'legacy_quiz_attempt': (legacy_quiz_attempt, 5),
+        'progress_tracking': (progress_tracking, 12),
+        'dashboard': (dashboard, 10),
+        'walker_runs': (walker_runs, 3),
+        'history_export': (history_export, 1),
+        'monitoring': (monitoring, 1),
+    },
+    'exam': {
+        'quiz_attempt': (quiz_attempt, 65),
+        'page_load': (page_load, 5),
+        'lesson_browsing': (lesson_browsing, 10),
+        'progress_tracking': (progress_tracking, 10),
+        'dashboard': (dashboard, 10),
+    },
+}
@@ -0,0 +1,111 @@
+"""
+Wide walker traversals through the jaclang runtime
+
+Times Jac walkers whose frontier (WalkerAnchor.next) holds 100k+ locations:
+a single fan-out visit, breadth-first and depth-first sweeps of a wide tree,
+and a prerequisite closure over a layered requires graph. Graph construction
+is reported separately from traversal. Needs jaclang (Python 3.12).
+
+    python benchmarks/walker_traversal.py [--nodes 100000] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def build_fan(Jac, module, root, nodes):
+    for n in range(nodes):
+        Jac.connect(root, module.Item(n=n))
+
+
+def build_tree(Jac, module, root, nodes, branching):
+    """
+    Breadth-first filled tree of nodes Items hanging off root
+    """
+    parents = [root]
+    created = 0
+    while created < nodes:
+        children = []
+        for parent in parents:
+            for _ in range(branching):
+                if created == nodes:
+                    break
+                child = module.Item(n=created)
+                Jac.connect(parent, child)
+                children.append(child)
+                created += 1
+        parents = children
+
+
+def build_layers(Jac, module, root, nodes, width):
+    """
+    Layers of width Items; every Item requires three of the next layer
+    """
+    layers = [[module.Item(n=i * width + j) for j in range(width)] for i in range(nodes // width)]
+    Jac.connect(root, layers[0])
+    for upper, lower in zip(layers, layers[1:]):
+        for j, item in enumerate(upper):
+            for k in range(3):
+                Jac.connect(item, lower[(j * 3 + k) % width], module.requires)
+
+
+SCENARIOS = {
+    'fan_out': ('FanOut', lambda Jac, m, root, args: build_fan(Jac, m, root, args.nodes)),
+    'breadth_first': ('BreadthFirst', lambda Jac, m, root, args: build_tree(Jac, m, root, args.nodes, args.branching)),
+    'depth_first': ('DepthFirst', lambda Jac, m, root, args: build_tree(Jac, m, root, args.nodes, args.branching)),
+    'prerequisite_closure': ('PrerequisiteClosure', lambda Jac, m, root, args: build_layers(Jac, m, root, args.nodes, args.width)),
+}
+
+
+def run_scenario(Jac, module, name, args):
+    walker_name, build = SCENARIOS[name]
+    ctx = Jac.create_j_context()
+    Jac.set_context(ctx)
+    try:
+        root = ctx.get_root()
+        started = time.perf_counter()
+        build(Jac, module, root, args)
+        build_seconds = time.perf_counter() - started
+
+        timings = []
+        for _ in range(args.repeat):
+            walker = getattr(module, walker_name)()
+            started = time.perf_counter()
+            Jac.spawn(walker, root)
+            timings.append(time.perf_counter() - started)
+        return build_seconds, min(timings)
+    finally:
+        ctx.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time wide Jac walker traversals')
+    parser.add_argument('--nodes', type=int, default=100000)
+    parser.add_argument('--branching', type=int, default=50, help='children per tree node')
+    parser.add_argument('--width', type=int, default=20000, help='items per prerequisite layer')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per scenario; the fastest is reported')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), dest='scenarios')
+    args = parser.parse_args(argv)
+
+    try:
+        from jaclang.compiler.program import JacProgram
+        from jaclang.runtimelib.runtime import JacRuntime as Jac
+    except ImportError as exc:
+        sys.exit(f'jaclang is required (Python 3.12): {exc}')
+
+    Jac.attach_program(JacProgram())
+    (module,) = Jac.jac_import('traversal', BENCH_DIR)
+
+    print(f'{"scenario":<22}{"nodes":>8}{"build s":>10}{"walk s":>10}{"nodes/s":>12}')
+    for name in args.scenarios or SCENARIOS:
+        build_seconds, walk_seconds = run_scenario(Jac, module, name, args)
+        print(f'{name:<22}{args.nodes:>8}{build_seconds:>10.2f}{walk_seconds:>10.3f}'
+              f'{args.nodes / walk_seconds:>12.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -102,6 +102,13 @@ const CodeEditor = ({ exerciseId, userId, lessonId, onSubmit }) => {
           <div className="results-summary">
             {testResults.passedTests} / {testResults.totalTests} tests passed
           </div>
+          {testResults.compileErrors && testResults.compileErrors.length > 0 && (
+            <ul className="compile-errors">
+              {testResults.compileErrors.map((error, idx) => (
+                <li key={idx}>Line {error.line}: {error.message}</li>
+              ))}
+            </ul>
+          )}
           {testResults.testDetails && (
             <ul className="test-details">
               {testResults.testDetails.map((test, idx) => (
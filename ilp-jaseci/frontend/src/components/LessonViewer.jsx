@@ -7,6 +7,8 @@ import './LessonViewer.css';
  */
 const LessonViewer = ({ lessonId, userId }) => {
   const [lesson, setLesson] = useState(null);
+  // Sections are fetched one at a time as the learner reaches them
+  const [sections, setSections] = useState({});
   const [currentSection, setCurrentSection] = useState(0);
   const [isCompleted, setIsCompleted] = useState(false);
   const [loading, setLoading] = useState(true);
@@ -19,12 +21,16 @@ const LessonViewer = ({ lessonId, userId }) => {
     try {
       setLoading(true);
       // Call backend walker via spawn
-      const response = await fetch('/api/lessons/' + lessonId, {
+      // Pre-rendered variant: sanitized HTML bodies and code highlight tokens,
+      // with only the first section; sectionCount drives the navigation
+      const response = await fetch('/api/lessons/' + lessonId + '?rendered=1&sections=1', {
         method: 'GET',
         headers: { 'X-User-ID': userId }
       });
       const data = await response.json();
       setLesson(data);
+      setSections(data.sections ? { 0: data.sections[0] } : {});
+      setCurrentSection(0);
       setLoading(false);
     } catch (error) {
       console.error('Error fetching lesson:', error);
@@ -32,8 +38,25 @@ const LessonViewer = ({ lessonId, userId }) => {
     }
   };
 
+  const fetchSection = async (index) => {
+    if (sections[index]) return;
+    try {
+      const response = await fetch(
+        '/api/lessons/' + lessonId + '?rendered=1&fields=sections&sections=' + (index + 1),
+        { method: 'GET', headers: { 'X-User-ID': userId } }
+      );
+      const data = await response.json();
+      if (data.sections && data.sections.length) {
+        setSections((loaded) => ({ ...loaded, [index]: data.sections[0] }));
+      }
+    } catch (error) {
+      console.error('Error fetching lesson section:', error);
+    }
+  };
+
   const handleSectionNext = () => {
-    if (currentSection < lesson.sections.length - 1) {
+    if (currentSection < lesson.sectionCount - 1) {
+      fetchSection(currentSection + 1);
       setCurrentSection(currentSection + 1);
     }
   };
@@ -71,7 +94,7 @@ const LessonViewer = ({ lessonId, userId }) => {
   if (loading) return <div className="lesson-viewer-loading">Loading lesson...</div>;
   if (!lesson) return <div className="lesson-viewer-error">Lesson not found</div>;
 
-  const section = lesson.sections[currentSection];
+  const section = sections[currentSection];
 
   return (
     <div className="lesson-viewer">
@@ -85,20 +108,25 @@ const LessonViewer = ({ lessonId, userId }) => {
 
       <div className="lesson-content">
         <div className="section-counter">
-          Section {currentSection + 1} of {lesson.sections.length}
+          Section {currentSection + 1} of {lesson.sectionCount}
         </div>
 
-        <h2>{section.sectionTitle}</h2>
-        <div className="section-body" dangerouslySetInnerHTML={{ __html: section.body }} />
+        {!section && <div className="lesson-viewer-loading">Loading section...</div>}
+        {section && <h2>{section.sectionTitle}</h2>}
+        {section && <div className="section-body" dangerouslySetInnerHTML={{ __html: section.body }} />}
 
-        {section.codeExample && (
+        {section && section.codeExample && (
           <div className="code-example">
             <h3>Code Example</h3>
-            <pre><code>{section.codeExample}</code></pre>
+            <pre><code>
+              {(section.codeTokens || [['text', section.codeExample]]).map(([kind, text], idx) => (
+                <span key={idx} className={`tok-${kind}`}>{text}</span>
+              ))}
+            </code></pre>
           </div>
         )}
 
-        {section.keyConcepts && (
+        {section && section.keyConcepts && (
           <div className="key-concepts">
             <h3>Key Concepts</h3>
             <ul>
@@ -119,7 +147,7 @@ const LessonViewer = ({ lessonId, userId }) => {
           Previous
         </button>
 
-        {currentSection === lesson.sections.length - 1 ? (
+        {currentSection === lesson.sectionCount - 1 ? (
           <button
             onClick={handleLessonComplete}
             className="btn btn-primary"
@@ -42,77 +42,46 @@ const QuizComponent = ({ quizId, userId, onComplete }) => {
     }));
   };
 
-  const handleSubmitAnswer = async () => {
-    const currentQuestion = quiz.questions[currentQuestionIdx];
-    const userAnswer = answers[currentQuestion.questionId] || '';
-
-    try {
-      setIsSubmitting(true);
-      // Call QuizAssessor walker to evaluate answer
-      const response = await fetch('/api/quizzes/evaluate-answer', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          quizId,
-          questionId: currentQuestion.questionId,
-          userAnswer,
-          questionType: currentQuestion.questionType,
-          userId
-        })
-      });
-      const result = await response.json();
-      
-      setFeedback(prev => ({
-        ...prev,
-        [currentQuestion.questionId]: result.feedback
-      }));
-
-      setIsSubmitting(false);
-
-      // Move to next question after short delay
-      setTimeout(() => {
-        if (currentQuestionIdx < quiz.questions.length - 1) {
-          setCurrentQuestionIdx(currentQuestionIdx + 1);
-        } else {
-          handleQuizComplete();
-        }
-      }, 2000);
-    } catch (error) {
-      console.error('Error submitting answer:', error);
-      setIsSubmitting(false);
+  const handleNextQuestion = () => {
+    if (currentQuestionIdx < quiz.questions.length - 1) {
+      setCurrentQuestionIdx(currentQuestionIdx + 1);
+    } else {
+      handleQuizComplete();
     }
   };
 
   const handleQuizComplete = async () => {
     try {
-      // Score the quiz attempt
-      const response = await fetch('/api/quizzes/score', {
+      setIsSubmitting(true);
+      // Grade the whole attempt in one round trip via QuizAssessor walker
+      const response = await fetch(`/api/quizzes/${quizId}/evaluate`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
-          quizId,
           userId,
-          answers,
-          feedback
+          answers
         })
       });
       const result = await response.json();
+      setFeedback(result.feedback);
       setQuizScore(result);
+      setIsSubmitting(false);
 
       if (onComplete) {
         onComplete({ quizId, score: result.score, passed: result.passed });
       }
     } catch (error) {
       console.error('Error completing quiz:', error);
+      setIsSubmitting(false);
     }
   };
 
   if (loading) return <div className="quiz-loading">Loading quiz...</div>;
   if (!quiz) return <div className="quiz-error">Quiz not found</div>;
-  if (quizScore) return <QuizResults score={quizScore} />;
+  if (quizScore) return <QuizResults score={quizScore} questions={quiz.questions} feedback={feedback} />;
 
   const currentQuestion = quiz.questions[currentQuestionIdx];
-  const currentFeedback = feedback[currentQuestion.questionId];
+  const isLastQuestion = currentQuestionIdx === quiz.questions.length - 1;
 
   return (
     <div className="quiz-container">
@@ -159,22 +128,13 @@ const QuizComponent = ({ quizId, userId, onComplete }) => {
         )}
       </div>
 
-      {currentFeedback && (
-        <div className={`feedback ${currentFeedback.correct ? 'correct' : 'incorrect'}`}>
-          <p>{currentFeedback.message}</p>
-          {currentFeedback.explanation && (
-            <p className="explanation">{currentFeedback.explanation}</p>
-          )}
-        </div>
-      )}
-
       <div className="quiz-actions">
         <button
-          onClick={handleSubmitAnswer}
+          onClick={handleNextQuestion}
           disabled={isSubmitting || !answers[currentQuestion.questionId]}
           className="btn btn-primary"
         >
-          {isSubmitting ? 'Evaluating...' : 'Submit Answer'}
+          {isSubmitting ? 'Evaluating...' : isLastQuestion ? 'Submit Quiz' : 'Next Question'}
         </button>
       </div>
     </div>
@@ -249,7 +209,7 @@ const CodeQuestion = ({ question, answer, onChange }) => (
 );
 
 // Results component
-const QuizResults = ({ score }) => (
+const QuizResults = ({ score, questions, feedback }) => (
   <div className="quiz-results">
     <h2>Quiz Complete!</h2>
     <div className="score-display">
@@ -259,6 +219,22 @@ const QuizResults = ({ score }) => (
       </div>
     </div>
     <p className="score-detail">You got {score.correctAnswers} out of {score.totalQuestions} correct</p>
+    {questions.map((question) => {
+      const questionFeedback = feedback[question.questionId];
+      if (!questionFeedback) return null;
+      return (
+        <div
+          key={question.questionId}
+          className={`feedback ${questionFeedback.correct ? 'correct' : 'incorrect'}`}
+        >
+          <p>{question.questionText}</p>
+          <p>{questionFeedback.message}</p>
+          {questionFeedback.explanation && (
+            <p className="explanation">{questionFeedback.explanation}</p>
+          )}
+        </div>
+      );
+    })}
   </div>
 );
 
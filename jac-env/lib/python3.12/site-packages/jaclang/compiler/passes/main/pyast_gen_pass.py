@@ -2963,6 +2963,19 @@ class PyastGenPass(BaseAstGenPass[ast3.AST]):
                         )
                     )
                 )
+            if cur.filter_cond and cur.filter_cond.f_type:
+                # The edge class alone lets traversal read the adjacency index
+                keywords.append(
+                    self.sync(
+                        ast3.keyword(
+                            arg="edge_type",
+                            value=cast(
+                                ast3.expr,
+                                copy.deepcopy(cur.filter_cond.f_type.gen.py_ast[0]),
+                            ),
+                        )
+                    )
+                )
 
             if chomp and not isinstance(chomp[0], uni.EdgeOpRef):
                 filt = chomp.pop(0)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections import deque
 from collections.abc import Callable
 from dataclasses import asdict, dataclass, field, fields, is_dataclass
 from enum import IntEnum
@@ -10,7 +11,7 @@ from inspect import _empty, signature
 from logging import getLogger
 from pickle import dumps
 from types import UnionType
-from typing import Any, ClassVar, TypeAlias, TypeVar
+from typing import Any, ClassVar, TypeAlias, TypeVar, get_args
 from uuid import UUID, uuid4
 
 from ..compiler.constant import EdgeDir
@@ -81,6 +82,9 @@ class ObjectSpatialDestination:
     direction: EdgeDir
     edge: Callable[[Archetype], bool] | None = None
     node: Callable[[Archetype], bool] | None = None
+    # Edge classes the edge filter is limited to, when known; traversal then
+    # reads only the matching buckets of each node's adjacency index
+    edge_types: tuple[type, ...] | None = None
 
     def edge_filter(self, arch: Archetype) -> bool:
         """Filter edge."""
@@ -90,6 +94,12 @@ class ObjectSpatialDestination:
         """Filter node."""
         return not self.node or self.node(arch)
 
+    def edges_from(self, anchor: NodeAnchor) -> list[EdgeAnchor]:
+        """Get edges of anchor that can match, via its adjacency index if typed."""
+        if self.edge_types is None:
+            return anchor.edges
+        return anchor.edges_of(self.edge_types, self.direction)
+
 
 @dataclass(eq=False, repr=False)
 class ObjectSpatialPath:
@@ -126,35 +136,60 @@ class ObjectSpatialPath:
             return lambda i: i in filter
         return lambda i: i == filter
 
+    def convert_types(
+        self, edge_type: type | UnionType | tuple | None
+    ) -> tuple[type, ...] | None:
+        """Convert edge type filter to a tuple of classes."""
+        if edge_type is None:
+            return None
+        types = get_args(edge_type) if isinstance(edge_type, UnionType) else edge_type
+        types = types if isinstance(types, tuple) else (types,)
+        return types if all(isinstance(i, type) for i in types) else None
+
     def append(
         self,
         direction: EdgeDir,
         edge: ObjectSpatialFilter,
         node: ObjectSpatialFilter,
+        edge_type: type | UnionType | tuple | None = None,
     ) -> ObjectSpatialPath:
         """Append destination."""
         self.destinations.append(
-            ObjectSpatialDestination(direction, self.convert(edge), self.convert(node))
+            ObjectSpatialDestination(
+                direction,
+                self.convert(edge),
+                self.convert(node),
+                self.convert_types(edge_type),
+            )
         )
         return self
 
     def edge_out(
-        self, edge: ObjectSpatialFilter = None, node: ObjectSpatialFilter = None
+        self,
+        edge: ObjectSpatialFilter = None,
+        node: ObjectSpatialFilter = None,
+        edge_type: type | UnionType | tuple | None = None,
     ) -> ObjectSpatialPath:
         """Override greater than function."""
-        return self.append(EdgeDir.OUT, edge, node)
+        return self.append(EdgeDir.OUT, edge, node, edge_type)
 
     def edge_in(
-        self, edge: ObjectSpatialFilter = None, node: ObjectSpatialFilter = None
+        self,
+        edge: ObjectSpatialFilter = None,
+        node: ObjectSpatialFilter = None,
+        edge_type: type | UnionType | tuple | None = None,
     ) -> ObjectSpatialPath:
         """Override greater than function."""
-        return self.append(EdgeDir.IN, edge, node)
+        return self.append(EdgeDir.IN, edge, node, edge_type)
 
     def edge_any(
-        self, edge: ObjectSpatialFilter = None, node: ObjectSpatialFilter = None
+        self,
+        edge: ObjectSpatialFilter = None,
+        node: ObjectSpatialFilter = None,
+        edge_type: type | UnionType | tuple | None = None,
     ) -> ObjectSpatialPath:
         """Override greater than function."""
-        return self.append(EdgeDir.ANY, edge, node)
+        return self.append(EdgeDir.ANY, edge, node, edge_type)
 
     def edge(self) -> ObjectSpatialPath:
         """Set edge only."""
@@ -297,6 +332,45 @@ class Anchor:
         return False
 
 
+class EdgeList(list):
+    """List of a node's edges that counts its mutations.
+
+    The adjacency index records the count it was built at, so any change made
+    to the list directly, rather than through add_edge/remove_edge, marks the
+    index stale.
+    """
+
+    version = 0
+
+
+def _counted(name: str) -> Callable:
+    method = getattr(list, name)
+
+    def mutate(self: EdgeList, *args: Any) -> Any:
+        self.version += 1
+        return method(self, *args)
+
+    mutate.__name__ = name
+    return mutate
+
+
+for _name in (
+    "append",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "sort",
+    "reverse",
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+):
+    setattr(EdgeList, _name, _counted(_name))
+
+
 @dataclass(eq=False, repr=False, kw_only=True)
 class NodeAnchor(Anchor):
     """Node Anchor."""
@@ -313,6 +387,85 @@ class NodeAnchor(Anchor):
 
         return state
 
+    def edge_index(self) -> dict[tuple[type, EdgeDir], dict[EdgeAnchor, int]]:
+        """Get adjacency index: (edge class, direction) -> {edge: position}.
+
+        Kept in sync by add_edge and remove_edge. It is not serialized, and it is
+        rebuilt when `edges` was replaced or changed directly since it was built.
+        """
+        if not self._index_in_sync():
+            edges = self.edges
+            if type(edges) is not EdgeList:
+                edges = self.edges = EdgeList(edges)
+            state = self.__dict__
+            index = state["_edge_index"] = {}
+            state["_edge_index_seq"] = 0
+            for edge in edges:
+                self._index_edge(index, edge)
+            state["_edge_index_of"] = edges
+            state["_edge_index_version"] = edges.version
+        return self.__dict__["_edge_index"]
+
+    def _index_edge(
+        self, index: dict[tuple[type, EdgeDir], dict[EdgeAnchor, int]], edge: EdgeAnchor
+    ) -> None:
+        """Add edge to index after every edge already in it."""
+        seq = self.__dict__["_edge_index_seq"] = self.__dict__["_edge_index_seq"] + 1
+        edge_type = type(edge.archetype)
+        if edge.source == self:
+            index.setdefault((edge_type, EdgeDir.OUT), {})[edge] = seq
+        if edge.target == self:
+            index.setdefault((edge_type, EdgeDir.IN), {})[edge] = seq
+
+    def _index_in_sync(self) -> bool:
+        """Check if the index was built from `edges` as they are now."""
+        state = self.__dict__
+        edges = self.edges
+        return (
+            "_edge_index" in state
+            and state.get("_edge_index_of") is edges
+            and state.get("_edge_index_version") == edges.version
+        )
+
+    def add_edge(self, edge: EdgeAnchor) -> None:
+        """Append edge and index it."""
+        in_sync = self._index_in_sync()
+        self.edges.append(edge)
+        if in_sync:
+            self._index_edge(self.__dict__["_edge_index"], edge)
+            self.__dict__["_edge_index_version"] = self.edges.version
+
+    def remove_edge(self, edge: EdgeAnchor) -> None:
+        """Remove edge and drop it from the index."""
+        for idx, ed in enumerate(self.edges):
+            if ed.id == edge.id:
+                in_sync = self._index_in_sync()
+                self.edges.pop(idx)
+                if in_sync:
+                    for bucket in self.__dict__["_edge_index"].values():
+                        bucket.pop(ed, None)
+                    self.__dict__["_edge_index_version"] = self.edges.version
+                break
+
+    def edges_of(
+        self, edge_types: tuple[type, ...], direction: EdgeDir
+    ) -> list[EdgeAnchor]:
+        """Get edges of edge_types (or their subclasses) in direction, in edge order."""
+        directions = (
+            (EdgeDir.OUT, EdgeDir.IN) if direction == EdgeDir.ANY else (direction,)
+        )
+        buckets = [
+            bucket
+            for (edge_type, edge_dir), bucket in self.edge_index().items()
+            if edge_dir in directions and bucket and issubclass(edge_type, edge_types)
+        ]
+        if len(buckets) == 1:
+            return list(buckets[0])
+        merged: dict[EdgeAnchor, int] = {}
+        for bucket in buckets:
+            merged.update(bucket)
+        return sorted(merged, key=merged.__getitem__)
+
 
 @dataclass(eq=False, repr=False, kw_only=True)
 class EdgeAnchor(Anchor):
@@ -345,8 +498,9 @@ class WalkerAnchor(Anchor):
 
     archetype: WalkerArchetype
     path: list[NodeAnchor] = field(default_factory=list)
-    next: list[NodeAnchor | EdgeAnchor] = field(default_factory=list)
-    ignores: list[NodeAnchor] = field(default_factory=list)
+    # Frontier of locations to visit: popped from the left, extended at either end
+    next: deque[NodeAnchor | EdgeAnchor] = field(default_factory=deque)
+    ignores: set[NodeAnchor] = field(default_factory=set)
     disengaged: bool = False
 
 
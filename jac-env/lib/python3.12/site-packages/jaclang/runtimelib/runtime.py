@@ -9,7 +9,7 @@ import os
 import sys
 import tempfile
 import types
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from collections.abc import Callable, Coroutine, Mapping, Sequence
 from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import MISSING, dataclass, field
@@ -277,7 +277,7 @@ class JacNode:
         edges: OrderedDict[EdgeAnchor, EdgeArchetype] = OrderedDict()
         for node in origin:
             nanch = node.__jac__
-            for anchor in nanch.edges:
+            for anchor in destination.edges_from(nanch):
                 if (
                     (source := anchor.source)
                     and (target := anchor.target)
@@ -313,7 +313,7 @@ class JacNode:
         )
         for node in origin:
             nanch = node.__jac__
-            for anchor in nanch.edges:
+            for anchor in destination.edges_from(nanch):
                 if (
                     (source := anchor.source)
                     and (target := anchor.target)
@@ -347,7 +347,7 @@ class JacNode:
         nodes: OrderedDict[NodeAnchor, NodeArchetype] = OrderedDict()
         for node in origin:
             nanch = node.__jac__
-            for anchor in nanch.edges:
+            for anchor in destination.edges_from(nanch):
                 if (
                     (source := anchor.source)
                     and (target := anchor.target)
@@ -374,10 +374,7 @@ class JacNode:
     @staticmethod
     def remove_edge(node: NodeAnchor, edge: EdgeAnchor) -> None:
         """Remove reference without checking sync status."""
-        for idx, ed in enumerate(node.edges):
-            if ed.id == edge.id:
-                node.edges.pop(idx)
-                break
+        node.remove_edge(edge)
 
 
 class JacEdge:
@@ -409,22 +406,39 @@ class JacWalker:
         if isinstance(walker, WalkerArchetype):
             """Walker visits node."""
             wanch = walker.__jac__
-            before_len = len(wanch.next)
+            frontier = wanch.next
+            ignores = wanch.ignores
             next = []
             for anchor in (
                 (i.__jac__ for i in expr) if isinstance(expr, list) else [expr.__jac__]
             ):
-                if anchor not in wanch.ignores:
+                if anchor not in ignores:
                     if isinstance(anchor, (NodeAnchor, EdgeAnchor)):
                         next.append(anchor)
                     else:
                         raise ValueError("Anchor should be NodeAnchor or EdgeAnchor.")
-            if insert_loc < -len(wanch.next):  # for out of index selection
+            if not next:
+                return False
+            size = len(frontier)
+            if insert_loc < -size:  # for out of index selection
                 insert_loc = 0
             elif insert_loc < 0:
-                insert_loc += len(wanch.next) + 1
-            wanch.next = wanch.next[:insert_loc] + next + wanch.next[insert_loc:]
-            return len(wanch.next) > before_len
+                insert_loc += size + 1
+            # Insert in place: O(k) at either end, O(k + distance to the
+            # nearer end) elsewhere, without copying the rest of the frontier
+            if insert_loc >= size:
+                frontier.extend(next)
+            elif insert_loc == 0:
+                frontier.extendleft(reversed(next))
+            elif insert_loc <= size // 2:
+                frontier.rotate(-insert_loc)
+                frontier.extendleft(reversed(next))
+                frontier.rotate(insert_loc)
+            else:
+                frontier.rotate(size - insert_loc)
+                frontier.extend(next)
+                frontier.rotate(insert_loc - size)
+            return True
         else:
             raise TypeError("Invalid walker object")
 
@@ -445,8 +459,8 @@ class JacWalker:
             if walker.disengaged:
                 return warch
 
-        while len(walker.next):
-            if current_loc := walker.next.pop(0).archetype:
+        while walker.next:
+            if current_loc := walker.next.popleft().archetype:
                 # walker ability with loc entry
                 for i in warch._jac_entry_funcs_:
                     if (
@@ -517,7 +531,7 @@ class JacWalker:
             if walker.disengaged:
                 return warch
 
-        walker.ignores = []
+        walker.ignores = set()
         return warch
 
     @staticmethod
@@ -539,8 +553,8 @@ class JacWalker:
             if walker.disengaged:
                 return warch
 
-        while len(walker.next):
-            if current_loc := walker.next.pop(0).archetype:
+        while walker.next:
+            if current_loc := walker.next.popleft().archetype:
                 # walker ability with loc entry
                 for i in warch._jac_entry_funcs_:
                     if (
@@ -625,7 +639,7 @@ class JacWalker:
             if walker.disengaged:
                 return warch
 
-        walker.ignores = []
+        walker.ignores = set()
         return warch
 
     @staticmethod
@@ -653,11 +667,11 @@ class JacWalker:
         ) -> NodeAnchor | EdgeAnchor:
             if isinstance(t, NodeArchetype):
                 node = t.__jac__
-                walker.next = [node]
+                walker.next = deque([node])
                 return node
             elif isinstance(t, EdgeArchetype):
                 edge = t.__jac__
-                walker.next = [edge, edge.target]
+                walker.next = deque([edge, edge.target])
                 return edge
             elif isinstance(t, list) and all(
                 isinstance(i, (NodeArchetype, EdgeArchetype)) for i in t
@@ -1370,8 +1384,8 @@ class JacBasics:
                 target=target,
                 is_undirected=is_undirected,
             )
-            source.edges.append(eanch)
-            target.edges.append(eanch)
+            source.add_edge(eanch)
+            target.add_edge(eanch)
 
             if conn_assign:
                 for fld, val in zip(conn_assign[0], conn_assign[1], strict=False):